@@ -1,22 +1,69 @@
+import mmap
+import os
+import struct
 import sys
+import zlib
+from fnmatch import fnmatchcase
+from itertools import chain
 from pathlib import Path
-from typing import Any, Optional, Union
+from typing import Any, BinaryIO, Iterable, Iterator, Optional, Union
 from bcrypt import checkpw, hashpw, gensalt
 from encoded_file import Encoded_File
 
+# binary flag values of an archive entry - a text file encoded as a string, a binary file,
+# and a text file encoded as raw bytes, whose newlines are converted on extraction
+TEXT_FLAG = 0
+BINARY_FLAG = 1
+BYTES_TEXT_FLAG = 2
+
+# the .ido container. a v2 archive starts with a header of the magic number, the format version, the archive
+# flags and the password hash (null bytes without a password), followed by a record for every entry - its
+# metadata and the lengths of its path, encoder and data, followed by the three of them.
+# archives with the directory flag end with a central directory - an entry for every record, with where its
+# data is, its sizes and the CRC-32 of its data - and a footer pointing at the directory, so the entries can be
+# listed without reading their data. files are added in place, by writing their records and a new directory
+# after the footer, so the previous directory stays valid until the new footer is written.
+# a v1 archive starts with the password hash, followed by six fields for every entry, each ending with
+# V1_DELIMITER. v1 archives are still read, but only v2 archives are written.
+ARCHIVE_MAGIC = b"\x89IDO"
+ARCHIVE_VERSION = 2
+PROTECTED_FLAG = 1
+DIRECTORY_FLAG = 2
+# magic number, version, flags, password hash
+ARCHIVE_HEADER = struct.Struct("<4sBB60s")
+# binary flag value, byte length, cap size, path length, encoder length, data length
+ENTRY_HEADER = struct.Struct("<BIiHHQ")
+# binary flag value, byte length, cap size, path length, encoder length, data offset, data length, original size,
+# CRC-32 of the data. the path and encoder follow.
+DIRECTORY_ENTRY = struct.Struct("<BIiHHQQQI")
+# set in the binary flag value of superseded directory entries
+SUPERSEDED_FLAG = 0x80
+# directory offset, number of entries, footer magic number
+ARCHIVE_FOOTER = struct.Struct("<QI4s")
+FOOTER_MAGIC = b"IDOD"
+# the largest byte length and cap size the unsigned and signed 32 bit fields of an entry can hold
+MAX_BYTE_LENGTH = (1 << 32) - 1
+MAX_CAP_SIZE = (1 << 31) - 1
+V1_DELIMITER = b'x\\\\x'
+PASSWORD_HASH_SIZE = 60
+
 
 class Archive:
-    def __init__(self, encoded_files: list[Encoded_File], password: Any = None):
+    def __init__(self, encoded_files: list[Encoded_File], password: Any = None,
+                 mapping: Optional[mmap.mmap] = None):
         """
         Initialize an Archive object with a list of encoded files and an optional password.
 
         Args:
             encoded_files (list[Encoded_File]): A list of encoded files.
             password (Any, optional): An optional password for the archive.
+            mapping (Optional[mmap.mmap]): The mapped archive file the data of the encoded files is read from,
+                closed by close().
         """
         # set values to instance
         self.__hashed_password = b"0"
         self.__encoded_file_list = encoded_files
+        self.__mapping = mapping
         if isinstance(password, bytes):
             self.__hashed_password = password
         else:
@@ -70,12 +117,7 @@ class Archive:
         Returns:
             bool: True if the password is correct, False otherwise.
         """
-        if password_try is None and self.is_protected():
-            return False
-        elif password_try is None and not self.is_protected():
-            return True
-        pwd_bytes = password_try.encode("utf-8")
-        return checkpw(pwd_bytes, self.__hashed_password)
+        return check_password(self.__hashed_password, self.is_protected(), password_try)
 
     def get_encoded_files_list(self) -> list[Encoded_File]:
         """
@@ -127,38 +169,31 @@ class Archive:
                     self.__encoded_file_list.append(sub_file)
 
     def get_archive_contents(self) -> str:
-        files = self.get_encoded_files_list()
-        paths = []
-        for file in files:
-            paths.append(file.get_path())
-        sorted_paths = sorted(paths)
+        return archive_contents([file.get_path() for file in self.get_encoded_files_list()])
 
-        numbered_paths = []
-        counter = 1
-        for path in sorted_paths:
-            numbered_paths.append(str(counter) + str(" - ") + str(path))
-            counter += 1
+    def delete_files_from_archive(self, file_numbers: Union[list[str], list[int]]) -> bool:
+        paths_to_delete = numbered_paths([file.get_path() for file in self.get_encoded_files_list()], file_numbers)
+        if paths_to_delete is None:
+            return False
+        new_encoded_files = [file for file in self.get_encoded_files_list() if
+                             file.get_path() not in paths_to_delete]
+        self.__encoded_file_list = new_encoded_files
+        return True
 
-        path_string = ''.join(str(x) + '\n' for x in numbered_paths)
-        return '\n' + path_string
+    def close(self) -> None:
+        """
+        Close the mapped archive file the archive was read from, if any. the data of its encoded files can't be
+        read after it is closed, and the archive file can be replaced or deleted on every system.
+        """
+        if self.__mapping is not None:
+            self.__mapping.close()
+            self.__mapping = None
 
-    def delete_files_from_archive(self, file_numbers: Union[list[str], list[int]]) -> bool:
-        for file_number in file_numbers:
-            if int(file_number) > len(self.get_encoded_files_list()) or int(file_number) < 1:
-                return False
-        else:
-            paths = []
-            paths_to_delete = []
-            for file in self.get_encoded_files_list():
-                paths.append(file.get_path())
-            sorted_paths = sorted(paths)
-            for file_number in file_numbers:
-                paths_to_delete.append(sorted_paths[int(file_number) - 1])
-
-            new_encoded_files = [file for file in self.get_encoded_files_list() if
-                                 file.get_path() not in paths_to_delete]
-            self.__encoded_file_list = new_encoded_files
-            return True
+    def __enter__(self) -> "Archive":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
 
     def get_size(self) -> int:
         """
@@ -170,6 +205,112 @@ class Archive:
         return sys.getsizeof(self)
 
 
+class Archive_Directory:
+    def __init__(self, records: list["Entry_Record"], hashed_password: Optional[bytes] = None):
+        """
+        Initialize an Archive_Directory object - the entries of an archive file, without their data.
+
+        Args:
+            records (list[Entry_Record]): The records of the entries, in archive order.
+            hashed_password (Optional[bytes]): The hashed password, or None if not password protected.
+        """
+        self.__records = records
+        self.__hashed_password = hashed_password
+
+    def is_protected(self) -> bool:
+        """
+        Check if the archive is password protected.
+
+        Returns:
+            bool: True if protected, False otherwise.
+        """
+        return self.__hashed_password is not None
+
+    def check_password(self, password_try: Any) -> bool:
+        """
+        Check if the provided password is correct.
+
+        Args:
+            password_try (str): The password to check.
+
+        Returns:
+            bool: True if the password is correct, False otherwise.
+        """
+        return check_password(self.__hashed_password, self.is_protected(), password_try)
+
+    def get_hashed_password(self) -> Optional[bytes]:
+        """
+        Get the hashed password of the archive.
+
+        Returns:
+            Optional[bytes]: The hashed password or None if not password protected.
+        """
+        return self.__hashed_password
+
+    def get_records(self) -> list["Entry_Record"]:
+        """
+        Get the records of the entries in the archive.
+
+        Returns:
+            list[Entry_Record]: The records, in archive order.
+        """
+        return self.__records
+
+    def get_archive_contents(self) -> str:
+        return archive_contents([record.path for record in self.__records])
+
+    def records_to_keep(self, file_numbers: Union[list[str], list[int]]) -> Optional[list["Entry_Record"]]:
+        """
+        Find the records left after deleting files by their numbers in the contents listing.
+
+        Args:
+            file_numbers (Union[list[str], list[int]]): The numbers of the files to delete.
+
+        Returns:
+            Optional[list[Entry_Record]]: The records of the other files, or None if a number is not in the listing.
+        """
+        paths_to_delete = numbered_paths([record.path for record in self.__records], file_numbers)
+        if paths_to_delete is None:
+            return None
+        return [record for record in self.__records if record.path not in paths_to_delete]
+
+
+def archive_contents(paths: list[Path]) -> str:
+    """
+    this function lists the paths of an archive's files, sorted and numbered
+    :param paths: the paths of the files
+    :return: the listing, a line for every file
+    """
+    return '\n' + ''.join(str(number) + " - " + str(path) + '\n' for number, path in enumerate(sorted(paths), 1))
+
+
+def numbered_paths(paths: list[Path], file_numbers: Union[list[str], list[int]]) -> Optional[list[Path]]:
+    """
+    this function finds the paths of files by their numbers in the contents listing
+    :param paths: the paths of the archive's files
+    :param file_numbers: the numbers of the files
+    :return: the paths, or None if a number is not in the listing
+    """
+    sorted_paths = sorted(paths)
+    for file_number in file_numbers:
+        if int(file_number) > len(sorted_paths) or int(file_number) < 1:
+            return None
+    return [sorted_paths[int(file_number) - 1] for file_number in file_numbers]
+
+
+def check_password(hashed_password: Any, protected: bool, password_try: Any) -> bool:
+    """
+    this function checks a password against the hashed password of an archive
+    :param hashed_password: the hashed password
+    :param protected: whether the archive is password protected
+    :param password_try: the password to check
+    :return: True if the password is correct, False otherwise
+    """
+    if password_try is None:
+        return not protected
+    return checkpw(password_try.encode("utf-8"), hashed_password)
+
+
 def hash_password(password: Any) -> Any:
     """
     Hash a password using bcrypt.
@@ -190,70 +331,471 @@ def hash_password(password: Any) -> Any:
 
 def write_archive(path: Path, archive: Archive) -> None:
     """
-    this function writes the archive instance to a file, using a predefined structure
+    this function writes the archive instance to a v2 .ido file, with a central directory.
+    the data of the entries is read one entry at a time, so mapped entries are never all in memory.
+    an archive read from the same path must be rewritten with rewrite_archive, since its mapped file can't be
+    replaced on every system.
     :param path: the new file path to write to
     :param archive:  the archive file
     :return: None
     """
-    with open(path, 'wb') as file:
-        # Write hashed password if exists
-        if archive.is_protected():
-            file.write((archive.get_hashed_password()))
+    _write_archive_file(path, archive.get_encoded_files_list(),
+                        archive.get_hashed_password() if archive.is_protected() else None)
+
+
+def rewrite_archive(path: Path, records: list["Entry_Record"], hashed_password: Optional[bytes],
+                    encoded_files: Iterable[Encoded_File] = ()) -> None:
+    """
+    this function rewrites an .ido file as a v2 archive with a central directory, keeping the entries of the
+    records and adding encoded files after them. the data of the kept entries is read from the file one entry
+    at a time, and the file is closed before the new archive replaces it.
+    :param path: archive_file path
+    :param records: the records of the entries to keep
+    :param hashed_password: the hashed password, or None if the archive is not password protected
+    :param encoded_files: the encoded files to add
+    :return: None
+    """
+    _write_archive_file(path, chain(read_entries(path, records), encoded_files), hashed_password)
+
+
+def _write_archive_file(path: Path, encoded_files: Iterable[Encoded_File], hashed_password: Optional[bytes]) -> None:
+    """
+    this function writes encoded files to a v2 .ido file with a central directory. the archive is written next
+    to the path and moved over it when done, so the files can be read from the archive it replaces.
+    :param path: the new file path to write to
+    :param encoded_files: the encoded files, read one at a time
+    :param hashed_password: the hashed password, or None if the archive is not password protected
+    :return: None
+    """
+    temp_path = path.with_name(path.name + ".tmp")
+    try:
+        with open(temp_path, 'wb') as file:
+            # Write the header, with the hashed password if exists
+            if hashed_password is not None:
+                file.write(ARCHIVE_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, PROTECTED_FLAG | DIRECTORY_FLAG,
+                                               hashed_password))
+            else:
+                file.write(ARCHIVE_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, DIRECTORY_FLAG, b''))
+            records = _write_records(file, encoded_files, ARCHIVE_HEADER.size)
+            _write_directory(file, records)
+        os.replace(temp_path, path)
+    except BaseException:
+        # a failed write leaves the archive it replaces as it was, and no temporary file
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
+def append_to_archive(path: Path, encoded_files: list[Encoded_File]) -> bool:
+    """
+    this function adds encoded files to a v2 .ido file with a central directory, in place.
+    the records of the files are written after the footer, followed by a new directory, so the data of the
+    entries already in the archive isn't read or moved, and an interrupted append leaves the previous directory
+    readable. entries replaced by a file with the same path, and the previous directory, stay in the archive
+    until it is rewritten.
+    :param path: archive_file path
+    :param encoded_files: the encoded files to add
+    :return: True if the files were added, False if the archive has no central directory
+    :raises ValueError: if the archive is corrupted
+    """
+    if archive_version(path) != ARCHIVE_VERSION:
+        return False
+    with open(path, 'r+b') as file:
+        flags, _ = read_archive_header(file)
+        if not flags & DIRECTORY_FLAG:
+            return False
+        records = read_directory_entries(file)
+        new_paths = {encoded_file.get_path() for encoded_file in encoded_files}
+        for record in records:
+            if record.path in new_paths:
+                record.superseded = True
+        end = file.seek(0, os.SEEK_END)
+        try:
+            records.extend(_write_records(file, encoded_files, end))
+            _write_directory(file, records)
+        except BaseException:
+            # a failed append leaves the archive as it was
+            file.truncate(end)
+            raise
+    return True
+
+
+def _write_records(file: BinaryIO, encoded_files: Iterable[Encoded_File], position: int) -> list["Entry_Record"]:
+    """
+    this function writes a record for every encoded file - its metadata and lengths, then its path, encoder and data
+    :param file: the archive file
+    :param encoded_files: the encoded files
+    :param position: the position of the file in the archive
+    :return: the records of the encoded files
+    """
+    records = []
+    for encoded_file in encoded_files:
+        check_entry_parameters(encoded_file.get_byte_len(), encoded_file.get_cap_size())
+        data = encoded_file.get_data()
+        record = Entry_Record(binary_flag_value(encoded_file), encoded_file.get_byte_len(), encoded_file.get_path(),
+                              encoded_file.get_encoder(), encoded_file.get_cap_size(), 0, len(data),
+                              encoded_file.get_original_size(), zlib.crc32(data))
+        path_data, encoder_data = record.encode_names()
+        file.write(ENTRY_HEADER.pack(record.flag_value, record.byte_length, record.cap_size, len(path_data),
+                                     len(encoder_data), record.length))
+        file.write(path_data)
+        file.write(encoder_data)
+        file.write(data)
+        record.offset = position + ENTRY_HEADER.size + len(path_data) + len(encoder_data)
+        position = record.offset + record.length
+        records.append(record)
+    return records
+
+
+def _write_directory(file: BinaryIO, records: list["Entry_Record"]) -> None:
+    """
+    this function writes the central directory of the records at the position of the file, and the footer pointing
+    at it
+    :param file: the archive file, after the last record
+    :param records: the records of the entries, in archive order
+    :return: None
+    """
+    directory_offset = file.tell()
+    for record in records:
+        path_data, encoder_data = record.encode_names()
+        flag_value = record.flag_value | SUPERSEDED_FLAG if record.superseded else record.flag_value
+        file.write(DIRECTORY_ENTRY.pack(flag_value, record.byte_length, record.cap_size, len(path_data),
+                                        len(encoder_data), record.offset, record.length, record.original_size,
+                                        record.checksum))
+        file.write(path_data)
+        file.write(encoder_data)
+    file.write(ARCHIVE_FOOTER.pack(directory_offset, len(records), FOOTER_MAGIC))
+
+
+def check_entry_parameters(byte_length: int, cap_size: int) -> None:
+    """
+    this function checks the byte length and cap size of an entry fit in its record
+    :param byte_length: the byte length
+    :param cap_size: the cap size
+    :return: None
+    :raises ValueError: if either of them is out of the range of its field
+    """
+    if not 0 <= byte_length <= MAX_BYTE_LENGTH:
+        raise ValueError("Byte size should be at most %d" % MAX_BYTE_LENGTH)
+    if not -MAX_CAP_SIZE - 1 <= cap_size <= MAX_CAP_SIZE:
+        raise ValueError("Cap size should be at most %d" % MAX_CAP_SIZE)
+
+
+def binary_flag_value(encoded_file: Encoded_File) -> int:
+    """
+    this function returns the binary flag value written for an encoded file
+    :param encoded_file: the encoded file
+    :return: TEXT_FLAG, BINARY_FLAG or BYTES_TEXT_FLAG
+    """
+    if not encoded_file.is_binary():
+        return TEXT_FLAG
+    return BYTES_TEXT_FLAG if encoded_file.is_text() else BINARY_FLAG
+
+
+class Entry_Record:
+    """the metadata of an archive entry, and where its data is in the archive file.
+    the checksum is None for entries of archives without a central directory, whose data wasn't read.
+    a superseded entry was replaced by a later one with the same path, and is kept only until the archive is
+    rewritten."""
+    __slots__ = ("flag_value", "byte_length", "path", "encoder", "cap_size", "offset", "length", "original_size",
+                 "checksum", "superseded")
+
+    def __init__(self, flag_value: int, byte_length: int, path: Path, encoder: str, cap_size: int, offset: int,
+                 length: int, original_size: int = 0, checksum: Optional[int] = None,
+                 superseded: bool = False) -> None:
+        if flag_value not in (TEXT_FLAG, BINARY_FLAG, BYTES_TEXT_FLAG):
+            raise ValueError("Invalid binary flag value: %d" % flag_value)
+        self.flag_value = flag_value
+        self.byte_length = byte_length
+        self.path = path
+        self.encoder = encoder
+        self.cap_size = cap_size
+        self.offset = offset
+        self.length = length
+        self.original_size = original_size
+        self.checksum = checksum
+        self.superseded = superseded
+
+    def encode_names(self) -> tuple[bytes, bytes]:
+        """
+        this function encodes the path and encoder name of the entry, as they are written in the archive
+        :return: the path and the encoder name
+        """
+        return str(self.path).encode('utf-8'), self.encoder.encode('utf-8')
+
+    def to_encoded_file(self, data: Union[bytes, tuple[mmap.mmap, int, int]]) -> Encoded_File:
+        """
+        this function creates the encoded file of the entry
+        :param data: the data of the entry, or its view in the memory mapped archive
+        :return: the encoded file
+        :raises ValueError: if the data doesn't match the checksum
+        """
+        if self.checksum is not None:
+            # the checksum of a view is computed on the mapping, without copying the data
+            if isinstance(data, bytes):
+                checksum = zlib.crc32(data)
+            else:
+                # the view is released right away, so the mapping can be closed
+                with memoryview(data[0]) as view:
+                    checksum = zlib.crc32(view[data[1]:data[1] + data[2]])
+            if checksum != self.checksum:
+                raise ValueError("Checksum mismatch: %s" % self.path)
+        return Encoded_File(data, self.flag_value != TEXT_FLAG, self.byte_length, self.path, self.encoder,
+                            self.cap_size, self.flag_value == BYTES_TEXT_FLAG, self.original_size)
+
+
+def archive_version(path: Path) -> int:
+    """
+    this function finds the container version of an .ido file by its magic number
+    :param path: archive_file path
+    :return: ARCHIVE_VERSION for a v2 archive, 1 otherwise
+    """
+    with open(path, 'rb') as file:
+        return ARCHIVE_VERSION if file.read(len(ARCHIVE_MAGIC)) == ARCHIVE_MAGIC else 1
+
+
+def read_archive_header(file: BinaryIO) -> tuple[int, Optional[bytes]]:
+    """
+    this function reads the header of a v2 archive, leaving the file at its first entry record
+    :param file: the archive file, at its start
+    :return: the archive flags, and the hashed password or None if the archive is not password protected
+    :raises ValueError: if the file is not a v2 archive
+    """
+    header = file.read(ARCHIVE_HEADER.size)
+    if len(header) != ARCHIVE_HEADER.size or not header.startswith(ARCHIVE_MAGIC):
+        raise ValueError("Not a v2 archive")
+    _, version, flags, hashed_password = ARCHIVE_HEADER.unpack(header)
+    if version != ARCHIVE_VERSION:
+        raise ValueError("Unsupported archive version: %d" % version)
+    if not flags & PROTECTED_FLAG:
+        return flags, None
+    return flags, hashed_password.rstrip(b'\x00')
+
+
+def read_entry_records(file: BinaryIO) -> Iterator[Entry_Record]:
+    """
+    this function reads the entry records of a v2 archive without a central directory, skipping their data
+    :param file: the archive file, after its header
+    :return: an iterator of the records, in archive order
+    :raises ValueError: if a record is cut short
+    """
+    file_size = os.fstat(file.fileno()).st_size
+    position = file.tell()
+    while position < file_size:
+        # the caller may read data between the records, so every record is read from its position
+        file.seek(position)
+        header = file.read(ENTRY_HEADER.size)
+        if len(header) != ENTRY_HEADER.size:
+            raise ValueError("Truncated archive entry")
+        flag_value, byte_length, cap_size, path_length, encoder_length, length = ENTRY_HEADER.unpack(header)
+        names = file.read(path_length + encoder_length)
+        offset = position + ENTRY_HEADER.size + path_length + encoder_length
+        if len(names) != path_length + encoder_length or offset + length > file_size:
+            raise ValueError("Truncated archive entry")
+        yield Entry_Record(flag_value, byte_length, Path(names[:path_length].decode('utf-8')),
+                           names[path_length:].decode('utf-8'), cap_size, offset, length)
+        position = offset + length
+
+
+def read_footer(file: BinaryIO, footer_end: Optional[int] = None) -> tuple[int, int]:
+    """
+    this function reads the footer of a v2 archive with a central directory
+    :param file: the archive file
+    :param footer_end: the position the footer ends at, the end of the file by default
+    :return: the offset of the directory, and the number of entries in it
+    :raises ValueError: if the footer is corrupted
+    """
+    if footer_end is None:
+        footer_end = os.fstat(file.fileno()).st_size
+    directory_end = footer_end - ARCHIVE_FOOTER.size
+    if directory_end < ARCHIVE_HEADER.size:
+        raise ValueError("Truncated archive directory")
+    file.seek(directory_end)
+    directory_offset, entry_count, magic = ARCHIVE_FOOTER.unpack(file.read(ARCHIVE_FOOTER.size))
+    if magic != FOOTER_MAGIC or not ARCHIVE_HEADER.size <= directory_offset <= directory_end:
+        raise ValueError("Corrupted archive footer")
+    return directory_offset, entry_count
+
+
+def read_directory_entries(file: BinaryIO) -> list[Entry_Record]:
+    """
+    this function reads the central directory of a v2 archive, from the last valid footer.
+    an interrupted append leaves part of its records or directory after the footer of the previous directory,
+    so when the footer at the end is not valid the footers before it are tried, last to first.
+    :param file: the archive file
+    :return: the records of the entries, superseded ones included, in archive order
+    :raises ValueError: if no footer points at a valid directory
+    """
+    footer_end = os.fstat(file.fileno()).st_size
+    try:
+        return _read_directory(file, footer_end)
+    except ValueError as error:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+            magic_position = mapping.rfind(FOOTER_MAGIC, ARCHIVE_HEADER.size, footer_end - 1)
+            while magic_position != -1:
+                try:
+                    return _read_directory(file, magic_position + len(FOOTER_MAGIC))
+                except ValueError:
+                    magic_position = mapping.rfind(FOOTER_MAGIC, ARCHIVE_HEADER.size,
+                                                   magic_position + len(FOOTER_MAGIC) - 1)
+        raise error
+
+
+def _read_directory(file: BinaryIO, footer_end: int) -> list[Entry_Record]:
+    """
+    this function reads the central directory pointed at by the footer ending at a position
+    :param file: the archive file
+    :param footer_end: the position the footer ends at
+    :return: the records of the entries, superseded ones included, in archive order
+    :raises ValueError: if the footer or the directory is corrupted
+    """
+    directory_offset, entry_count = read_footer(file, footer_end)
+    file.seek(directory_offset)
+    directory = file.read(footer_end - ARCHIVE_FOOTER.size - directory_offset)
+    records = []
+    position = 0
+    for _ in range(entry_count):
+        if position + DIRECTORY_ENTRY.size > len(directory):
+            raise ValueError("Truncated archive directory")
+        flag_value, byte_length, cap_size, path_length, encoder_length, offset, length, original_size, checksum = \
+            DIRECTORY_ENTRY.unpack_from(directory, position)
+        position += DIRECTORY_ENTRY.size + path_length + encoder_length
+        # the data of every entry is between the header and the directory
+        if position > len(directory) or offset < ARCHIVE_HEADER.size or offset + length > directory_offset:
+            raise ValueError("Corrupted archive directory")
+        names = directory[position - path_length - encoder_length:position]
+        records.append(Entry_Record(flag_value & ~SUPERSEDED_FLAG, byte_length,
+                                    Path(names[:path_length].decode('utf-8')), names[path_length:].decode('utf-8'),
+                                    cap_size, offset, length, original_size, checksum,
+                                    bool(flag_value & SUPERSEDED_FLAG)))
+    if position != len(directory):
+        raise ValueError("Corrupted archive directory")
+    return records
+
+
+def read_archive_directory(path: Path) -> Archive_Directory:
+    """
+    this function reads the entries of an .ido file without their data. only the central directory is read,
+    and archives written without one are walked record by record. superseded entries are left out.
+    :param path: archive_file path
+    :return: the archive directory
+    :raises ValueError: if the archive is corrupted
+    """
+    if archive_version(path) != ARCHIVE_VERSION:
+        hashed_password, entries = _read_archive_v1(path)
+        return Archive_Directory([record for record, _ in entries], hashed_password)
+    with open(path, 'rb') as file:
+        flags, hashed_password = read_archive_header(file)
+        # the directory follows the records, so an archive written with one can't be walked record by record
+        if flags & DIRECTORY_FLAG:
+            records = [record for record in read_directory_entries(file) if not record.superseded]
         else:
-            file.write(b'\x00' * 60)  # Write 60 null bytes to indicate no password
+            records = list(read_entry_records(file))
+    return Archive_Directory(records, hashed_password)
 
-        # Write encoded files data, binary flags, byte lengths and path
-        # after each data type - add a delimiter
-        for encoded_file in archive.get_encoded_files_list():
-            data = encoded_file.get_data()
-            file.write(data + b'x\\\\x')  # Write encoded file data
-            file.write(str(int(encoded_file.is_binary())).encode('utf-8') + b'x\\\\x')  # Write binary flag
-            file.write(str(encoded_file.get_byte_len()).encode('utf-8') + b'x\\\\x')  # Write byte length
-            file.write(str(encoded_file.get_path()).encode('utf-8') + b'x\\\\x')  # Write path
-            file.write(encoded_file.get_encoder().encode('utf-8') + b'x\\\\x')  # Write encoder
-            file.write(str(encoded_file.get_cap_size()).encode('utf-8') + b'x\\\\x')  # Write cap_size
+
+def read_entries(path: Path, records: list[Entry_Record]) -> Iterator[Encoded_File]:
+    """
+    this function reads the data of entries of an .ido file, seeking to every entry
+    :param path: archive_file path
+    :param records: the records of the entries to read
+    :return: an iterator of the encoded files of the entries, read one at a time
+    :raises ValueError: if the data of an entry doesn't match its checksum
+    """
+    with open(path, 'rb') as file:
+        for record in records:
+            file.seek(record.offset)
+            yield record.to_encoded_file(file.read(record.length))
+
+
+def map_entries(path: Path, records: list[Entry_Record]) -> tuple[Optional[mmap.mmap], list[Encoded_File]]:
+    """
+    this function creates the encoded files of entries of an .ido file, as views of the memory mapped file.
+    the data of an entry is read only when it is used, so archives larger than the memory can be opened.
+    :param path: archive_file path
+    :param records: the records of the entries
+    :return: the mapped file, or None without records, and the encoded files of the entries. the caller owns
+        the mapping, and closes it when the encoded files are no longer used.
+    :raises ValueError: if the data of an entry doesn't match its checksum
+    """
+    if not records:
+        return None, []
+    with open(path, 'rb') as file:
+        # the mapping stays open after the file is closed, until its owner closes it
+        mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        return mapping, [record.to_encoded_file((mapping, record.offset, record.length)) for record in records]
+    except ValueError:
+        mapping.close()
+        raise
+
+
+def select_records(records: list[Entry_Record], patterns: list[str]) -> list[Entry_Record]:
+    """
+    this function selects the entries matching any of the patterns - a file path, a folder path, or a glob such
+    as 'folder/*.txt' (a '*' matches across folders). paths are matched with '/' separators, as on any system.
+    :param records: the records of the entries
+    :param patterns: the patterns
+    :return: the records of the matching entries, in archive order
+    """
+    patterns = [pattern.replace('\\', '/').rstrip('/') for pattern in patterns]
+    selected = []
+    for record in records:
+        path = str(record.path).replace('\\', '/')
+        if any(path == pattern or path.startswith(pattern + '/') or fnmatchcase(path, pattern)
+               for pattern in patterns):
+            selected.append(record)
+    return selected
 
 
 def read_archive(path: Path) -> Archive:
     """
-    this function reads an .ido file from a path, and returns an archive instance
+    this function reads an .ido file from a path, and returns an archive instance.
+    the entries of a v2 archive are mapped from the file, until the archive is closed.
     :param path: archive_file path
     :return: archive
     """
-    encoded_files = []
-    password_protected = False
+    if archive_version(path) != ARCHIVE_VERSION:
+        hashed_password, entries = _read_archive_v1(path)
+        return Archive([record.to_encoded_file(data) for record, data in entries], hashed_password)
+    directory = read_archive_directory(path)
+    mapping, encoded_files = map_entries(path, directory.get_records())
+    # Return the archive, with or without the password, owning the mapping of its entries
+    return Archive(encoded_files, directory.get_hashed_password(), mapping)
+
+
+def _read_archive_v1(path: Path) -> tuple[Optional[bytes], list[tuple[Entry_Record, bytes]]]:
+    """
+    this function reads a v1 .ido file from a path
+    :param path: archive_file path
+    :return: the hashed password or None if the archive is not password protected, and the records of the entries
+        with their data
+    """
+    entries = []
     # read file in binary
     with open(path, 'rb') as file:
         # Read hashed password if exists
-        hashed_password = file.read(60)  # Assuming password hash length is 64 bytes
-        if hashed_password != b'\x00' * 60:  # Check if a hashed password exists
-            password_protected = True
+        hashed_password = file.read(PASSWORD_HASH_SIZE)
+        if hashed_password == b'\x00' * PASSWORD_HASH_SIZE:  # Check if a hashed password exists
+            hashed_password = None
 
         # Read encoded files data, binary flags, byte lengths, and paths
         combined_line = b''.join(file.readlines())
-        encoded_file_chunks = combined_line.split(b'x\\\\x')[:-1]  # Remove last empty element
+        encoded_file_chunks = combined_line.split(V1_DELIMITER)[:-1]  # Remove last empty element
 
-        # Split the combined line using the delimiter b'x\\\\x'
-        for i in range(0, len(encoded_file_chunks), 6):  # Each encoded file consists of 5 parts
+        # Split the combined line using the delimiter, keeping track of where the data of every entry is
+        offset = PASSWORD_HASH_SIZE
+        for i in range(0, len(encoded_file_chunks), 6):  # Each encoded file consists of 6 parts
             encoded_file_data = encoded_file_chunks[i]
-            binary_flag_data = encoded_file_chunks[i + 1]
-            byte_length_data = encoded_file_chunks[i + 2]
-            path_data = encoded_file_chunks[i + 3]
-            encoder_data = encoded_file_chunks[i + 4]
-            cap_size_data = encoded_file_chunks[i + 5]
-            # Convert data to appropriate types
-            binary_flag = bool(int(binary_flag_data.decode('utf-8')))
-            byte_length = int(byte_length_data.decode('utf-8'))
-            path = Path(path_data.decode('utf-8'))
-            encoder = encoder_data.decode('utf-8')
-            cap_size = int(cap_size_data.decode('utf-8'))
-            # Append the encoded file
-            encoded_files.append(Encoded_File(encoded_file_data, binary_flag, byte_length, path, encoder, cap_size))
-    # Return the archive, with or without the password
-    if password_protected:
-        return Archive(encoded_files, hashed_password)
-    else:
-        return Archive(encoded_files, None)
+            flag_value = int(encoded_file_chunks[i + 1].decode('utf-8'))
+            byte_length = int(encoded_file_chunks[i + 2].decode('utf-8'))
+            path_data = Path(encoded_file_chunks[i + 3].decode('utf-8'))
+            encoder = encoded_file_chunks[i + 4].decode('utf-8')
+            cap_size = int(encoded_file_chunks[i + 5].decode('utf-8'))
+            entries.append((Entry_Record(flag_value, byte_length, path_data, encoder, cap_size, offset,
+                                         len(encoded_file_data), 0, zlib.crc32(encoded_file_data)),
+                            encoded_file_data))
+            offset += sum(len(chunk) for chunk in encoded_file_chunks[i:i + 6]) + 6 * len(V1_DELIMITER)
+    return hashed_password, entries
 
 
 class DecryptError(Exception):
@@ -0,0 +1,248 @@
+from importlib.metadata import entry_points
+from typing import Callable, Optional, Union
+import warnings
+from compressor import Compressor, RLE_Compressor, LZW_Compressor, Huffman_Compressor, Pipeline_Compressor, \
+    Stream_Compressor, Store_Compressor, LZSS_Compressor, Range_Compressor, Auto_Compressor, RLE_VARIANTS, \
+    LZW_VARIANTS, PIPELINE_PREFIX, PIPELINE_DEFAULT, STREAM_CODECS, STORE_ENCODER, AUTO_COMPRESSOR, LZW_MAX_BITS, \
+    AUTO_CODEC_COSTS, LZSS_LEVEL_COSTS, LZSS_DEFAULT_LEVEL
+
+# packages can add codecs with an entry point in this group. each entry point is a function
+# with no arguments, which calls the register functions below.
+CODEC_ENTRY_POINT_GROUP = "file_compressor.codecs"
+
+# compressors that can be selected for compression, by name. the factory gets the variant,
+# or None for the default one, and raises ValueError for a variant it doesn't have.
+# the index of a compressor is its number on the command line.
+_compressors: dict[str, Callable[[Optional[str]], Compressor]] = {}
+# the encoding cost every compressor declares for a variant, in seconds a MB, or None if it declares none
+_costs: dict[str, Callable[[Optional[str]], Optional[float]]] = {}
+# decoders by the encoder name stored in the archive
+_decoders: dict[str, Callable[[], Compressor]] = {}
+# decoders of families of encoder names, by prefix. the factory gets the rest of the encoder name.
+_decoder_families: dict[str, Callable[[str], Compressor]] = {}
+_entry_points_loaded = False
+
+# the variants tried by the auto compressor for compressors whose default variant is a legacy format
+AUTO_VARIANTS = {"RLE": "RLE2", "LZW": "LZW2"}
+
+
+def register_compressor(name: str, factory: Callable[[Optional[str]], Compressor],
+                        cost: Union[float, Callable[[Optional[str]], Optional[float]], None] = None) -> None:
+    """
+    Register a compressor that can be selected for compression.
+
+    Args:
+        name (str): The compressor name, as selected on the command line and in the GUI.
+        factory (Callable[[Optional[str]], Compressor]): Creates the compressor of a variant, or of
+            the default variant for None. raises ValueError for an unknown variant.
+        cost (Union[float, Callable[[Optional[str]], Optional[float]], None]): The encoding cost the auto
+            compressor weighs, in seconds a MB - the same for every variant, or the cost of a variant.
+            None has the auto compressor measure it.
+    """
+    _compressors[name.upper()] = factory
+    _costs[name.upper()] = cost if callable(cost) else lambda variant: cost
+
+
+def register_decoder(encoder: str, factory: Callable[[], Compressor]) -> None:
+    """
+    Register the decoder of an encoder name stored in archives.
+
+    Args:
+        encoder (str): The encoder name.
+        factory (Callable[[], Compressor]): Creates the compressor that decodes the encoder's entries.
+    """
+    _decoders[encoder] = factory
+
+
+def register_decoder_family(prefix: str, factory: Callable[[str], Compressor]) -> None:
+    """
+    Register the decoder of every encoder name starting with a prefix.
+
+    Args:
+        prefix (str): The prefix of the encoder names.
+        factory (Callable[[str], Compressor]): Creates the decoding compressor from the rest of the
+            encoder name. raises ValueError if it isn't valid.
+    """
+    _decoder_families[prefix] = factory
+
+
+def load_entry_points() -> None:
+    """
+    Register the codecs of installed packages, once. a package that fails to load is skipped with a warning.
+    """
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+    _entry_points_loaded = True
+    for entry_point in entry_points(group=CODEC_ENTRY_POINT_GROUP):
+        try:
+            entry_point.load()()
+        except Exception as error:
+            warnings.warn("Unable to load codecs from %s: %s" % (entry_point.name, error))
+
+
+def compressor_names() -> list[str]:
+    """
+    Get the names of the compressors that can be selected, in command line number order.
+
+    Returns:
+        list[str]: The compressor names.
+    """
+    load_entry_points()
+    return list(_compressors)
+
+
+def get_compressor(compressor: Union[int, str], variant: Optional[str] = None) -> Compressor:
+    """
+    Create a compressor for compression.
+
+    Args:
+        compressor (Union[int, str]): The compressor name, or its number.
+        variant (Optional[str]): The compressor variant, None for its default one.
+
+    Returns:
+        Compressor: The compressor.
+
+    Raises:
+        ValueError: If there is no such compressor, or it doesn't have the variant.
+    """
+    names = compressor_names()
+    if isinstance(compressor, int):
+        if not 0 <= compressor < len(names):
+            raise ValueError("Unknown compressor number: %s" % compressor)
+        compressor = names[compressor]
+    if compressor.upper() not in _compressors:
+        raise ValueError("Unknown compressor: %s" % compressor)
+    return _compressors[compressor.upper()](variant)
+
+
+def get_decoder(encoder: str) -> Compressor:
+    """
+    Create the compressor that decodes archive entries of an encoder name.
+
+    Args:
+        encoder (str): The encoder name stored in the archive.
+
+    Returns:
+        Compressor: The decoding compressor.
+
+    Raises:
+        ValueError: If no codec decodes the encoder name.
+    """
+    load_entry_points()
+    if encoder in _decoders:
+        return _decoders[encoder]()
+    for prefix, factory in _decoder_families.items():
+        if encoder.startswith(prefix):
+            return factory(encoder[len(prefix):])
+    raise ValueError("Unknown encoder: %s" % encoder)
+
+
+def is_known_encoder(encoder: str) -> bool:
+    """
+    Check if an encoder name stored in an archive can be decoded.
+
+    Args:
+        encoder (str): The encoder name.
+
+    Returns:
+        bool: True if a registered codec decodes it, False otherwise.
+    """
+    try:
+        get_decoder(encoder)
+    except ValueError:
+        return False
+    return True
+
+
+def _register_builtin_codecs() -> None:
+    """register the compressors of this project, in their command line number order"""
+    register_compressor("RLE", lambda variant: RLE_Compressor(variant or "RLE"), AUTO_CODEC_COSTS["RLE"])
+    register_compressor("LZW", _lzw_compressor, AUTO_CODEC_COSTS["LZW"])
+    register_compressor("HUF", _huffman_compressor, AUTO_CODEC_COSTS["HUF"])
+    register_compressor("PIPE", lambda variant: Pipeline_Compressor(variant or PIPELINE_DEFAULT),
+                        AUTO_CODEC_COSTS["PIPE"])
+    for codec in STREAM_CODECS:
+        register_compressor(codec, lambda variant, codec=codec: Stream_Compressor(codec, _stream_level(variant)),
+                            AUTO_CODEC_COSTS[codec])
+    register_compressor(AUTO_COMPRESSOR,
+                        lambda variant: Auto_Compressor(_auto_candidates, get_decoder, variant or "balanced"))
+    register_compressor(STORE_ENCODER, _store_compressor, AUTO_CODEC_COSTS[STORE_ENCODER])
+    register_compressor("LZSS", _lzss_compressor, _lzss_cost)
+    register_compressor("RC", lambda variant: Range_Compressor(None if variant is None else int(variant)),
+                        AUTO_CODEC_COSTS["RC"])
+    for variant in RLE_VARIANTS:
+        register_decoder(variant, lambda variant=variant: RLE_Compressor(variant))
+    for variant in LZW_VARIANTS:
+        register_decoder(variant, lambda variant=variant: LZW_Compressor(variant))
+    register_decoder("HUF", Huffman_Compressor)
+    register_decoder_family(PIPELINE_PREFIX, Pipeline_Compressor)
+    for codec in STREAM_CODECS:
+        register_decoder(codec, lambda codec=codec: Stream_Compressor(codec))
+    register_decoder(STORE_ENCODER, Store_Compressor)
+    register_decoder("LZSS", LZSS_Compressor)
+    register_decoder("RC", Range_Compressor)
+
+
+def _auto_candidates() -> list[tuple[Compressor, Optional[float]]]:
+    """the codecs the auto compressor tries with their declared costs - every registered compressor but itself,
+    except for those that fail to create"""
+    candidates = []
+    for name in compressor_names():
+        if name == AUTO_COMPRESSOR:
+            continue
+        variant = AUTO_VARIANTS.get(name)
+        try:
+            candidates.append((get_compressor(name, variant), _costs[name](variant)))
+        except Exception as error:
+            warnings.warn("Unable to create compressor %s: %s" % (name, error))
+    return candidates
+
+
+def _huffman_compressor(variant: Optional[str]) -> Compressor:
+    """Huffman coding has a single format"""
+    if variant is not None and variant != "HUF":
+        raise ValueError("Unknown Huffman variant: %s" % variant)
+    return Huffman_Compressor()
+
+
+def _lzw_compressor(variant: Optional[str]) -> Compressor:
+    """the variant of LZW is its format, optionally followed by ':' and the max code width, and by ':' and the
+    policy of a full dictionary, such as 'LZW2:12:reset'"""
+    if variant is None:
+        return LZW_Compressor()
+    name, _, limits = variant.partition(":")
+    max_bits, _, policy = limits.partition(":")
+    return LZW_Compressor(name or "LZW", int(max_bits) if max_bits else LZW_MAX_BITS, policy or "monitor")
+
+
+def _store_compressor(variant: Optional[str]) -> Compressor:
+    """storing has a single format"""
+    if variant is not None and variant != STORE_ENCODER:
+        raise ValueError("Unknown store variant: %s" % variant)
+    return Store_Compressor()
+
+
+def _lzss_compressor(variant: Optional[str]) -> Compressor:
+    """the variant of LZSS is its level, optionally followed by ':' and the window bits, such as '9:20'"""
+    if variant is None:
+        return LZSS_Compressor()
+    level, _, window_bits = variant.partition(":")
+    return LZSS_Compressor(int(level), int(window_bits) if window_bits else None)
+
+
+def _lzss_cost(variant: Optional[str]) -> float:
+    """the cost of LZSS is the cost of its level"""
+    if variant is None:
+        return LZSS_LEVEL_COSTS[LZSS_DEFAULT_LEVEL]
+    return LZSS_LEVEL_COSTS[int(variant.partition(":")[0])]
+
+
+def _stream_level(variant: Optional[str]) -> Optional[int]:
+    """the variant of a standard library codec is its compression level"""
+    if variant is None:
+        return None
+    return int(variant)
+
+
+_register_builtin_codecs()
@@ -1,13 +1,448 @@
+import heapq
+import math
+import time
+import zlib
+from array import array
 from pathlib import Path
-from typing import Optional,  Union
-from io import StringIO
+from itertools import accumulate
+from typing import Callable, Iterator, Optional, Union
+from io import BytesIO, StringIO
+from collections import Counter
 from encoded_file import *
 
+try:
+    import numpy as np
+except ImportError:  # numpy is optional - the pure python engines are used without it
+    np = None
+try:
+    import bz2
+except ImportError:  # python may be built without bz2 / lzma - their compressors are left out
+    bz2 = None
+try:
+    import lzma
+except ImportError:
+    lzma = None
+
 # get base path of project. needed for all tests.
 CODE_BASE_PATH = Path(__file__).parent.resolve()
 TEST_BASE_PATH = CODE_BASE_PATH / "tests"
 
+# inputs smaller than this are not worth the numpy setup cost
+NUMPY_MIN_SIZE = 1 << 16
+
+# RLE formats, stored as the encoder name of each archive entry.
+# RLE - ascii decimal counts padded to the cap size, RLE2 - varint counts with no cap,
+# RLEP - PackBits style, varint headers for runs and for literal spans of non repeating blocks.
+RLE_VARIANTS = ("RLE", "RLE2", "RLEP")
+
+# LZW formats, stored as the encoder name of each archive entry.
+# LZW - decimal codes separated by '~', LZW2 - variable width binary codes, packed low bits first.
+LZW_VARIANTS = ("LZW", "LZW2")
+# LZW2 reserves code 256 to reset the dictionary, so new entries start at 257
+LZW_CLEAR_CODE = 256
+LZW_FIRST_CODE = 257
+LZW_MIN_WIDTH = 9
+# LZW2 dictionary limits - the maximal code width, and what to do once the dictionary is full.
+# reset - clear it right away, monitor - keep it and clear it only when the compression ratio drops.
+LZW_MAX_BITS = 16
+LZW_POLICIES = ("reset", "monitor")
+LZW_MONITOR_INTERVAL = 10000
+
+# Huffman codes are limited to 15 bits, so the code length of every byte fits in half a byte of the header
+HUF_MAX_CODE_LENGTH = 15
+# the Huffman encoder converts this many input bytes to bits at a time
+HUF_CHUNK_SIZE = 1 << 20
+
+# LZSS matches are at least LZSS_MIN_MATCH bytes long (one more when they are farther than LZSS_FAR),
+# at most LZSS_MAX_MATCH, and reach back at most 2 ** window bits bytes. every level is (longest hash chain
+# searched, match length that stops the search, match length below which the next position is tried for a
+# longer match, longest match whose inner positions are indexed).
+LZSS_MIN_MATCH = 3
+LZSS_MAX_MATCH = 1 << 16
+LZSS_FAR = 4096
+# the window bits - (lowest, highest, default)
+LZSS_WINDOW_BITS = (10, 21, 16)
+LZSS_LEVELS = {1: (4, 16, 0, 0), 2: (4, 16, 0, 8), 3: (8, 16, 0, 16), 4: (8, 32, 16, 16), 5: (8, 64, 32, 16),
+               6: (16, 64, 32, 16), 7: (32, 128, 128, 64), 8: (128, 258, 258, 258),
+               9: (1024, LZSS_MAX_MATCH, LZSS_MAX_MATCH, LZSS_MAX_MATCH)}
+# the default level tries the next position only for matches shorter than 32 bytes, so it encodes JSON about
+# 1.5 times slower than LZW2 and 15% smaller, and source code 30% smaller. the levels below it are not much
+# faster on JSON, and fall behind LZW2 on text of short repeated words.
+LZSS_DEFAULT_LEVEL = 6
+# the encoding cost of every level, in seconds a MB, as in AUTO_CODEC_COSTS
+LZSS_LEVEL_COSTS = {1: 0.8, 2: 1.0, 3: 1.1, 4: 1.3, 5: 1.4, 6: 1.5, 7: 2.3, 8: 3.8, 9: 8.0}
+
+# the range coder keeps 32 bit bounds, and a frequency table of the bytes seen after every context of the
+# last 0, 1 or 2 bytes. a seen byte gains RC_INCREMENT, and a table is halved once its total passes RC_MAX_TOTAL.
+RC_ORDERS = (0, 1, 2)
+RC_DEFAULT_ORDER = 2
+# at most RC_MAX_CONTEXTS contexts get a table of their own, and the contexts seen after them share one table,
+# so random data can't create a table for each of the 65536 order 2 contexts. encodings with the cap set
+# RC_CAPPED_FLAG in their order byte, and encodings without it are decoded with no cap.
+RC_MAX_CONTEXTS = 4096
+RC_CAPPED_FLAG = 0x80
+RC_INCREMENT = 32
+RC_MAX_TOTAL = 1 << 16
+RC_TOP = 1 << 24
+
+# pipelines of stages, stored as the encoder name "PIPE:" followed by the stages joined with "+".
+# DELTA - difference from the previous byte, MTF - move to front index of each byte,
+# BWT - Burrows-Wheeler transform of independent blocks, usually followed by MTF.
+PIPELINE_PREFIX = "PIPE:"
+PIPELINE_SEPARATOR = "+"
+PIPELINE_STAGES = RLE_VARIANTS + LZW_VARIANTS + ("HUF", "LZSS", "RC", "DELTA", "MTF", "BWT")
+PIPELINE_DEFAULT = "RLE2+HUF"
+# the default size of the blocks the BWT stage sorts. a pipeline can set it with the block bits after the stage,
+# such as 'BWT:18', which isn't stored in the encoder name since decoding doesn't need it.
+BWT_BLOCK_SIZE = 1 << 20
+# the block bits - (lowest, highest)
+BWT_BLOCK_BITS = (10, 24)
+
+# standard library codecs, stored as the encoder name of each archive entry, and their levels -
+# (lowest, highest, default)
+STREAM_LEVELS = {"ZLIB": (0, 9, 6), "BZ2": (1, 9, 9), "LZMA": (0, 9, 6)}
+STREAM_CODECS = tuple(codec for codec, module in (("ZLIB", zlib), ("BZ2", bz2), ("LZMA", lzma)) if module is not None)
+# errors the standard library codecs raise on corrupted data
+STREAM_ERRORS = (zlib.error, OSError, EOFError) + ((lzma.LZMAError,) if lzma is not None else ())
+# the standard library codecs stream the data in chunks of this size
+STREAM_CHUNK_SIZE = 1 << 20
+
+# files that are already compressed are stored as they are, under the encoder name "STORE".
+# they are recognized by their magic number - zip (and the office formats built on it), gzip, bz2, xz,
+# 7z, rar, zstd, png, jpeg, gif, pdf, ogg and mp3 - or by the entropy of a sample of their bytes.
+STORE_ENCODER = "STORE"
+STORE_MAGIC_NUMBERS = (b"PK\x03\x04", b"\x1f\x8b", b"BZh", b"\xfd7zXZ\x00", b"7z\xbc\xaf\x27\x1c", b"Rar!\x1a\x07",
+                       b"\x28\xb5\x2f\xfd", b"\x89PNG\r\n\x1a\n", b"\xff\xd8\xff", b"GIF8", b"%PDF", b"OggS", b"ID3")
+# the entropy is estimated on this many windows of this size, spread over the file. files smaller than
+# STORE_MIN_SIZE are too small to estimate, and are only stored for their magic number.
+STORE_SAMPLE_SIZE = 16384
+STORE_SAMPLE_COUNT = 4
+STORE_MIN_SIZE = 4096
+# files with more bits of entropy per byte than this are not worth compressing
+STORE_ENTROPY_THRESHOLD = 7.8
+
+# the compressor that picks a codec for every file, and what it optimizes - the compressed size, the
+# encoding speed, or both
+AUTO_COMPRESSOR = "AUTO"
+AUTO_OBJECTIVES = ("ratio", "speed", "balanced")
+# every codec is tried on this many windows of this size, spread over the file
+AUTO_SAMPLE_SIZE = 4096
+AUTO_SAMPLE_COUNT = 4
+# the encoding cost the built-in compressors declare, in seconds a MB, measured on text, source code and
+# binary files. declared costs keep the choice the same on every run and machine, and the cost of a codec
+# that declares none is measured on the sample it encodes.
+AUTO_CODEC_COSTS = {"RLE": 0.05, "LZW": 0.6, "HUF": 0.1, "PIPE": 0.3, "ZLIB": 0.05, "BZ2": 0.2, "LZMA": 0.7,
+                    "STORE": 0.0, "RC": 3.0}
+# the balanced objective adds this much to the compression ratio for every second a MB costs
+AUTO_TIME_WEIGHT = 0.05
+
+# byte size / cap size value that asks RLE_Compressor.tune to pick the parameters per file
+AUTO = "auto"
+# the parameter grid, samples and time limit of the RLE parameter tuning
+TUNE_BYTE_SIZES = (1, 2, 3, 4, 5, 8, 16)
+TUNE_CAP_SIZES = (9, 99, 999, 9999)
+TUNE_SAMPLE_SIZE = 2048
+TUNE_SAMPLE_COUNT = 4
+TUNE_TIME_BUDGET = 0.1
+
+
+# region RLE engine
+
+def _rle_runs(text: Union[str, bytes], byte_size: int, merge_tail: bool = False) -> Iterator[tuple[int, int]]:
+    """Scan the text once and yield a (start, count) pair for every run of identical byte_size blocks.
+    The RLE format never merges the last full block into a run - a block only joins a run if
+    at least one more byte follows it. merge_tail lifts that restriction for newer formats.
+    Runs are extended by comparing the already matched part of the run against the next slice
+    of the same size, so a run of n blocks costs O(log n) comparisons."""
+    length = len(text)
+    # memoryview slices of bytes are free, so the run prefix is never copied
+    view = memoryview(text) if isinstance(text, bytes) else text
+    limit = length if merge_tail else length - 1
+    i = 0
+    while i < length:
+        # the amount of blocks this run may hold
+        max_count = max((limit - i) // byte_size, 1)
+        count = 1
+        step = 1
+        while count < max_count:
+            # never compare more than the part of the run that was already matched
+            step = min(step, count, max_count - count)
+            if text.startswith(view[i:i + step * byte_size], i + count * byte_size):
+                count += step
+                step *= 2
+            elif step == 1:
+                break
+            else:
+                step //= 2
+        yield i, count
+        i += count * byte_size
+
+
+def _rle_encode(text: Union[str, bytes], byte_size: int, cap_size: int) -> Union[str, bytes]:
+    """Encode text in the RLE format - every record is a run-length count, zero padded to the
+    length of cap_size, followed by the repeated block. runs longer than the cap are split into
+    several records. bytes are encoded into bytes, and strings into strings."""
+    is_binary = isinstance(text, bytes)
+    width = len(str(cap_size))
+    encoding = BytesIO() if is_binary else StringIO()
+    cap_string = str(cap_size)
+    for start, count in _rle_runs(text, byte_size):
+        block = text[start:start + byte_size]
+        # binary data keeps a full cap record as the last one, strings move it to a trailing zero count
+        full_records = (count - 1) // cap_size if is_binary else count // cap_size
+        count -= full_records * cap_size
+        count_string = str(count).zfill(width)
+        if is_binary:
+            encoding.write((cap_string.encode('utf-8') + block) * full_records)
+            encoding.write(count_string.encode('utf-8') + block)
+        else:
+            encoding.write((cap_string + block) * full_records)
+            encoding.write(count_string + block)
+    return encoding.getvalue()
+
+
+def _rle_numpy_runs(text: bytes, byte_size: int, merge_tail: bool = False,
+                    chunk_blocks: int = 1 << 20) -> Iterator[tuple["np.ndarray", "np.ndarray", "np.ndarray"]]:
+    """Vectorized version of _rle_runs over the full blocks of the text. the text is viewed as a
+    2-D array of byte_size wide rows, and run boundaries are found with np.diff over the rows.
+    the rows are handled in chunks of chunk_blocks, so the temporary arrays stay small on huge
+    inputs. yields the rows array, with the starts and counts of the runs closed in each chunk."""
+    full_blocks = len(text) // byte_size
+    has_tail = len(text) > full_blocks * byte_size
+    blocks = np.frombuffer(text, dtype=np.uint8, count=full_blocks * byte_size).reshape(full_blocks, byte_size)
+    # start of the run that is still open at the end of the previous chunk
+    open_start = -1
+    for chunk_start in range(0, full_blocks, chunk_blocks):
+        chunk_end = min(chunk_start + chunk_blocks, full_blocks)
+        # compare every row to the one before it, including the last row of the previous chunk
+        first_row = max(chunk_start - 1, 0)
+        changed = np.diff(blocks[first_row:chunk_end], axis=0).any(axis=1)
+        boundaries = np.ones(chunk_end - chunk_start, dtype=bool)
+        boundaries[chunk_end - chunk_start - len(changed):] = changed
+        # the last full block can't join a run unless more bytes follow it
+        if not has_tail and not merge_tail and chunk_end == full_blocks:
+            boundaries[-1] = True
+        starts = chunk_start + np.flatnonzero(boundaries)
+        if len(starts) == 0:
+            continue
+        if open_start >= 0:
+            starts = np.concatenate(([open_start], starts))
+        if len(starts) > 1:
+            yield blocks, starts[:-1], np.diff(starts)
+        open_start = int(starts[-1])
+    if full_blocks:
+        yield blocks, np.array([open_start]), np.array([full_blocks - open_start])
+
+
+def _rle_encode_numpy(text: bytes, byte_size: int, cap_size: int, chunk_blocks: int = 1 << 20) -> bytes:
+    """Vectorized version of the RLE binary encoding, the output is identical to _rle_encode."""
+    width = len(str(cap_size))
+    encoding = BytesIO()
+    for blocks, starts, counts in _rle_numpy_runs(text, byte_size, chunk_blocks=chunk_blocks):
+        encoding.write(_rle_numpy_records(blocks, starts, counts, cap_size, width))
+    tail = text[len(text) - len(text) % byte_size:]
+    if tail:
+        encoding.write(str(1).zfill(width).encode('utf-8') + tail)
+    return encoding.getvalue()
+
+
+def _rle_numpy_records(blocks: "np.ndarray", run_starts: "np.ndarray", counts: "np.ndarray", cap_size: int,
+                       width: int) -> bytes:
+    """Build the fixed width RLE records of the given runs in bulk, splitting every run at the cap size"""
+    records_per_run = (counts - 1) // cap_size + 1
+    total_records = int(records_per_run.sum())
+    # every record holds the cap, except for the last record of each run which holds the remainder
+    record_counts = np.full(total_records, cap_size, dtype=np.int64)
+    record_counts[np.cumsum(records_per_run) - 1] = counts - (records_per_run - 1) * cap_size
+    records = np.empty((total_records, width + blocks.shape[1]), dtype=np.uint8)
+    # write the count as zero padded ascii digits
+    powers = 10 ** np.arange(width - 1, -1, -1, dtype=np.int64)
+    records[:, :width] = record_counts[:, None] // powers % 10 + ord('0')
+    records[:, width:] = blocks[np.repeat(run_starts, records_per_run)]
+    return records.tobytes()
+
+
+def _rle_decode(text: Union[str, bytes], byte_size: int, cap_size: int) -> Union[str, bytes]:
+    """Decode text in the RLE format. every record is a count of len(str(cap_size)) digits and a
+    block of byte_size, only the last block may be shorter. the blocks are joined once at the end."""
+    width = len(str(cap_size))
+    record_size = width + byte_size
+    blocks = [text[i + width:i + record_size] * int(text[i:i + width]) for i in range(0, len(text), record_size)]
+    return text[:0].join(blocks)
+
+
+def _rle_decode_numpy(text: bytes, byte_size: int, cap_size: int, chunk_records: int = 1 << 20) -> bytes:
+    """Vectorized version of the RLE decoding. the full records are parsed as a 2-D array,
+    and every block is repeated by its count with np.repeat straight into the output buffer."""
+    width = len(str(cap_size))
+    record_size = width + byte_size
+    full_records = len(text) // record_size
+    tail = text[full_records * record_size:]
+    records = np.frombuffer(text, dtype=np.uint8, count=full_records * record_size).reshape(full_records,
+                                                                                           record_size)
+    digits = records[:, :width] - np.uint8(ord('0'))
+    if (digits > 9).any() or (tail and not tail[:width].isdigit()):
+        raise ValueError("Invalid RLE count")
+    powers = 10 ** np.arange(width - 1, -1, -1, dtype=np.int64)
+    counts = digits @ powers
+    tail_count = int(tail[:width]) if tail else 0
+    body_size = int(counts.sum()) * byte_size
+    # allocate the decoded output once, and fill it chunk by chunk
+    decoded = np.empty(body_size + tail_count * len(tail[width:]), dtype=np.uint8)
+    position = 0
+    for chunk_start in range(0, full_records, chunk_records):
+        chunk = slice(chunk_start, chunk_start + chunk_records)
+        repeated = np.repeat(records[chunk, width:], counts[chunk], axis=0).reshape(-1)
+        decoded[position:position + len(repeated)] = repeated
+        position += len(repeated)
+    decoded[body_size:] = np.frombuffer(tail[width:] * tail_count, dtype=np.uint8)
+    return decoded.tobytes()
+
+
+def _varint(value: int) -> bytes:
+    """Encode a non-negative integer as an LEB128 varint - 7 bits per byte, low bits first,
+    with the high bit set on every byte except the last."""
+    if value < 0x80:
+        return bytes((value,))
+    varint = bytearray()
+    while value >= 0x80:
+        varint.append(value & 0x7F | 0x80)
+        value >>= 7
+    varint.append(value)
+    return bytes(varint)
+
+
+def _read_varint(data: bytes, position: int) -> tuple[int, int]:
+    """Read an LEB128 varint from data at the given position, returns the value and the next position"""
+    value = 0
+    shift = 0
+    while True:
+        if position >= len(data):
+            raise ValueError("Truncated varint")
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+def _rle2_encode(text: bytes, byte_size: int) -> bytes:
+    """Encode bytes in the RLE2 format - every record is the run length as a varint,
+    followed by the repeated block. runs are not capped, and only the last block may be shorter."""
+    encoding = BytesIO()
+    for start, count in _rle_runs(text, byte_size, merge_tail=True):
+        encoding.write(_varint(count))
+        encoding.write(text[start:start + byte_size])
+    return encoding.getvalue()
+
+
+def _rle2_encode_numpy(text: bytes, byte_size: int, chunk_blocks: int = 1 << 20) -> bytes:
+    """Vectorized version of the RLE2 encoding, the output is identical to _rle2_encode."""
+    encoding = BytesIO()
+    for blocks, starts, counts in _rle_numpy_runs(text, byte_size, merge_tail=True, chunk_blocks=chunk_blocks):
+        # the size of every varint, and the offset of every record in the chunk
+        varint_sizes = np.ones(len(counts), dtype=np.int64)
+        remaining = counts >> 7
+        while remaining.any():
+            varint_sizes += remaining > 0
+            remaining >>= 7
+        offsets = np.concatenate(([0], np.cumsum(varint_sizes + byte_size)[:-1]))
+        records = np.empty(int(varint_sizes.sum()) + len(counts) * byte_size, dtype=np.uint8)
+        for byte_index in range(int(varint_sizes.max())):
+            has_byte = varint_sizes > byte_index
+            continued = (varint_sizes > byte_index + 1) * 0x80
+            records[offsets[has_byte] + byte_index] = ((counts >> (7 * byte_index)) & 0x7F | continued)[has_byte]
+        block_offsets = offsets + varint_sizes
+        for column in range(byte_size):
+            records[block_offsets + column] = blocks[starts, column]
+        encoding.write(records.tobytes())
+    tail = text[len(text) - len(text) % byte_size:]
+    if tail:
+        encoding.write(_varint(1) + tail)
+    return encoding.getvalue()
+
+
+def _rle2_decode(text: bytes, byte_size: int) -> bytes:
+    """Decode bytes in the RLE2 format, the blocks are joined once at the end"""
+    blocks = []
+    position = 0
+    length = len(text)
+    while position < length:
+        count = text[position]
+        if count < 0x80:
+            position += 1
+        else:
+            count, position = _read_varint(text, position)
+        blocks.append(text[position:position + byte_size] * count)
+        position += byte_size
+    return b''.join(blocks)
+
+
+def _rlep_encode(text: bytes, byte_size: int, runs: Iterator[tuple[int, int]]) -> bytes:
+    """Encode bytes in the RLEP format. every record starts with a varint header of
+    (block count << 1 | is_run). a run record is followed by the repeated block, and a literal
+    record is followed by all of its blocks as is - so data with no repetitions costs a single
+    header. runs holds the (start, count) of every run worth a record of its own, in order."""
+    encoding = BytesIO()
+    view = memoryview(text)
+    literal_start = 0
+    for start, count in runs:
+        if literal_start < start:
+            _rlep_write_literal(encoding, view[literal_start:start], byte_size)
+        encoding.write(_varint(count << 1 | 1))
+        encoding.write(view[start:start + byte_size])
+        literal_start = start + count * byte_size
+    if literal_start < len(text):
+        _rlep_write_literal(encoding, view[literal_start:], byte_size)
+    return encoding.getvalue()
+
+
+def _rlep_write_literal(encoding: BytesIO, literal: memoryview, byte_size: int) -> None:
+    """write a literal record, only the last literal of the data may end with a partial block"""
+    encoding.write(_varint(-(-len(literal) // byte_size) << 1))
+    encoding.write(literal)
+
+
+def _rlep_min_run(byte_size: int) -> int:
+    """the shortest run that saves more than the headers it adds over keeping it in a literal"""
+    return 2 // byte_size + 2
+
+
+def _rlep_runs(text: bytes, byte_size: int) -> Iterator[tuple[int, int]]:
+    """the runs of the text that are long enough for a run record, with numpy for large inputs if installed"""
+    min_run = _rlep_min_run(byte_size)
+    if np is None or len(text) < NUMPY_MIN_SIZE:
+        return ((start, count) for start, count in _rle_runs(text, byte_size, merge_tail=True) if count >= min_run)
+    return _rlep_numpy_runs(text, byte_size, min_run)
+
+
+def _rlep_numpy_runs(text: bytes, byte_size: int, min_run: int, chunk_blocks: int = 1 << 20) \
+        -> Iterator[tuple[int, int]]:
+    """Vectorized version of the run selection, only the long runs reach python"""
+    for _, starts, counts in _rle_numpy_runs(text, byte_size, merge_tail=True, chunk_blocks=chunk_blocks):
+        long_runs = counts >= min_run
+        for start, count in zip((starts[long_runs] * byte_size).tolist(), counts[long_runs].tolist()):
+            yield start, count
+
+
+def _rlep_decode(text: bytes, byte_size: int) -> bytes:
+    """Decode bytes in the RLEP format, the blocks are joined once at the end"""
+    blocks = []
+    position = 0
+    length = len(text)
+    while position < length:
+        header, position = _read_varint(text, position)
+        count = header >> 1
+        if header & 1:
+            blocks.append(text[position:position + byte_size] * count)
+            position += byte_size
+        else:
+            blocks.append(text[position:position + count * byte_size])
+            position += count * byte_size
+    return b''.join(blocks)
 
+# endregion
 
 # region Compressor Classes
 
@@ -69,59 +504,31 @@ class Compressor:
 class RLE_Compressor(Compressor):
     """The RLE compressor function is a type of Compressor, which uses the Run Length Encoding
     Algorithm.The class overrides the encoding & decoding of the parent class, and implements the
-    algorithm."""
+    algorithm. the variant selects the record format, and is stored as the encoder name."""
 
-    def __init__(self) -> None:
-        super().__init__("RLE")
+    def __init__(self, variant: str = "RLE") -> None:
+        if variant not in RLE_VARIANTS:
+            raise ValueError("Unknown RLE variant: %s" % variant)
+        super().__init__(variant)
 
     def binary_encode(self, text: bytes, byte_size: int, file_name: str, cap_size: int = 99) -> Encoded_File:
         """Method to encode bytes using binary encoding.
-        The function iterates
-        over the bytes, and finds lengths of recurring values,
+        The function scans the bytes once, finds lengths of recurring values,
         it stores the amount of recurrence, and then the value in a new string
-        finally, it returns the new string"""
-        encoding = b''  # bytes encoding
-        i = 0
-        while i < len(text):  # iterating over the text indices
-            count = 1
-            # find recurring characters
-            while (i + count * byte_size < len(text) and (len(text) - (i + count * byte_size)) > byte_size and
-                   text[i: i + byte_size] == text[i + count * byte_size: i + (count + 1) * byte_size]):
-                count += 1
-            # if we're over the given byte size, store data as the max byte,
-            total_count = count
-            while count > cap_size:
-                encoding += str(cap_size).encode('utf-8') + (text[i:i + byte_size])
-                count -= cap_size  # retry after removing n bytes from the counter
-            padding = "0" * (len(str(cap_size)) - len(str(count)))
-            byte_padding = padding.encode('utf-8')
-            encoding += byte_padding + str(count).encode('utf-8') + (text[i:i + byte_size])
-            i += byte_size * total_count
+        finally, it returns the new string.
+        large inputs are scanned with numpy when it is installed."""
+        encoding = self.encode_bytes(text, byte_size, cap_size)
         # return the data encoded as an archive instance
         return Encoded_File(encoding, True, byte_size, Path(file_name), self.get_name(), cap_size)
 
     def string_encode(self, text: str, byte_size: int, file_name: str, cap_size: int = 99) -> Encoded_File:
-        """the string encode is similar to the byte encode, only using strings"""
-        encoding = ''
-        i = 0
-        # iterating over string indices
-        while i < len(text):
-            count = 1
-            # as long as there are recurrences, add to counter
-            while (i + count * byte_size < len(text) and (len(text) - (i + count * byte_size)) > byte_size and
-                   text[i: i + byte_size] == text[i + count * byte_size: i + (count + 1) * byte_size]):
-                count += 1
-            # if we've reached the byte size limit, store in byte-size and remove from counter
-            total_count = count
-            while count >= cap_size:
-                encoding += str(cap_size) + text[i: i + byte_size]
-                count -= cap_size
-            # add new data to encoded string
-            run_length_size = len(str(cap_size))
-            encoding += "0" * (run_length_size - len(str(count))) + str(count) + text[i:i + byte_size]
-            i += byte_size * total_count
-        # turn string to bytes:
-        byte_string = encoding.encode('utf-8')
+        """the string encode is similar to the byte encode, only using strings.
+        the newer formats work on the utf-8 bytes of the string."""
+        if self.get_name() == "RLE":
+            # turn string to bytes:
+            byte_string = _rle_encode(text, byte_size, cap_size).encode('utf-8')
+        else:
+            byte_string = self.encode_bytes(text.encode('utf-8'), byte_size, cap_size)
         # return the data encoded as an archive instance
         return Encoded_File(byte_string, False, byte_size, Path(file_name), self.get_name(), cap_size)
 
@@ -129,26 +536,8 @@ class RLE_Compressor(Compressor):
         """the binary decoding is basically the opposite function of the binary encode.
         it receives an archive file, and it recreates the original bytes string
         using the byte_length stored in the archive instance."""
-        i = 0
         # get the byte len & cap size from the encoded file
-        byte_len = encoded_file.get_byte_len()
-        cap_size = encoded_file.get_cap_size()
-        # calculate it's size in the encoded string
-        indicator_size = len(str(cap_size))
-        decoded_text = b''
-        # get encoded string
-        text = encoded_file.get_data()
-        # iterate on string indices
-        while i < len(text):
-            # get the current run-length count
-            count = int((text[i:i + indicator_size]).decode('utf-8'))
-            # get the current character_string
-            char = text[i + indicator_size:i + indicator_size + byte_len]
-            # add their product to the decoded text
-            decoded_text += char * count
-            # go to next run_length_count
-            i += indicator_size + byte_len
-        return decoded_text
+        return self.decode_bytes(encoded_file.get_data(), encoded_file.get_byte_len(), encoded_file.get_cap_size())
 
     def string_decode(self, encoded_file: Encoded_File) -> Optional[str]:
         """the string decoding is basically the opposite function of the string encode.
@@ -157,32 +546,277 @@ class RLE_Compressor(Compressor):
         # get the byte len from the archive
         byte_len = encoded_file.get_byte_len()
         cap_size = encoded_file.get_cap_size()
-        # calculate it's size in the encoded string
-        indicator_size = len(str(cap_size))
-        decoded_text = ''
-        i = 0
         # get encoded bytes
         byte_text = encoded_file.get_data()
+        # plain ascii text has one byte per character, so the binary engines can decode it
+        if self.get_name() != "RLE" or byte_text.isascii():
+            return self.decode_bytes(byte_text, byte_len, cap_size).decode('utf-8')
         # turn bytes to encoded string
-        text = byte_text.decode('utf-8')
-        # iterate on string indices
-        while i < len(text):
-            # get the current run-length count
-            run_length = int(text[i:i + indicator_size])
-            # add to decoded text the counter times the character
-            decoded_text += str(
-                (int(run_length)) * (text[i + int(indicator_size): i + int(indicator_size) + byte_len]))
-            i += indicator_size + byte_len
-        return decoded_text
+        return _rle_decode(byte_text.decode('utf-8'), byte_len, cap_size)
+
+    def encode_bytes(self, text: bytes, byte_size: int, cap_size: int = 99) -> bytes:
+        """encode raw bytes in the format of this variant, with numpy for large inputs if installed"""
+        use_numpy = np is not None and len(text) >= NUMPY_MIN_SIZE
+        if self.get_name() == "RLEP":
+            return _rlep_encode(text, byte_size, _rlep_runs(text, byte_size))
+        if self.get_name() == "RLE2":
+            return _rle2_encode_numpy(text, byte_size) if use_numpy else _rle2_encode(text, byte_size)
+        # the vectorized path counts in int64, so very large caps stay in python
+        if use_numpy and cap_size < 10 ** 18:
+            return _rle_encode_numpy(text, byte_size, cap_size)
+        return _rle_encode(text, byte_size, cap_size)
+
+    def decode_bytes(self, text: bytes, byte_size: int, cap_size: int = 99) -> bytes:
+        """decode raw bytes in the format of this variant, with numpy for large inputs if installed"""
+        if self.get_name() == "RLEP":
+            return _rlep_decode(text, byte_size)
+        if self.get_name() == "RLE2":
+            return _rle2_decode(text, byte_size)
+        if np is not None and len(text) >= NUMPY_MIN_SIZE and cap_size < 10 ** 18:
+            return _rle_decode_numpy(text, byte_size, cap_size)
+        return _rle_decode(text, byte_size, cap_size)
+
+    def tune(self, text: Union[str, bytes], byte_size: Union[int, str] = AUTO,
+             cap_size: Union[int, str] = AUTO) -> tuple[int, int]:
+        """pick the byte size and cap size for the text. the runs of a few windows sampled from it
+        are found for every size of TUNE_BYTE_SIZES, and their encoded size is computed for every
+        cap of TUNE_CAP_SIZES. a parameter that is not AUTO is kept as given.
+        when TUNE_TIME_BUDGET runs out, the best setting so far is returned."""
+        byte_sizes = TUNE_BYTE_SIZES if byte_size == AUTO else (byte_size,)
+        if cap_size != AUTO:
+            cap_sizes = (cap_size,)
+        elif self.get_name() == "RLE":
+            cap_sizes = TUNE_CAP_SIZES
+        else:
+            # the newer formats don't cap runs, so any cap gives the same result
+            cap_sizes = (99,)
+        if len(text) <= TUNE_SAMPLE_SIZE * TUNE_SAMPLE_COUNT:
+            window_starts = [0]
+            window_size = len(text)
+        else:
+            # spread the windows evenly over the text
+            window_starts = [i * (len(text) - TUNE_SAMPLE_SIZE) // (TUNE_SAMPLE_COUNT - 1)
+                             for i in range(TUNE_SAMPLE_COUNT)]
+            window_size = TUNE_SAMPLE_SIZE
+        deadline = time.perf_counter() + TUNE_TIME_BUDGET
+        best_setting = (byte_sizes[0], cap_sizes[0])
+        best_size = -1
+        for trial_byte_size in byte_sizes:
+            # the runs don't depend on the cap, so they are found once for every byte size.
+            # windows start on a block border, as the blocks of the whole file do
+            run_counts = [count for start in window_starts
+                          for _, count in _rle_runs(text[start - start % trial_byte_size:
+                                                         start - start % trial_byte_size + window_size],
+                                                    trial_byte_size, merge_tail=self.get_name() != "RLE")]
+            for trial_cap_size in cap_sizes:
+                size = self.estimate_size(run_counts, trial_byte_size, trial_cap_size)
+                if best_size < 0 or size < best_size:
+                    best_size = size
+                    best_setting = (trial_byte_size, trial_cap_size)
+            if time.perf_counter() > deadline:
+                break
+        return best_setting
+
+    def estimate_size(self, run_counts: list[int], byte_size: int, cap_size: int) -> int:
+        """the size of the encoding of runs with the given counts, in the format of this variant"""
+        if self.get_name() == "RLE":
+            records = sum((count - 1) // cap_size + 1 for count in run_counts)
+            return records * (len(str(cap_size)) + byte_size)
+        if self.get_name() == "RLE2":
+            return sum(len(_varint(count)) for count in run_counts) + len(run_counts) * byte_size
+        # RLEP keeps the short runs in literal spans, that cost a header each
+        min_run = _rlep_min_run(byte_size)
+        size = 0
+        in_literal = False
+        for count in run_counts:
+            if count >= min_run:
+                size += len(_varint(count << 1 | 1)) + byte_size
+                in_literal = False
+            else:
+                size += count * byte_size + (0 if in_literal else 1)
+                in_literal = True
+        return size
 
 
 # endregion
 
 # region LZW compressor
+def _lzw_code_width(next_code: int) -> int:
+    """the bit width of a code emitted while next_code is the next free dictionary code"""
+    return max(LZW_MIN_WIDTH, (next_code - 1).bit_length())
+
+
+class _LZW_Table:
+    """An LZW decoding dictionary that keeps only the offset and length of every entry in the output.
+    a new entry is the previous entry followed by the first byte written after it, so each entry is a
+    slice of the output, and the dictionary takes a dozen bytes per code.
+    codes below first_code are single bytes, or reserved."""
+    __slots__ = ("first_code", "offsets", "lengths", "last")
+
+    def __init__(self, first_code: int) -> None:
+        self.first_code = first_code
+        self.offsets = array('Q', [0]) * first_code
+        self.lengths = array('I', [1]) * first_code
+        # the output offset of the last written entry
+        self.last = 0
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    def add(self, previous: int) -> None:
+        """add the entry of the last written code, previous, followed by the next byte written"""
+        self.offsets.append(self.last)
+        self.lengths.append(self.lengths[previous] + 1)
+
+    def clear(self) -> None:
+        del self.offsets[self.first_code:]
+        del self.lengths[self.first_code:]
+
+    def write(self, code: int, result: bytearray) -> None:
+        """append the entry of a code to result"""
+        self.last = len(result)
+        if code < 256:
+            result.append(code)
+            return
+        start = self.offsets[code]
+        end = start + self.lengths[code]
+        if end > len(result):
+            # an entry added right before it is written ends with its own first byte
+            result += result[start:end - 1]
+            result.append(result[start])
+        else:
+            result += result[start:end]
+
+
+def _lzw2_encode(text: bytes, max_bits: int = LZW_MAX_BITS, policy: str = "monitor") -> bytes:
+    """Encode bytes as an LZW2 stream - a header byte with the maximal code width (0 for no limit),
+    followed by the codes packed low bits first. every code is as wide as the largest code the
+    dictionary could hold at that point, starting at 9 bits.
+    once the dictionary holds 2 ** max_bits codes it stops growing. with the "reset" policy a CLEAR
+    code is written right away and the dictionary starts over. with the "monitor" policy the full
+    dictionary is kept, and cleared only when the compression ratio of the last
+    LZW_MONITOR_INTERVAL bytes drops below the best ratio seen since it filled."""
+    # the dictionary maps (prefix code << 8 | next byte) to a code, single bytes are their own codes
+    dictionary = {}
+    limit = 1 << max_bits if max_bits else -1
+    next_code = LZW_FIRST_CODE
+    width = LZW_MIN_WIDTH
+    encoding = bytearray((max_bits,))
+    bit_buffer = 0
+    bit_count = 0
+    current_code = -1
+    # ratio monitoring of a full dictionary
+    checkpoint_in = 0
+    checkpoint_out = 0
+    best_ratio = 0.0
+    lookup = dictionary.get
+    for position, byte in enumerate(text):
+        key = (current_code << 8) | byte
+        code = lookup(key)
+        if code is not None:
+            current_code = code
+            continue
+        if current_code < 0:
+            current_code = byte
+            continue
+        # write the code of the current bytes
+        bit_buffer |= current_code << bit_count
+        bit_count += width
+        if next_code != limit:
+            dictionary[key] = next_code
+            next_code += 1
+            if next_code > 1 << width:
+                width += 1
+        else:
+            clear = policy == "reset"
+            if policy == "monitor" and position - checkpoint_in >= LZW_MONITOR_INTERVAL:
+                out_size = len(encoding) * 8 + bit_count
+                ratio = (position - checkpoint_in) * 8 / (out_size - checkpoint_out)
+                clear = ratio < best_ratio
+                best_ratio = 0.0 if clear else max(best_ratio, ratio)
+                checkpoint_in = position
+                checkpoint_out = out_size
+            if clear:
+                bit_buffer |= LZW_CLEAR_CODE << bit_count
+                bit_count += width
+                dictionary = {}
+                lookup = dictionary.get
+                next_code = LZW_FIRST_CODE
+                width = LZW_MIN_WIDTH
+        current_code = byte
+        while bit_count >= 8:
+            encoding.append(bit_buffer & 0xFF)
+            bit_buffer >>= 8
+            bit_count -= 8
+    if current_code >= 0:
+        bit_buffer |= current_code << bit_count
+        bit_count += width
+    # flush the last bits, the padding is always shorter than a code
+    while bit_count > 0:
+        encoding.append(bit_buffer & 0xFF)
+        bit_buffer >>= 8
+        bit_count -= 8
+    return bytes(encoding)
+
+
+def _lzw2_decode(text: bytes) -> bytes:
+    """Decode an LZW2 stream. the decoder adds every dictionary entry one code after the encoder,
+    so the width of a code is computed from the encoder's next free code. the dictionary stops
+    growing at the maximal width from the header, and starts over on every CLEAR code."""
+    dictionary = _LZW_Table(LZW_FIRST_CODE)
+    limit = 1 << text[0] if text[0] else -1
+    result = bytearray()
+    bit_buffer = 0
+    bit_count = 0
+    position = 1
+    previous = -1
+    while True:
+        # the encoder added an entry after every code but the first one of a dictionary, until it was full
+        size = len(dictionary)
+        growing = previous >= 0 and size != limit
+        width = _lzw_code_width(size + 1 if growing else size)
+        while bit_count < width and position < len(text):
+            bit_buffer |= text[position] << bit_count
+            position += 1
+            bit_count += 8
+        if bit_count < width:
+            break
+        code = bit_buffer & ((1 << width) - 1)
+        bit_buffer >>= width
+        bit_count -= width
+        if code == LZW_CLEAR_CODE:
+            dictionary.clear()
+            previous = -1
+            continue
+        # the code may be the entry added for it, which is the previous entry followed by its own first byte
+        if code > size or code == size and not growing:
+            raise ValueError('Bad compressed code: %s' % code)
+        if growing:
+            dictionary.add(previous)
+        dictionary.write(code, result)
+        previous = code
+    return bytes(result)
+
 
 class LZW_Compressor(Compressor):
-    def __init__(self) -> None:
-        super().__init__("LZW")
+    """The LZW compressor is a type of Compressor, which uses the Lempel-Ziv-Welch algorithm.
+    the variant selects the code stream format, and is stored as the encoder name."""
+
+    def __init__(self, variant: str = "LZW", max_bits: int = LZW_MAX_BITS, policy: str = "monitor") -> None:
+        """max_bits and policy bound the dictionary, 0 max_bits lets it grow with no limit.
+        the LZW format has no CLEAR code, so its dictionary stops growing once it is full - the
+        decoder keeps adding entries the encoder never refers to, so old archives decode the same."""
+        if variant not in LZW_VARIANTS:
+            raise ValueError("Unknown LZW variant: %s" % variant)
+        if max_bits != 0 and not LZW_MIN_WIDTH <= max_bits <= 32:
+            raise ValueError("Max bits should be 0, or between %s and 32" % LZW_MIN_WIDTH)
+        if policy not in LZW_POLICIES:
+            raise ValueError("Unknown dictionary policy: %s" % policy)
+        if variant == "LZW" and policy == "reset":
+            raise ValueError("The LZW format can't reset its dictionary, use LZW2")
+        super().__init__(variant)
+        self.__max_bits = max_bits
+        self.__policy = policy
 
     def string_encode(self, text: str, byte_size: int, file_name: str, cap_size: int = 99) -> Encoded_File:
         """
@@ -197,11 +831,16 @@ class LZW_Compressor(Compressor):
         Returns:
         An instance of Encoded_File representing the encoded file.
         """
+        # the LZW2 stream works on the utf-8 bytes of the string
+        if self.get_name() == "LZW2":
+            return Encoded_File(_lzw2_encode(text.encode('utf-8'), self.__max_bits, self.__policy), False, byte_size,
+                                Path(file_name), self.get_name(), cap_size)
 
         # First, build the dictionary with keys ranging from 1 to 256,
         # each key representing a single character in the text.
         dict_size = 256
         dictionary = dict((chr(i), i) for i in range(dict_size))
+        limit = 1 << self.__max_bits if self.__max_bits else -1
 
         # Initialize parameters
         current_string = ""
@@ -220,9 +859,10 @@ class LZW_Compressor(Compressor):
                 # Add the code for the current string to the result
                 result.append(dictionary[current_string])
 
-                # Add the concatenated string to the dictionary
-                dictionary[concat_string] = dict_size
-                dict_size += 1
+                # Add the concatenated string to the dictionary, unless it is full
+                if dict_size != limit:
+                    dictionary[concat_string] = dict_size
+                    dict_size += 1
 
                 # Reset the current string to the current character
                 current_string = char
@@ -250,6 +890,8 @@ class LZW_Compressor(Compressor):
         Returns:
         The decompressed content of the file as a string.
         """
+        if self.get_name() == "LZW2":
+            return _lzw2_decode(encoded_file.get_data()).decode('utf-8')
 
         # Recreate the compressed list of integers from the encoded file data
         compressed_str = (encoded_file.get_data().decode('utf-8')).split("~")[:-1]
@@ -304,42 +946,51 @@ class LZW_Compressor(Compressor):
         Returns:
         An instance of Encoded_File representing the encoded file.
         """
+        if self.get_name() == "LZW2":
+            return Encoded_File(_lzw2_encode(text, self.__max_bits, self.__policy), True, byte_size, Path(file_name),
+                                self.get_name(), cap_size)
 
-        # Build the dictionary with keys ranging from 1 to 256,
-        # each key representing a single byte in the text.
+        # Build the dictionary as a trie - each key is the code of a prefix shifted left by 8 bits,
+        # or'ed with the next byte. single bytes are their own codes, so they are not stored.
         dict_size = 256
-        dictionary = {bytes([i]): i for i in range(dict_size)}
+        dictionary = {}
+        limit = 1 << self.__max_bits if self.__max_bits else -1
 
-        # Initialize parameters
-        current_bytes = b""
+        # Initialize parameters, -1 marks empty current bytes
+        current_code = -1
         result = []
 
         # Iterate over the bytes
+        lookup = dictionary.get
         for byte in text:
-            # Add the current byte to the current bytes
-            concat_bytes = current_bytes + bytes([byte])
+            # Look up the current bytes followed by the current byte
+            key = (current_code << 8) | byte
+            code = lookup(key)
 
-            # Check if the concatenated bytes are already in the dictionary
-            if concat_bytes in dictionary:
+            if code is not None:
                 # Set the current bytes to the concatenated bytes
-                current_bytes = concat_bytes
+                current_code = code
+            elif current_code < 0:
+                # The first byte is always in the dictionary
+                current_code = byte
             else:
                 # Add the code for the current bytes to the result
-                result.append(dictionary[current_bytes])
+                result.append(current_code)
 
-                # Add the concatenated bytes to the dictionary
-                dictionary[concat_bytes] = dict_size
-                dict_size += 1
+                # Add the concatenated bytes to the dictionary, unless it is full
+                if dict_size != limit:
+                    dictionary[key] = dict_size
+                    dict_size += 1
 
                 # Reset the current bytes to the current byte
-                current_bytes = bytes([byte])
+                current_code = byte
 
         # If the current bytes are not empty, append their code to the result
-        if current_bytes:
-            result.append(dictionary[current_bytes])
+        if current_code >= 0:
+            result.append(current_code)
 
         # Convert the result list to bytes and concatenate with '~' separator
-        result_bytes = b"".join(str(item).encode('utf-8') + b"~" for item in result)
+        result_bytes = "".join([str(item) + "~" for item in result]).encode('utf-8')
 
         # Create an encoded file using the result bytes
         return Encoded_File(result_bytes, True, byte_size, Path(file_name), self.get_name(), cap_size)
@@ -355,47 +1006,1352 @@ class LZW_Compressor(Compressor):
         Returns:
         The decompressed content of the file as a byte string.
         """
+        if self.get_name() == "LZW2":
+            return _lzw2_decode(encoded_file.get_data())
 
         # Recreate the compressed list of integers from the encoded file data
         compressed_str = encoded_file.get_data().split(b"~")[:-1]
         compressed = [int(x.decode('utf-8')) for x in compressed_str]
 
-        # Build the dictionary with keys ranging from 1 to 256,
-        # each key representing a single byte in the text.
-        dict_size = 256
-        dictionary = {i: bytes([i]) for i in range(dict_size)}
+        # Build the dictionary, codes below 256 are single bytes
+        dictionary = _LZW_Table(256)
 
         # Initialize result as a byte string
         result = bytearray()
 
-        # Initialize current_string as a byte
-        current_string = bytes([compressed.pop(0)])
-        result.extend(current_string)
+        # Write the first code, which is always a single byte
+        current_code = compressed.pop(0)
+        if current_code >= 256:
+            raise ValueError('Bad compressed char: %s' % current_code)
+        dictionary.write(current_code, result)
 
         # Iterate through the compressed list
         for char in compressed:
-            # For each compressed character in the list
-            if char in dictionary:
-                # If it has a corresponding value in the dictionary, retrieve it
-                entry = dictionary[char]
-            elif char == dict_size:
-                # If it doesn't have a value in the dictionary, create a new entry
-                entry = current_string + bytes([current_string[0]])
-            else:
+            # For each compressed character in the list - if it doesn't have a value in the dictionary yet,
+            # it is the entry added right now, the current entry followed by its own first byte
+            if char > len(dictionary):
                 # Raise an error for invalid compressed character
                 raise ValueError('Bad compressed char: %s' % char)
 
-            # Append entry to the result
-            result.extend(entry)
+            # Add the combination of the current entry and the first byte of this entry to the dictionary
+            dictionary.add(current_code)
 
-            # Add the combination of current_string and entry[0] to the dictionary
-            dictionary[dict_size] = current_string + bytes([entry[0]])
-            dict_size += 1
+            # Write the entry to the result
+            dictionary.write(char, result)
 
-            # Set current_string to the entry for the next iteration
-            current_string = entry
+            # Set the current entry to this entry for the next iteration
+            current_code = char
 
         # Get the decoded byte string from the result
         return bytes(result)
 
 # endregion
+
+# region Huffman compressor
+def _huffman_histogram(text: bytes) -> list[int]:
+    """the number of times every byte value appears in the text"""
+    if np is not None and len(text) >= NUMPY_MIN_SIZE:
+        return np.bincount(np.frombuffer(text, dtype=np.uint8), minlength=256).tolist()
+    histogram = [0] * 256
+    for byte, count in Counter(text).items():
+        histogram[byte] = count
+    return histogram
+
+
+def _huffman_code_lengths(histogram: list[int], max_length: int = HUF_MAX_CODE_LENGTH) -> list[int]:
+    """Huffman code lengths of the byte values, 0 for bytes that don't appear. lengths longer than
+    max_length are cut to it, and the longest codes that can still grow are lengthened until the
+    lengths fit in a prefix code again."""
+    lengths = [0] * 256
+    heap = [(count, byte, [byte]) for byte, count in enumerate(histogram) if count]
+    if len(heap) == 1:
+        lengths[heap[0][1]] = 1
+        return lengths
+    heapq.heapify(heap)
+    # merge the two rarest trees, every byte in them gets one more bit
+    while len(heap) > 1:
+        count_1, key, bytes_1 = heapq.heappop(heap)
+        count_2, _, bytes_2 = heapq.heappop(heap)
+        for byte in bytes_1 + bytes_2:
+            lengths[byte] += 1
+        heapq.heappush(heap, (count_1 + count_2, key, bytes_1 + bytes_2))
+    if max(lengths) <= max_length:
+        return lengths
+    # the kraft sum, in units of the longest code, is over 1 by the overflow
+    overflow = sum(1 << (max_length - min(length, max_length)) for length in lengths if length) - (1 << max_length)
+    lengths = [min(length, max_length) for length in lengths]
+    by_frequency = sorted((byte for byte in range(256) if lengths[byte]), key=lambda byte: histogram[byte])
+    while overflow > 0:
+        byte = max((byte for byte in by_frequency if lengths[byte] < max_length), key=lambda byte: lengths[byte])
+        overflow -= 1 << (max_length - lengths[byte] - 1)
+        lengths[byte] += 1
+    # give the space left by the last lengthened code back to the most frequent bytes
+    for byte in reversed(by_frequency):
+        while lengths[byte] > 1 and -overflow >= 1 << (max_length - lengths[byte]):
+            overflow += 1 << (max_length - lengths[byte])
+            lengths[byte] -= 1
+    return lengths
+
+
+def _huffman_codes(lengths: list[int]) -> list[int]:
+    """the canonical codes of the code lengths - shorter codes first, and by byte value within a length"""
+    codes = [0] * 256
+    code = 0
+    previous_length = 0
+    for byte in sorted((byte for byte in range(256) if lengths[byte]), key=lambda byte: (lengths[byte], byte)):
+        code <<= lengths[byte] - previous_length
+        codes[byte] = code
+        code += 1
+        previous_length = lengths[byte]
+    return codes
+
+
+def _huffman_encode(text: bytes) -> bytes:
+    """Encode bytes as a Huffman stream - the varint length of the text, the code length of every byte
+    value in 128 bytes of 4 bit lengths, followed by the canonical codes packed high bits first"""
+    lengths = _huffman_code_lengths(_huffman_histogram(text))
+    codes = _huffman_codes(lengths)
+    encoding = bytearray(_varint(len(text)))
+    encoding += bytes(lengths[i] << 4 | lengths[i + 1] for i in range(0, 256, 2))
+    bit_strings = [format(code, "0%sb" % length) if length else "" for code, length in zip(codes, lengths)]
+    # the bits of every chunk are converted to bytes at C speed, a partial byte carries over to the next chunk
+    carry = ""
+    for start in range(0, len(text), HUF_CHUNK_SIZE):
+        bits = carry + "".join(map(bit_strings.__getitem__, text[start:start + HUF_CHUNK_SIZE]))
+        whole = len(bits) - len(bits) % 8
+        if whole:
+            encoding += int(bits[:whole], 2).to_bytes(whole // 8, "big")
+        carry = bits[whole:]
+    if carry:
+        encoding.append(int(carry.ljust(8, "0"), 2))
+    return bytes(encoding)
+
+
+def _huffman_decode_tables(lengths: list[int]) -> tuple[list[bytes], list[int]]:
+    """Build the byte at a time decoding tables. a state is a node of the code tree, and for every
+    state and input byte the tables hold the bytes decoded and the next state, premultiplied by 256"""
+    codes = _huffman_codes(lengths)
+    # the children of the inner nodes of the tree - a node number, or the inverted byte value of a leaf
+    children = [[0, 0]]
+    for byte in range(256):
+        node = 0
+        for depth in range(lengths[byte] - 1, -1, -1):
+            bit = codes[byte] >> depth & 1
+            if not depth:
+                children[node][bit] = ~byte
+            else:
+                if not children[node][bit]:
+                    children[node][bit] = len(children)
+                    children.append([0, 0])
+                node = children[node][bit]
+    # decode every 4 bit nibble from every node, then combine two nibbles for a whole byte
+    nibble_output = []
+    nibble_state = []
+    for node in range(len(children)):
+        for nibble in range(16):
+            output = bytearray()
+            state = node
+            for shift in (3, 2, 1, 0):
+                child = children[state][nibble >> shift & 1]
+                if child < 0:
+                    output.append(~child)
+                    state = 0
+                else:
+                    state = child
+            nibble_output.append(bytes(output))
+            nibble_state.append(state)
+    output_table = []
+    state_table = []
+    for node in range(len(children)):
+        for byte in range(256):
+            high = node << 4 | byte >> 4
+            low = nibble_state[high] << 4 | byte & 15
+            output_table.append(nibble_output[high] + nibble_output[low])
+            state_table.append(nibble_state[low] << 8)
+    return output_table, state_table
+
+
+def _huffman_decode(text: bytes) -> bytes:
+    """Decode a Huffman stream, one input byte at a time with the decoding tables"""
+    size, position = _read_varint(text, 0)
+    if len(text) < position + 128:
+        raise ValueError("Truncated Huffman header")
+    lengths = []
+    for packed in text[position:position + 128]:
+        lengths += [packed >> 4, packed & 15]
+    position += 128
+    if not size:
+        return b""
+    if sum(1 << (HUF_MAX_CODE_LENGTH - length) for length in lengths if length) > 1 << HUF_MAX_CODE_LENGTH:
+        raise ValueError("Invalid Huffman code lengths")
+    output_table, state_table = _huffman_decode_tables(lengths)
+    result = bytearray()
+    state = 0
+    for byte in memoryview(text)[position:]:
+        index = state | byte
+        result += output_table[index]
+        state = state_table[index]
+    if len(result) < size:
+        raise ValueError("Truncated Huffman data")
+    # the padding of the last byte may decode to extra bytes
+    del result[size:]
+    return bytes(result)
+
+
+class Huffman_Compressor(Compressor):
+    """The Huffman compressor is a type of Compressor, which codes every byte with a canonical
+    Huffman code of its frequency in the file."""
+
+    def __init__(self) -> None:
+        super().__init__("HUF")
+
+    def binary_encode(self, text: bytes, byte_size: int, file_name: str, cap_size: int = 99) -> Encoded_File:
+        """
+        Encode a byte string into an encoded file using Huffman coding.
+
+        Parameters:
+        - text: The byte string to be encoded.
+        - byte_size: Irrelevant - used only in RLE.
+        - file_name: The name of the file.
+        - cap_size: Irrelevant - used only in RLE.
+
+        Returns:
+        An instance of Encoded_File representing the encoded file.
+        """
+        return Encoded_File(_huffman_encode(text), True, byte_size, Path(file_name), self.get_name(), cap_size)
+
+    def string_encode(self, text: str, byte_size: int, file_name: str, cap_size: int = 99) -> Encoded_File:
+        """
+        Encode a string into an encoded file using Huffman coding of its utf-8 bytes.
+
+        Parameters:
+        - text: The text to be encoded.
+        - byte_size: Irrelevant - used only in RLE.
+        - file_name: The name of the file.
+        - cap_size: Irrelevant - used only in RLE.
+
+        Returns:
+        An instance of Encoded_File representing the encoded file.
+        """
+        return Encoded_File(_huffman_encode(text.encode('utf-8')), False, byte_size, Path(file_name),
+                            self.get_name(), cap_size)
+
+    def binary_decode(self, encoded_file: Encoded_File) -> Optional[bytes]:
+        """
+        Decode an encoded file with binary content, using Huffman coding.
+
+        Parameters:
+        - encoded_file: The encoded file to be decoded.
+
+        Returns:
+        The decompressed content of the file as a byte string.
+        """
+        return _huffman_decode(encoded_file.get_data())
+
+    def string_decode(self, encoded_file: Encoded_File) -> Optional[str]:
+        """
+        Decode an encoded file using Huffman coding.
+
+        Parameters:
+        - encoded_file: The encoded file to be decoded.
+
+        Returns:
+        The decompressed content of the file as a string.
+        """
+        return _huffman_decode(encoded_file.get_data()).decode('utf-8')
+
+# endregion
+
+# region LZSS compressor
+def _lzss_longest_match(text: bytes, position: int, candidate: int, chain: "array", mask: int, limit: int,
+                        max_chain: int, nice_length: int) -> tuple[int, int]:
+    """search the hash chain of a position for its longest earlier match, and return its length and
+    distance. the length is 0 if there is no match worth encoding."""
+    best_length = 0
+    best_distance = 0
+    lowest = max(position - mask, 0)
+    while candidate >= lowest and max_chain:
+        max_chain -= 1
+        # a longer match must also match at the end of the best one
+        if best_length == 0 or text[candidate + best_length] == text[position + best_length]:
+            # the first LZSS_MIN_MATCH bytes are in the hash key. compare 8 bytes at a time, then single bytes
+            length = LZSS_MIN_MATCH
+            while length + 8 <= limit and text[candidate + length:candidate + length + 8] == \
+                    text[position + length:position + length + 8]:
+                length += 8
+            while length < limit and text[candidate + length] == text[position + length]:
+                length += 1
+            # a minimal match far away costs more than its literals
+            if length > best_length and (length > LZSS_MIN_MATCH or position - candidate <= LZSS_FAR):
+                best_length = length
+                best_distance = position - candidate
+                if length >= nice_length or length == limit:
+                    break
+        candidate = chain[candidate & mask]
+    return best_length, best_distance
+
+
+def _lzss_encode(text: bytes, level: int = LZSS_DEFAULT_LEVEL, window_bits: int = LZSS_WINDOW_BITS[2]) -> bytes:
+    """Encode bytes in the LZSS format - the decoded length as a varint, then 4 streams, each one prefixed
+    by a varint of its length times 2, plus 1 if it is Huffman coded. short streams are kept as they are,
+    since the Huffman header would cost more than it saves:
+    tokens - a byte for every sequence of literals followed by a match. its high nibble is the literal
+    count and its low nibble the match length above LZSS_MIN_MATCH, 15 continues with a varint for each.
+    the last sequence has only literals.
+    literals - the literal bytes of all sequences.
+    distances - the low byte of every match distance minus 1, and the rest of it as a varint in a 4th stream.
+    matches are found in hash chains of the earlier positions with the same first 3 bytes."""
+    max_chain, nice_length, max_lazy, index_matches = LZSS_LEVELS[level]
+    mask = (1 << window_bits) - 1
+    size = len(text)
+    tokens = bytearray()
+    literals = bytearray()
+    low_distances = bytearray()
+    high_distances = bytearray()
+    # the last position of every 3 bytes, and the position before it with the same bytes, by window slot
+    heads = {}
+    chain = array('l', [-1]) * (mask + 1)
+    last = size - LZSS_MIN_MATCH
+    literal_start = 0
+    position = 0
+    while position <= last:
+        key = text[position:position + 3]
+        candidate = heads.get(key, -1)
+        chain[position & mask] = candidate
+        heads[key] = position
+        if candidate < 0 or position - candidate > mask:
+            position += 1
+            continue
+        limit = size - position
+        if limit > LZSS_MAX_MATCH:
+            limit = LZSS_MAX_MATCH
+        length, distance = _lzss_longest_match(text, position, candidate, chain, mask, limit, max_chain,
+                                               nice_length)
+        if not length:
+            position += 1
+            continue
+        indexed = position
+        # lazy matching - a longer match at the next position wins over a short one
+        while length < max_lazy and position < last:
+            key = text[position + 1:position + 4]
+            candidate = heads.get(key, -1)
+            chain[(position + 1) & mask] = candidate
+            heads[key] = position + 1
+            indexed = position + 1
+            if candidate < 0 or position + 1 - candidate > mask:
+                break
+            next_length, next_distance = _lzss_longest_match(text, position + 1, candidate, chain, mask,
+                                                             limit - 1, max_chain, nice_length)
+            if next_length <= length:
+                break
+            position += 1
+            limit -= 1
+            length = next_length
+            distance = next_distance
+        literal_count = position - literal_start
+        match_code = length - LZSS_MIN_MATCH
+        tokens.append(min(literal_count, 15) << 4 | min(match_code, 15))
+        if literal_count >= 15:
+            tokens += _varint(literal_count - 15)
+        if match_code >= 15:
+            tokens += _varint(match_code - 15)
+        literals += text[literal_start:position]
+        low_distances.append((distance - 1) & 0xFF)
+        if distance <= 0x8000:
+            high_distances.append((distance - 1) >> 8)
+        else:
+            high_distances += _varint((distance - 1) >> 8)
+        end = position + length
+        if length <= index_matches:
+            # index the positions inside the match
+            for inside in range(indexed + 1, min(end, last + 1)):
+                key = text[inside:inside + 3]
+                chain[inside & mask] = heads.get(key, -1)
+                heads[key] = inside
+        position = literal_start = end
+    literal_count = size - literal_start
+    tokens.append(min(literal_count, 15) << 4)
+    if literal_count >= 15:
+        tokens += _varint(literal_count - 15)
+    literals += text[literal_start:]
+    encoding = bytearray(_varint(size))
+    for stream in (tokens, literals, low_distances, high_distances):
+        huffman_stream = _huffman_encode(bytes(stream))
+        if len(huffman_stream) < len(stream):
+            encoding += _varint(len(huffman_stream) << 1 | 1)
+            encoding += huffman_stream
+        else:
+            encoding += _varint(len(stream) << 1)
+            encoding += stream
+    return bytes(encoding)
+
+
+def _lzss_decode(text: bytes) -> bytes:
+    """Decode bytes in the LZSS format. raises ValueError for a corrupted encoding."""
+    size, position = _read_varint(text, 0)
+    streams = []
+    for _ in range(4):
+        length, position = _read_varint(text, position)
+        huffman_coded = length & 1
+        length >>= 1
+        if position + length > len(text):
+            raise ValueError("Truncated LZSS data")
+        stream = text[position:position + length]
+        streams.append(_huffman_decode(stream) if huffman_coded else stream)
+        position += length
+    tokens, literals, low_distances, high_distances = streams
+    result = bytearray()
+    token_position = literal_position = high_position = 0
+    try:
+        for low_distance in low_distances:
+            token = tokens[token_position]
+            token_position += 1
+            literal_count = token >> 4
+            if literal_count == 15:
+                extra, token_position = _read_varint(tokens, token_position)
+                literal_count += extra
+            length = token & 15
+            if length == 15:
+                extra, token_position = _read_varint(tokens, token_position)
+                length += extra
+            length += LZSS_MIN_MATCH
+            result += literals[literal_position:literal_position + literal_count]
+            literal_position += literal_count
+            distance, high_position = _read_varint(high_distances, high_position)
+            distance = (distance << 8 | low_distance) + 1
+            start = len(result) - distance
+            if start < 0:
+                raise ValueError("Bad LZSS distance")
+            if distance >= length:
+                result += result[start:start + length]
+            else:
+                # the match overlaps its own output - repeat the last distance bytes
+                result += (result[start:] * (length // distance + 1))[:length]
+        # the last sequence, of literals only
+        literal_count = tokens[token_position] >> 4
+        if literal_count == 15:
+            extra, token_position = _read_varint(tokens, token_position + 1)
+            literal_count += extra
+        result += literals[literal_position:literal_position + literal_count]
+    except IndexError:
+        raise ValueError("Truncated LZSS data")
+    if len(result) != size:
+        raise ValueError("Bad LZSS length")
+    return bytes(result)
+
+
+class LZSS_Compressor(Compressor):
+    """The LZSS compressor is a type of Compressor, which replaces repeated strings by the distance
+    and length of an earlier copy in a sliding window."""
+
+    def __init__(self, level: Optional[int] = None, window_bits: Optional[int] = None) -> None:
+        """level trades speed for ratio, 1-9. window_bits is the log of the window size"""
+        if level is None:
+            level = LZSS_DEFAULT_LEVEL
+        if window_bits is None:
+            window_bits = LZSS_WINDOW_BITS[2]
+        if level not in LZSS_LEVELS:
+            raise ValueError("LZSS level should be between 1 and 9")
+        if not LZSS_WINDOW_BITS[0] <= window_bits <= LZSS_WINDOW_BITS[1]:
+            raise ValueError("LZSS window bits should be between %s and %s" % LZSS_WINDOW_BITS[:2])
+        super().__init__("LZSS")
+        self.__level = level
+        self.__window_bits = window_bits
+
+    def get_level(self) -> int:
+        return self.__level
+
+    def get_window_bits(self) -> int:
+        return self.__window_bits
+
+    def binary_encode(self, text: bytes, byte_size: int, file_name: str, cap_size: int = 99) -> Encoded_File:
+        """
+        Encode a byte string into an encoded file using LZSS.
+
+        Parameters:
+        - text: The byte string to be encoded.
+        - byte_size: Irrelevant - used only in RLE.
+        - file_name: The name of the file.
+        - cap_size: Irrelevant - used only in RLE.
+
+        Returns:
+        An instance of Encoded_File representing the encoded file.
+        """
+        return Encoded_File(_lzss_encode(bytes(text), self.__level, self.__window_bits), True, byte_size,
+                            Path(file_name), self.get_name(), cap_size)
+
+    def string_encode(self, text: str, byte_size: int, file_name: str, cap_size: int = 99) -> Encoded_File:
+        """
+        Encode a string into an encoded file using LZSS on its utf-8 bytes.
+
+        Parameters:
+        - text: The text to be encoded.
+        - byte_size: Irrelevant - used only in RLE.
+        - file_name: The name of the file.
+        - cap_size: Irrelevant - used only in RLE.
+
+        Returns:
+        An instance of Encoded_File representing the encoded file.
+        """
+        return Encoded_File(_lzss_encode(text.encode('utf-8'), self.__level, self.__window_bits), False, byte_size,
+                            Path(file_name), self.get_name(), cap_size)
+
+    def binary_decode(self, encoded_file: Encoded_File) -> Optional[bytes]:
+        """
+        Decode an encoded file with binary content, using LZSS.
+
+        Parameters:
+        - encoded_file: The encoded file to be decoded.
+
+        Returns:
+        The decompressed content of the file as a byte string.
+        """
+        return _lzss_decode(encoded_file.get_data())
+
+    def string_decode(self, encoded_file: Encoded_File) -> Optional[str]:
+        """
+        Decode an encoded file using LZSS.
+
+        Parameters:
+        - encoded_file: The encoded file to be decoded.
+
+        Returns:
+        The decompressed content of the file as a string.
+        """
+        return _lzss_decode(encoded_file.get_data()).decode('utf-8')
+
+# endregion
+
+# region Range coder
+class _Frequency_Table:
+    """Adaptive frequencies of the 256 byte values, in a Fenwick tree - the cumulative frequency of a byte,
+    the byte of a cumulative frequency and an update all take 8 steps. the frequencies are kept in arrays of
+    32 bit counts, about 2KB a table."""
+    __slots__ = ("tree", "frequencies", "total")
+
+    # every byte starts with a frequency of 1. tree[i] is the sum of the i & -i frequencies ending at byte i - 1
+    INITIAL_FREQUENCIES = array('I', [1] * 256)
+    INITIAL_TREE = array('I', [0] + [index & -index for index in range(1, 257)])
+
+    def __init__(self) -> None:
+        self.frequencies = array('I', self.INITIAL_FREQUENCIES)
+        self.tree = array('I', self.INITIAL_TREE)
+        self.total = 256
+
+    def cumulative(self, byte: int) -> int:
+        """the sum of the frequencies of the bytes below byte"""
+        tree = self.tree
+        total = 0
+        while byte:
+            total += tree[byte]
+            byte &= byte - 1
+        return total
+
+    def find(self, target: int) -> tuple[int, int]:
+        """the byte whose frequency range holds target, and the cumulative frequency below it"""
+        tree = self.tree
+        byte = 0
+        cumulative = 0
+        step = 128
+        while step:
+            if tree[byte + step] + cumulative <= target:
+                byte += step
+                cumulative += tree[byte]
+            step >>= 1
+        return byte, cumulative
+
+    def update(self, byte: int) -> None:
+        """count another appearance of byte"""
+        self.frequencies[byte] += RC_INCREMENT
+        self.total += RC_INCREMENT
+        if self.total > RC_MAX_TOTAL:
+            self.halve()
+            return
+        tree = self.tree
+        index = byte + 1
+        while index <= 256:
+            tree[index] += RC_INCREMENT
+            index += index & -index
+
+    def halve(self) -> None:
+        """halve the frequencies, so recent bytes weigh more, and rebuild the tree"""
+        frequencies = self.frequencies = array('I', [(frequency + 1) >> 1 for frequency in self.frequencies])
+        self.total = sum(frequencies)
+        tree = self.tree = array('I', [0]) + frequencies
+        for index in range(1, 256):
+            parent = index + (index & -index)
+            if parent <= 256:
+                tree[parent] += tree[index]
+
+
+class _Range_Encoder:
+    """A range encoder with 32 bit bounds. carries are propagated with the cached byte, as in LZMA - the
+    top byte of low is held back, with the 0xFF bytes after it, until a carry can no longer change them."""
+    __slots__ = ("output", "low", "width", "cache", "cache_size")
+
+    def __init__(self, output: bytearray) -> None:
+        self.output = output
+        self.low = 0
+        self.width = 0xFFFFFFFF
+        self.cache = 0
+        self.cache_size = 1
+
+    def encode(self, cumulative: int, frequency: int, total: int) -> None:
+        """narrow the range to the frequency range of a symbol, out of total"""
+        step = self.width // total
+        self.low += step * cumulative
+        self.width = step * frequency
+        while self.width < RC_TOP:
+            self.width <<= 8
+            self.shift()
+
+    def shift(self) -> None:
+        """shift the top byte of low out"""
+        low = self.low
+        if low < 0xFF000000 or low > 0xFFFFFFFF:
+            carry = low >> 32
+            self.output.append((self.cache + carry) & 0xFF)
+            self.output += bytes([(0xFF + carry) & 0xFF]) * (self.cache_size - 1)
+            self.cache_size = 0
+            self.cache = low >> 24 & 0xFF
+        self.cache_size += 1
+        self.low = low << 8 & 0xFFFFFFFF
+
+    def flush(self) -> None:
+        for _ in range(5):
+            self.shift()
+
+
+class _Range_Decoder:
+    """A range decoder of the _Range_Encoder code. reading past the end of a truncated code raises ValueError"""
+    __slots__ = ("text", "position", "code", "width", "step")
+
+    def __init__(self, text: bytes, position: int) -> None:
+        # the first byte of the code is the empty cache
+        if position + 5 > len(text):
+            raise ValueError("Truncated range coder data")
+        self.text = text
+        self.code = int.from_bytes(text[position + 1:position + 5], 'big')
+        self.position = position + 5
+        self.width = 0xFFFFFFFF
+        self.step = 1
+
+    def target(self, total: int) -> int:
+        """the cumulative frequency, out of total, inside the range of the next symbol"""
+        self.step = self.width // total
+        target = self.code // self.step
+        if target >= total:
+            raise ValueError("Corrupted range coder data")
+        return target
+
+    def decode(self, cumulative: int, frequency: int) -> None:
+        """narrow the range to the frequency range of the symbol of the last target"""
+        self.code -= self.step * cumulative
+        self.width = self.step * frequency
+        while self.width < RC_TOP:
+            if self.position >= len(self.text):
+                raise ValueError("Truncated range coder data")
+            self.width <<= 8
+            self.code = (self.code << 8 | self.text[self.position]) & 0xFFFFFFFF
+            self.position += 1
+
+
+def _rc_table(tables: dict[int, _Frequency_Table], context: int, max_contexts: int) -> _Frequency_Table:
+    """the frequency table of a context seen for the first time - its own table, or the shared table
+    (under the key -1) once max_contexts contexts have their own"""
+    if len(tables) < max_contexts:
+        table = tables[context] = _Frequency_Table()
+        return table
+    table = tables.get(-1)
+    if table is None:
+        table = tables[-1] = _Frequency_Table()
+    tables[context] = table
+    return table
+
+
+def _rc_encode(text: bytes, order: int = RC_DEFAULT_ORDER) -> bytes:
+    """Encode bytes with an adaptive range coder - the length as a varint and the model order as a byte,
+    followed by the code. every byte is coded with the frequencies of the bytes that followed its
+    context, the last 'order' bytes before it."""
+    encoding = bytearray(_varint(len(text)))
+    encoding.append(order | RC_CAPPED_FLAG)
+    encoder = _Range_Encoder(encoding)
+    tables = {}
+    mask = (1 << 8 * order) - 1
+    context = 0
+    for byte in text:
+        table = tables.get(context)
+        if table is None:
+            table = _rc_table(tables, context, RC_MAX_CONTEXTS)
+        encoder.encode(table.cumulative(byte), table.frequencies[byte], table.total)
+        table.update(byte)
+        context = (context << 8 | byte) & mask
+    encoder.flush()
+    return bytes(encoding)
+
+
+def _rc_decode(text: bytes) -> bytes:
+    """Decode bytes of the adaptive range coder. raises ValueError for a corrupted encoding."""
+    size, position = _read_varint(text, 0)
+    if position >= len(text) or text[position] & ~RC_CAPPED_FLAG not in RC_ORDERS:
+        raise ValueError("Bad range coder header")
+    order = text[position] & ~RC_CAPPED_FLAG
+    max_contexts = RC_MAX_CONTEXTS if text[position] & RC_CAPPED_FLAG else 1 << 8 * order
+    decoder = _Range_Decoder(text, position + 1)
+    result = bytearray(size)
+    tables = {}
+    mask = (1 << 8 * order) - 1
+    context = 0
+    for index in range(size):
+        table = tables.get(context)
+        if table is None:
+            table = _rc_table(tables, context, max_contexts)
+        byte, cumulative = table.find(decoder.target(table.total))
+        decoder.decode(cumulative, table.frequencies[byte])
+        table.update(byte)
+        result[index] = byte
+        context = (context << 8 | byte) & mask
+    return bytes(result)
+
+
+class Range_Compressor(Compressor):
+    """The range compressor is a type of Compressor, which codes every byte with an adaptive range coder,
+    by the frequencies of the bytes seen after the same 0, 1 or 2 bytes before it."""
+
+    def __init__(self, order: Optional[int] = None) -> None:
+        """order is the number of bytes of context, RC_DEFAULT_ORDER for None"""
+        if order is None:
+            order = RC_DEFAULT_ORDER
+        if order not in RC_ORDERS:
+            raise ValueError("Range coder order should be one of %s" % (RC_ORDERS,))
+        super().__init__("RC")
+        self.__order = order
+
+    def get_order(self) -> int:
+        return self.__order
+
+    def binary_encode(self, text: bytes, byte_size: int, file_name: str, cap_size: int = 99) -> Encoded_File:
+        """
+        Encode a byte string into an encoded file using the range coder.
+
+        Parameters:
+        - text: The byte string to be encoded.
+        - byte_size: Irrelevant - used only in RLE.
+        - file_name: The name of the file.
+        - cap_size: Irrelevant - used only in RLE.
+
+        Returns:
+        An instance of Encoded_File representing the encoded file.
+        """
+        return Encoded_File(_rc_encode(text, self.__order), True, byte_size, Path(file_name), self.get_name(),
+                            cap_size)
+
+    def string_encode(self, text: str, byte_size: int, file_name: str, cap_size: int = 99) -> Encoded_File:
+        """
+        Encode a string into an encoded file using the range coder on its utf-8 bytes.
+
+        Parameters:
+        - text: The text to be encoded.
+        - byte_size: Irrelevant - used only in RLE.
+        - file_name: The name of the file.
+        - cap_size: Irrelevant - used only in RLE.
+
+        Returns:
+        An instance of Encoded_File representing the encoded file.
+        """
+        return Encoded_File(_rc_encode(text.encode('utf-8'), self.__order), False, byte_size, Path(file_name),
+                            self.get_name(), cap_size)
+
+    def binary_decode(self, encoded_file: Encoded_File) -> Optional[bytes]:
+        """
+        Decode an encoded file with binary content, using the range coder.
+
+        Parameters:
+        - encoded_file: The encoded file to be decoded.
+
+        Returns:
+        The decompressed content of the file as a byte string.
+        """
+        return _rc_decode(encoded_file.get_data())
+
+    def string_decode(self, encoded_file: Encoded_File) -> Optional[str]:
+        """
+        Decode an encoded file using the range coder.
+
+        Parameters:
+        - encoded_file: The encoded file to be decoded.
+
+        Returns:
+        The decompressed content of the file as a string.
+        """
+        return _rc_decode(encoded_file.get_data()).decode('utf-8')
+
+# endregion
+
+# region Pipeline compressor
+def _delta_encode(text: bytes) -> bytes:
+    """replace every byte by its difference from the previous byte, modulo 256"""
+    if np is not None and len(text) >= NUMPY_MIN_SIZE:
+        data = np.frombuffer(text, dtype=np.uint8)
+        return np.diff(data, prepend=np.uint8(0)).tobytes()
+    return bytes((byte - previous) & 0xFF for previous, byte in zip(b"\x00" + text, text))
+
+
+def _delta_decode(text: bytes) -> bytes:
+    """restore delta encoded bytes by a running sum, modulo 256"""
+    if np is not None and len(text) >= NUMPY_MIN_SIZE:
+        return np.cumsum(np.frombuffer(text, dtype=np.uint8), dtype=np.uint8).tobytes()
+    return bytes(accumulate(text, lambda total, byte: (total + byte) & 0xFF))
+
+
+def _mtf_encode(text: bytes) -> bytes:
+    """replace every byte by its index in a list of the byte values, which then moves it to the front.
+    recently repeated bytes become small indices, and runs become runs of zeros."""
+    order = bytearray(range(256))
+    encoding = bytearray(len(text))
+    for position, byte in enumerate(text):
+        index = order.index(byte)
+        if index:
+            del order[index]
+            order.insert(0, byte)
+        encoding[position] = index
+    return bytes(encoding)
+
+
+def _mtf_decode(text: bytes) -> bytes:
+    """restore move to front encoded bytes"""
+    order = bytearray(range(256))
+    result = bytearray(len(text))
+    for position, index in enumerate(text):
+        byte = order[index]
+        if index:
+            del order[index]
+            order.insert(0, byte)
+        result[position] = byte
+    return bytes(result)
+
+
+def _bwt_rotations(block: bytes) -> list[int]:
+    """the start positions of the rotations of a block, in sorted order. the rotations are sorted by
+    prefix doubling - every round sorts by the ranks of the first 2k bytes, as pairs of ranks of k bytes."""
+    size = len(block)
+    if np is not None:
+        data = np.frombuffer(block, dtype=np.uint8).astype(np.int64)
+        positions = np.arange(size)
+        # the first round sorts by the first 4 bytes
+        length = min(4, size)
+        keys = np.zeros(size, dtype=np.int64)
+        for offset in range(length):
+            keys = keys << 8 | data[(positions + offset) % size]
+        # the rank of a rotation is the sorted index of the first rotation with the same first 'length' bytes,
+        # so only the rotations that still tie with others are sorted again, within their group
+        rank = np.zeros(size, dtype=np.int64)
+        tied = positions
+        group = rank
+        while True:
+            order = np.argsort(keys, kind='stable')
+            keys = keys[order]
+            group = group[order]
+            index = np.arange(len(keys))
+            key_start = np.maximum.accumulate(np.where(np.r_[True, keys[1:] != keys[:-1]], index, 0))
+            group_start = np.maximum.accumulate(np.where(np.r_[True, group[1:] != group[:-1]], index, 0))
+            rank[tied[order]] = group + key_start - group_start
+            # equal rotations of a periodic block stay tied
+            if length >= size:
+                break
+            tied = np.flatnonzero(np.bincount(rank, minlength=size)[rank] > 1)
+            if not len(tied):
+                break
+            group = rank[tied]
+            keys = group << 32 | rank[(tied + length) % size]
+            length <<= 1
+        return np.argsort(rank, kind='stable').tolist()
+    rank = list(block)
+    order = list(range(size))
+    length = 1
+    while True:
+        # rank[position + length - size] is the rank 'length' bytes ahead, wrapping around the block
+        keys = [rank[position] << 32 | rank[position + length - size] for position in range(size)]
+        order.sort(key=keys.__getitem__)
+        current = 0
+        rank[order[0]] = 0
+        for previous, position in zip(order, order[1:]):
+            if keys[position] != keys[previous]:
+                current += 1
+            rank[position] = current
+        length <<= 1
+        if current == size - 1 or length >= size:
+            return order
+
+
+def _bwt_encode(text: bytes, block_size: int = BWT_BLOCK_SIZE) -> bytes:
+    """Burrows-Wheeler transform of every block of the text - the last bytes of the sorted rotations of the
+    block. every block is its length and the index of its unrotated row as varints, followed by the
+    transformed bytes, so blocks are transformed and restored independently."""
+    encoding = bytearray()
+    for start in range(0, len(text), block_size):
+        block = text[start:start + block_size]
+        order = _bwt_rotations(block)
+        encoding += _varint(len(block))
+        encoding += _varint(order.index(0))
+        if np is not None:
+            data = np.frombuffer(block, dtype=np.uint8)
+            encoding += data[np.array(order, dtype=np.int64) - 1].tobytes()
+        else:
+            encoding += bytes(block[position - 1] for position in order)
+    return bytes(encoding)
+
+
+def _bwt_decode(text: bytes) -> bytes:
+    """restore the blocks of a Burrows-Wheeler transform. raises ValueError for a corrupted transform"""
+    result = bytearray()
+    position = 0
+    while position < len(text):
+        size, position = _read_varint(text, position)
+        index, position = _read_varint(text, position)
+        block = text[position:position + size]
+        position += size
+        if len(block) != size or index >= size:
+            raise ValueError("Corrupted BWT block")
+        # the sorted rotations are ordered by their first byte, stably, so the i-th row starting with a byte
+        # is the rotation one byte after the i-th row ending with it
+        if np is not None:
+            successors = np.argsort(np.frombuffer(block, dtype=np.uint8), kind='stable').tolist()
+        else:
+            successors = sorted(range(size), key=block.__getitem__)
+        decoded = bytearray(size)
+        row = successors[index]
+        for offset in range(size):
+            decoded[offset] = block[row]
+            row = successors[row]
+        result += decoded
+    return bytes(result)
+
+
+class Pipeline_Compressor(Compressor):
+    """The pipeline compressor is a type of Compressor, which runs the data through a chain of stages -
+    transforms and other compressors' formats. the chain is stored in the encoder name, and decoding
+    runs it in reverse."""
+
+    def __init__(self, stages: str = PIPELINE_DEFAULT, bwt_block_size: int = BWT_BLOCK_SIZE) -> None:
+        """stages are stage names joined with '+', such as 'DELTA+RLE2+HUF'. bwt_block_size is the size
+        of the blocks the BWT stage sorts, unless the stage sets it as 'BWT:18' - decoding doesn't need it"""
+        stage_names = []
+        for stage in stages.split(PIPELINE_SEPARATOR):
+            stage, _, block_bits = stage.partition(":")
+            if stage not in PIPELINE_STAGES:
+                raise ValueError("Unknown pipeline stage: %s" % stage)
+            if block_bits:
+                lowest, highest = BWT_BLOCK_BITS
+                if stage != "BWT" or not lowest <= int(block_bits) <= highest:
+                    raise ValueError("Only BWT has block bits, between %s and %s" % (lowest, highest))
+                bwt_block_size = 1 << int(block_bits)
+            stage_names.append(stage)
+        if bwt_block_size <= 0:
+            raise ValueError("BWT block size should be a positive integer")
+        super().__init__(PIPELINE_PREFIX + PIPELINE_SEPARATOR.join(stage_names))
+        self.__stages = stage_names
+        self.__bwt_block_size = bwt_block_size
+        self.__compressors = {}
+        for stage in stage_names:
+            if stage in RLE_VARIANTS:
+                self.__compressors[stage] = RLE_Compressor(stage)
+            elif stage in LZW_VARIANTS:
+                self.__compressors[stage] = LZW_Compressor(stage)
+            elif stage == "HUF":
+                self.__compressors[stage] = Huffman_Compressor()
+            elif stage == "LZSS":
+                self.__compressors[stage] = LZSS_Compressor()
+            elif stage == "RC":
+                self.__compressors[stage] = Range_Compressor()
+
+    def get_stages(self) -> list[str]:
+        return list(self.__stages)
+
+    def get_bwt_block_size(self) -> int:
+        return self.__bwt_block_size
+
+    def binary_encode(self, text: bytes, byte_size: int, file_name: str, cap_size: int = 99) -> Encoded_File:
+        """
+        Encode a byte string into an encoded file by running it through the stages.
+
+        Parameters:
+        - text: The byte string to be encoded.
+        - byte_size: The size of each byte, for the RLE stages.
+        - file_name: The name of the file.
+        - cap_size: The cap size, for the RLE stages.
+
+        Returns:
+        An instance of Encoded_File representing the encoded file.
+        """
+        return Encoded_File(self.encode_bytes(text, byte_size, cap_size), True, byte_size, Path(file_name),
+                            self.get_name(), cap_size)
+
+    def string_encode(self, text: str, byte_size: int, file_name: str, cap_size: int = 99) -> Encoded_File:
+        """
+        Encode a string into an encoded file by running its utf-8 bytes through the stages.
+
+        Parameters:
+        - text: The text to be encoded.
+        - byte_size: The size of each byte, for the RLE stages.
+        - file_name: The name of the file.
+        - cap_size: The cap size, for the RLE stages.
+
+        Returns:
+        An instance of Encoded_File representing the encoded file.
+        """
+        return Encoded_File(self.encode_bytes(text.encode('utf-8'), byte_size, cap_size), False, byte_size,
+                            Path(file_name), self.get_name(), cap_size)
+
+    def binary_decode(self, encoded_file: Encoded_File) -> Optional[bytes]:
+        """
+        Decode an encoded file with binary content, by running the stages in reverse.
+
+        Parameters:
+        - encoded_file: The encoded file to be decoded.
+
+        Returns:
+        The decompressed content of the file as a byte string.
+        """
+        return self.decode_bytes(encoded_file.get_data(), encoded_file.get_byte_len(), encoded_file.get_cap_size())
+
+    def string_decode(self, encoded_file: Encoded_File) -> Optional[str]:
+        """
+        Decode an encoded file, by running the stages in reverse.
+
+        Parameters:
+        - encoded_file: The encoded file to be decoded.
+
+        Returns:
+        The decompressed content of the file as a string.
+        """
+        return self.decode_bytes(encoded_file.get_data(), encoded_file.get_byte_len(),
+                                 encoded_file.get_cap_size()).decode('utf-8')
+
+    def encode_bytes(self, text: bytes, byte_size: int, cap_size: int = 99) -> bytes:
+        """run the bytes through every stage, each stage gets the output of the one before it"""
+        for stage in self.__stages:
+            if stage == "DELTA":
+                text = _delta_encode(text)
+            elif stage == "MTF":
+                text = _mtf_encode(text)
+            elif stage == "BWT":
+                text = _bwt_encode(text, self.__bwt_block_size)
+            else:
+                text = self.__compressors[stage].binary_encode(text, byte_size, "", cap_size).get_data()
+        return text
+
+    def decode_bytes(self, text: bytes, byte_size: int, cap_size: int = 99) -> bytes:
+        """run the bytes through the decoding of every stage, last stage first"""
+        for stage in reversed(self.__stages):
+            if stage == "DELTA":
+                text = _delta_decode(text)
+            elif stage == "MTF":
+                text = _mtf_decode(text)
+            elif stage == "BWT":
+                text = _bwt_decode(text)
+            else:
+                text = self.__compressors[stage].binary_decode(Encoded_File(text, True, byte_size, Path(""), stage,
+                                                                            cap_size))
+        return text
+
+# endregion
+
+# region Standard library compressors
+class Stream_Compressor(Compressor):
+    """The stream compressor is a type of Compressor, which wraps the zlib, bz2 or lzma codec of the
+    standard library. the data is streamed through the codec in chunks."""
+
+    def __init__(self, codec: str = "ZLIB", level: Optional[int] = None) -> None:
+        """level is the compression level of the codec, None for its default level"""
+        if codec not in STREAM_CODECS:
+            raise ValueError("Unknown codec: %s" % codec)
+        lowest, highest, default = STREAM_LEVELS[codec]
+        if level is None:
+            level = default
+        if not lowest <= level <= highest:
+            raise ValueError("%s level should be between %s and %s" % (codec, lowest, highest))
+        super().__init__(codec)
+        self.__level = level
+
+    def get_level(self) -> int:
+        return self.__level
+
+    def binary_encode(self, text: bytes, byte_size: int, file_name: str, cap_size: int = 99) -> Encoded_File:
+        """
+        Encode a byte string into an encoded file using the codec.
+
+        Parameters:
+        - text: The byte string to be encoded.
+        - byte_size: Irrelevant - used only in RLE.
+        - file_name: The name of the file.
+        - cap_size: Irrelevant - used only in RLE.
+
+        Returns:
+        An instance of Encoded_File representing the encoded file.
+        """
+        return Encoded_File(self.encode_bytes(text), True, byte_size, Path(file_name), self.get_name(), cap_size)
+
+    def string_encode(self, text: str, byte_size: int, file_name: str, cap_size: int = 99) -> Encoded_File:
+        """
+        Encode a string into an encoded file using the codec on its utf-8 bytes.
+
+        Parameters:
+        - text: The text to be encoded.
+        - byte_size: Irrelevant - used only in RLE.
+        - file_name: The name of the file.
+        - cap_size: Irrelevant - used only in RLE.
+
+        Returns:
+        An instance of Encoded_File representing the encoded file.
+        """
+        return Encoded_File(self.encode_bytes(text.encode('utf-8')), False, byte_size, Path(file_name),
+                            self.get_name(), cap_size)
+
+    def binary_decode(self, encoded_file: Encoded_File) -> Optional[bytes]:
+        """
+        Decode an encoded file with binary content, using the codec.
+
+        Parameters:
+        - encoded_file: The encoded file to be decoded.
+
+        Returns:
+        The decompressed content of the file as a byte string.
+        """
+        return self.decode_bytes(encoded_file.get_data())
+
+    def string_decode(self, encoded_file: Encoded_File) -> Optional[str]:
+        """
+        Decode an encoded file using the codec.
+
+        Parameters:
+        - encoded_file: The encoded file to be decoded.
+
+        Returns:
+        The decompressed content of the file as a string.
+        """
+        return self.decode_bytes(encoded_file.get_data()).decode('utf-8')
+
+    def encode_bytes(self, text: bytes) -> bytes:
+        """compress the bytes one chunk at a time"""
+        if self.get_name() == "ZLIB":
+            stream = zlib.compressobj(self.__level)
+        elif self.get_name() == "BZ2":
+            stream = bz2.BZ2Compressor(self.__level)
+        else:
+            stream = lzma.LZMACompressor(preset=self.__level)
+        # the chunks are written to a single buffer, so the output is never held twice
+        encoding = BytesIO()
+        with memoryview(text) as view:
+            for i in range(0, len(view), STREAM_CHUNK_SIZE):
+                encoding.write(stream.compress(view[i:i + STREAM_CHUNK_SIZE]))
+        encoding.write(stream.flush())
+        return encoding.getvalue()
+
+    def decode_bytes(self, text: bytes) -> bytes:
+        """decompress the bytes one chunk at a time"""
+        if self.get_name() == "ZLIB":
+            stream = zlib.decompressobj()
+        elif self.get_name() == "BZ2":
+            stream = bz2.BZ2Decompressor()
+        else:
+            stream = lzma.LZMADecompressor()
+        result = BytesIO()
+        try:
+            with memoryview(text) as view:
+                for i in range(0, len(view), STREAM_CHUNK_SIZE):
+                    result.write(stream.decompress(view[i:i + STREAM_CHUNK_SIZE]))
+        except STREAM_ERRORS as error:
+            raise ValueError("Corrupted %s data: %s" % (self.get_name(), error))
+        if not stream.eof:
+            raise ValueError("Truncated %s data" % self.get_name())
+        return result.getvalue()
+
+# endregion
+
+# region Store
+def byte_entropy(text: bytes) -> float:
+    """the order 0 entropy of the bytes of a text, in bits per byte"""
+    if not text:
+        return 0.0
+    if np is not None:
+        counts = np.bincount(np.frombuffer(text, dtype=np.uint8), minlength=256)
+        probabilities = counts[counts > 0] / len(text)
+        return float(-(probabilities * np.log2(probabilities)).sum())
+    return -sum(count / len(text) * math.log2(count / len(text)) for count in Counter(text).values())
+
+
+def is_incompressible(text: bytes) -> bool:
+    """
+    Check if a file is already compressed, by its magic number or by the entropy of samples of its bytes.
+
+    Args:
+        text (bytes): The content of the file.
+
+    Returns:
+        bool: True if compressing the file isn't worth it, False otherwise.
+    """
+    if text.startswith(STORE_MAGIC_NUMBERS):
+        return True
+    if len(text) < STORE_MIN_SIZE:
+        return False
+    if len(text) <= STORE_SAMPLE_SIZE * STORE_SAMPLE_COUNT:
+        sample = text
+    else:
+        # spread the windows evenly over the file
+        view = memoryview(text)
+        sample = b"".join(view[i * (len(text) - STORE_SAMPLE_SIZE) // (STORE_SAMPLE_COUNT - 1):][:STORE_SAMPLE_SIZE]
+                          for i in range(STORE_SAMPLE_COUNT))
+    return byte_entropy(sample) > STORE_ENTROPY_THRESHOLD
+
+
+class Store_Compressor(Compressor):
+    """The store compressor is a type of Compressor, which keeps the file as it is. it is used for
+    files that are already compressed, where compressing again costs time and grows the file."""
+
+    def __init__(self) -> None:
+        super().__init__(STORE_ENCODER)
+
+    def binary_encode(self, text: bytes, byte_size: int, file_name: str, cap_size: int = 99) -> Encoded_File:
+        """
+        Store a byte string in an encoded file.
+
+        Parameters:
+        - text: The byte string to be stored.
+        - byte_size: Irrelevant - used only in RLE.
+        - file_name: The name of the file.
+        - cap_size: Irrelevant - used only in RLE.
+
+        Returns:
+        An instance of Encoded_File representing the stored file.
+        """
+        return Encoded_File(bytes(text), True, byte_size, Path(file_name), self.get_name(), cap_size)
+
+    def string_encode(self, text: str, byte_size: int, file_name: str, cap_size: int = 99) -> Encoded_File:
+        """
+        Store the utf-8 bytes of a string in an encoded file.
+
+        Parameters:
+        - text: The text to be stored.
+        - byte_size: Irrelevant - used only in RLE.
+        - file_name: The name of the file.
+        - cap_size: Irrelevant - used only in RLE.
+
+        Returns:
+        An instance of Encoded_File representing the stored file.
+        """
+        return Encoded_File(text.encode('utf-8'), False, byte_size, Path(file_name), self.get_name(), cap_size)
+
+    def binary_decode(self, encoded_file: Encoded_File) -> Optional[bytes]:
+        """the stored bytes of the file"""
+        return encoded_file.get_data()
+
+    def string_decode(self, encoded_file: Encoded_File) -> Optional[str]:
+        """the stored text of the file"""
+        return encoded_file.get_data().decode('utf-8')
+
+# endregion
+
+# region Auto compressor
+class Auto_Compressor(Compressor):
+    """The auto compressor is a type of Compressor, which encodes every file with the codec that suits it
+    best. every codec encodes samples of the file, and the best one for the objective by its compression
+    ratio and its cost encodes the whole file, so its entry records the codec that was picked."""
+
+    def __init__(self, candidates: Callable[[], list[tuple[Compressor, Optional[float]]]],
+                 decoder: Callable[[str], Compressor], objective: str = "balanced") -> None:
+        """candidates creates the codecs to try with their declared costs in seconds a MB, or None for a cost
+        measured on the sample, and decoder creates the codec that decodes an encoder name"""
+        if objective not in AUTO_OBJECTIVES:
+            raise ValueError("Unknown objective: %s" % objective)
+        super().__init__(AUTO_COMPRESSOR)
+        self.__candidates = candidates
+        self.__decoder = decoder
+        self.__objective = objective
+
+    def choose(self, text: Union[str, bytes], byte_size: int = 5, cap_size: int = 99) -> Compressor:
+        """
+        Pick the codec to encode a text with, by trial encoding of samples of the text.
+        while every codec declares its cost, the same text always gets the same codec.
+        if no codec can encode the text, it is stored.
+
+        Args:
+            text (Union[str, bytes]): The text to encode.
+            byte_size (int): The byte size, for the RLE codecs.
+            cap_size (int): The cap size, for the RLE codecs.
+
+        Returns:
+            Compressor: The best codec for the objective.
+        """
+        if len(text) <= AUTO_SAMPLE_SIZE * AUTO_SAMPLE_COUNT:
+            sample = text
+        else:
+            # spread the windows evenly over the text
+            sample = text[:0].join(text[start:start + AUTO_SAMPLE_SIZE] for start in
+                                   (i * (len(text) - AUTO_SAMPLE_SIZE) // (AUTO_SAMPLE_COUNT - 1)
+                                    for i in range(AUTO_SAMPLE_COUNT)))
+        sample_size = len(sample.encode('utf-8')) if isinstance(sample, str) else len(sample)
+        best_codec = Store_Compressor()
+        best_score = None
+        for codec, cost in self.__candidates():
+            try:
+                start = time.perf_counter()
+                ratio = len(codec.encode(sample, "", byte_size, cap_size).get_data()) / max(sample_size, 1)
+                elapsed = time.perf_counter() - start
+            except Exception:  # the codec can't encode this text
+                continue
+            if cost is None:
+                cost = elapsed / max(sample_size, 1) * (1 << 20)
+            if self.__objective == "ratio":
+                score = (ratio, cost, 0.0)
+            elif self.__objective == "speed":
+                # the cheapest codec that shrinks the sample
+                score = (float(ratio >= 1), cost if ratio < 1 else ratio, ratio)
+            else:
+                score = (ratio + AUTO_TIME_WEIGHT * cost, ratio, cost)
+            # codecs that score the same are told apart by name, not by their order
+            score += (codec.get_name(),)
+            if best_score is None or score < best_score:
+                best_codec = codec
+                best_score = score
+        return best_codec
+
+    def binary_encode(self, text: bytes, byte_size: int, file_name: str, cap_size: int = 99) -> Encoded_File:
+        """
+        Encode a byte string with the codec that suits it best.
+
+        Parameters:
+        - text: The byte string to be encoded.
+        - byte_size: The size of each byte, for the RLE codecs.
+        - file_name: The name of the file.
+        - cap_size: The cap size, for the RLE codecs.
+
+        Returns:
+        An instance of Encoded_File, with the encoder name of the codec.
+        """
+        return self.choose(text, byte_size, cap_size).binary_encode(text, byte_size, file_name, cap_size)
+
+    def string_encode(self, text: str, byte_size: int, file_name: str, cap_size: int = 99) -> Encoded_File:
+        """
+        Encode a string with the codec that suits it best.
+
+        Parameters:
+        - text: The text to be encoded.
+        - byte_size: The size of each byte, for the RLE codecs.
+        - file_name: The name of the file.
+        - cap_size: The cap size, for the RLE codecs.
+
+        Returns:
+        An instance of Encoded_File, with the encoder name of the codec.
+        """
+        return self.choose(text, byte_size, cap_size).string_encode(text, byte_size, file_name, cap_size)
+
+    def binary_decode(self, encoded_file: Encoded_File) -> Optional[bytes]:
+        """decode an encoded file with the codec that encoded it"""
+        return self.__decoder(encoded_file.get_encoder()).binary_decode(encoded_file)
+
+    def string_decode(self, encoded_file: Encoded_File) -> Optional[str]:
+        """decode an encoded file with the codec that encoded it"""
+        return self.__decoder(encoded_file.get_encoder()).string_decode(encoded_file)
+
+# endregion
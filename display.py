@@ -5,7 +5,9 @@ from pathlib import Path
 from tkinter import ttk, filedialog
 
 from compressor import CODE_BASE_PATH
-from main import run_file_compressor, default_args
+from main import run_file_compressor, default_args, int_or_auto
+from file_handler import open_archive_directory
+from codec_registry import compressor_names
 from tkinter import Tk
 from tkinter.ttk import Label
 from typing import Optional, Any
@@ -41,6 +43,8 @@ class FileCompressorGUI:
         self.replace = tk.BooleanVar()
         self.replace.set(False)
         self.is_password.set(False)
+        self.raw_text = tk.BooleanVar()
+        self.raw_text.set(False)
         # compress params
         self.compress_file_path:list[str] = []
         self.compress_folder_path:Any = None
@@ -141,8 +145,15 @@ class FileCompressorGUI:
         self.inflate_password_entry = ttk.Entry(inflate_tab, show="*")
         self.inflate_password_entry.grid(row=2, column=1)
 
+        # Files Select - inflates only the selected files, or all of them if none is selected
+        ttk.Label(inflate_tab, text="Files To Inflate:").grid(row=3, column=0, sticky="nw")
+        self.inflate_files_list = tk.Listbox(inflate_tab, selectmode=tk.MULTIPLE, height=6, width=40,
+                                             exportselection=False)
+        self.inflate_files_list.grid(row=3, column=1)
+        ttk.Button(inflate_tab, text="List Files", command=self.list_archive_files).grid(row=3, column=2, sticky="n")
+
         # Inflate Button
-        ttk.Button(inflate_tab, text="Inflate", command=self.inflate).grid(row=3, column=0, columnspan=3)
+        ttk.Button(inflate_tab, text="Inflate", command=self.inflate).grid(row=4, column=0, columnspan=3)
 
     def create_examine_tab(self):
         # type: () -> None
@@ -188,8 +199,8 @@ class FileCompressorGUI:
         # Compressor
         self.combo_var = tk.StringVar()
         ttk.Label(self.settings_tab, text="Compressor:").grid(row=0, column=0, sticky="w")
-        self.compressor_combo = ttk.Combobox(self.settings_tab, textvariable=self.combo_var, values=["RLE", "LZW"],
-                                             state="readonly")
+        self.compressor_combo = ttk.Combobox(self.settings_tab, textvariable=self.combo_var,
+                                             values=compressor_names(), state="readonly")
         self.compressor_combo.current(0)
         self.compressor_combo.grid(row=0, column=1)
         self.combo_var.set("RLE")
@@ -212,6 +223,11 @@ class FileCompressorGUI:
         self.cap_size_entry.insert(tk.END, "99")
         self.cap_size_entry.grid(row=2, column=1)
 
+        # Raw Text
+        ttk.Checkbutton(self.settings_tab, text="Text Files As Bytes",
+                        variable=self.raw_text).grid(
+            row=3, column=1, sticky="w")
+
         # About Project Link
         link1 = ttk.Label(self.settings_tab, text="About Project", cursor="hand2")
         link1.grid(row=8, column=0)
@@ -299,6 +315,8 @@ class FileCompressorGUI:
         if file_path != "":
             if inflate_flag:
                 self.inflate_archive_path = file_path
+                # the listed files belong to the previous archive
+                self.inflate_files_list.delete(0, tk.END)
             else:
                 self.examine_archive_path = file_path
 
@@ -325,8 +343,8 @@ class FileCompressorGUI:
         :param args:  none
         :return: none
         """
-        if self.compressor_combo.get() == "LZW":
-            self.combo_var.set("LZW")
+        if self.compressor_combo.get() != "RLE":
+            self.combo_var.set(self.compressor_combo.get())
             hide_button(self.cap_size_entry)
             hide_button(self.byte_size_entry)
             hide_button(self.cap_size_label)
@@ -368,22 +386,46 @@ class FileCompressorGUI:
         # get data from settings tab.
         if self.combo_var.get() == "RLE":
             try:
-                args.byte_size = int(self.byte_size_entry.get())
+                args.byte_size = int_or_auto(self.byte_size_entry.get())
             except ValueError:
                 print("Invalid byte size Value")
             try:
-                args.cap_size = int(self.cap_size_entry.get())
+                args.cap_size = int_or_auto(self.cap_size_entry.get())
             except ValueError:
                 print("Invalid cap size Value")
-            args.compressor = 0
+            # the default compressor, which stores already compressed files as they are
+            args.compressor = None
         else:
-            args.compressor = 1
+            args.compressor = self.combo_var.get()
 
         args.replace = self.replace.get()
+        args.raw_text = self.raw_text.get()
         # set action to archive and run
         args.archive = True
         run_file_compressor(args)
 
+    def list_archive_files(self):
+        # type: () -> None
+        """
+        this function lists the files of the inflate archive, read from its directory, for selection.
+        the password is checked before protected archives are listed.
+        :return: none
+        """
+        self.inflate_files_list.delete(0, tk.END)
+        if self.inflate_archive_path is None:
+            print("No Archive selected")
+            return
+        try:
+            directory = open_archive_directory(Path(self.inflate_archive_path))
+        except (IOError, ValueError):
+            print("Invalid Archive, Unable to list files")
+            return
+        if directory.is_protected() and not directory.check_password(self.inflate_password_entry.get()):
+            print("INCORRECT Password. Unable to list files. Try again")
+            return
+        for path in sorted(str(record.path) for record in directory.get_records()):
+            self.inflate_files_list.insert(tk.END, path)
+
     def inflate(self):
         # type: () -> None
         """
@@ -397,6 +439,10 @@ class FileCompressorGUI:
         args.file_path = self.inflate_archive_path
         args.save_path = self.inflate_save_path
         args.password = self.inflate_password_entry.get()
+        # inflate only the selected files, if any
+        selected_files = [self.inflate_files_list.get(index) for index in self.inflate_files_list.curselection()]
+        if selected_files:
+            args.extract = selected_files
         args.open = True
         # call open command
         run_file_compressor(args)
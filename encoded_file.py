@@ -1,23 +1,43 @@
+from mmap import mmap
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional, Union
 
 
 class Encoded_File:
-    def __init__(self, data: bytes, binary_flag: bool, byte_length: int, file_path: Path = Path(""),
-                 encoder: str = "RLE", cap_size: int = 99) -> None:
+    # an entry of an archive holds no attribute dictionary, which adds up in archives of many small files
+    __slots__ = ("__data", "__view", "__binary", "__byte_length", "__path", "__encoder", "__cap_size", "__text",
+                 "__original_size")
+
+    def __init__(self, data: Union[bytes, tuple[mmap, int, int]], binary_flag: bool, byte_length: int,
+                 file_path: Path = Path(""), encoder: str = "RLE", cap_size: int = 99, text_flag: bool = False,
+                 original_size: int = 0) -> None:
         """
         Initialize an Encoded_File object with the provided data, binary flag, byte length, file path, and encoder.
 
         Args:
-            data (bytes): The encoded data.
+            data (Union[bytes, tuple[mmap, int, int]]): The encoded data, or a view of it in a memory mapped
+                archive - the mapping, the offset of the data and its length. a view is read only when the
+                data is used.
             binary_flag (bool): A flag indicating whether the data is binary or not.
             byte_length (int): The length of each byte in the encoding.
             file_path (Path, optional): The file path associated with the encoded data.
             encoder (str, optional): The encoder used to encode the data (default is "RLE").
-        """
-        if not isinstance(data, bytes):
+            text_flag (bool, optional): A flag indicating binary data is a text file, whose newlines are
+                converted on extraction.
+            original_size (int, optional): The size of the file before encoding, 0 if unknown.
+        """
+        self.__data: Optional[bytes] = None
+        self.__view: Optional[tuple[mmap, int, int]] = None
+        if isinstance(data, tuple):
+            if len(data) != 3 or not isinstance(data[0], mmap) or not all(isinstance(x, int) for x in data[1:]):
+                raise TypeError("data view is not a mapping, an offset and a length")
+            if data[1] < 0 or data[2] < 0 or data[1] + data[2] > len(data[0]):
+                raise ValueError("data view is out of the mapping")
+            self.__view = data
+        elif isinstance(data, bytes):
+            self.__data = data
+        else:
             raise TypeError("data is not bytes")
-        self.__data = data
         if not isinstance(binary_flag, bool):
             raise TypeError("binary flag is not bool")
         self.__binary = binary_flag
@@ -36,6 +56,10 @@ class Encoded_File:
         if not isinstance(cap_size, int):
             raise TypeError("cap_size should be int")
         self.__cap_size = cap_size
+        if not isinstance(text_flag, bool):
+            raise TypeError("text flag is not bool")
+        self.__text = text_flag
+        self.set_original_size(original_size)
 
     def __eq__(self, other:Any) -> bool:
         """
@@ -48,10 +72,10 @@ class Encoded_File:
             bool: True if equal, False otherwise.
         """
         if isinstance(other, Encoded_File):
-            if self.__data == other.__data:
+            if self.get_data() == other.get_data():
                 if self.__binary == other.__binary:
                     if self.__byte_length == other.__byte_length:
-                        if self.__path == other.__path:
+                        if self.__path == other.__path and self.__text == other.__text:
                             return True
         return False
 
@@ -64,13 +88,25 @@ class Encoded_File:
         """
         return self.__binary
 
+    def is_text(self) -> bool:
+        """
+        Check if the encoded data is a text file.
+
+        Returns:
+            bool: True if text, False otherwise.
+        """
+        return self.__text
+
     def get_data(self) -> bytes:
         """
         Get the encoded data.
 
         Returns:
-            bytes: The encoded data.
+            bytes: The encoded data. the data of a view is read from the mapping on every call.
         """
+        if self.__view is not None:
+            mapping, offset, length = self.__view
+            return mapping[offset:offset + length]
         return self.__data
 
     def get_byte_len(self) -> int:
@@ -103,6 +139,17 @@ class Encoded_File:
                 raise TypeError("path is not a Path object")
         self.__path = path
 
+    def set_text(self, text_flag: bool) -> None:
+        """
+        Set whether the encoded data is a text file.
+
+        Args:
+            text_flag (bool): The text flag to set.
+        """
+        if not isinstance(text_flag, bool):
+            raise TypeError("text flag is not bool")
+        self.__text = text_flag
+
     def get_encoder(self) -> str:
         """
         Get the encoder used for encoding the data.
@@ -114,3 +161,25 @@ class Encoded_File:
 
     def get_cap_size(self) -> int:
         return self.__cap_size
+
+    def get_original_size(self) -> int:
+        """
+        Get the size of the file before encoding.
+
+        Returns:
+            int: The size in bytes, 0 if unknown.
+        """
+        return self.__original_size
+
+    def set_original_size(self, original_size: int) -> None:
+        """
+        Set the size of the file before encoding.
+
+        Args:
+            original_size (int): The size in bytes.
+        """
+        if not isinstance(original_size, int):
+            raise TypeError("original size is not int")
+        if original_size < 0:
+            raise ValueError("original size cannot be negative")
+        self.__original_size = original_size
@@ -1,8 +1,9 @@
 import os
 from pathlib import Path
-from typing import Union, Any
+from typing import Optional, Union, Any
 from archive import *
-from compressor import Compressor, RLE_Compressor, LZW_Compressor
+from compressor import Compressor, RLE_Compressor, Store_Compressor, AUTO, is_incompressible
+from codec_registry import get_decoder, is_known_encoder
 from stats import runtime_length, compare_size
 from encoded_file import Encoded_File
 
@@ -33,10 +34,47 @@ def open_archive_from_file(archive_path: Path) -> Archive:
     return read_archive(archive_path)
 
 
+def open_archive_directory(archive_path: Path) -> Archive_Directory:
+    """
+    Open the entries of an archive file, without reading their data.
+
+    Args:
+        archive_path (Path): The path to the archive file.
+
+    Returns:
+        Archive_Directory: The entries of the archive.
+    """
+    if not is_valid_archive(archive_path):
+        raise IOError("Corrupted Archive File, Unable to read")
+    return read_archive_directory(archive_path)
+
+
+def delete_from_archive_file(archive_path: Path, directory: Archive_Directory,
+                             file_numbers: Union[list[str], list[int]]) -> bool:
+    """
+    Delete files from an archive file, by their numbers in the contents listing.
+    the files that are kept are read from the archive, and copied one at a time.
+
+    Args:
+        archive_path (Path): The path to the archive file.
+        directory (Archive_Directory): The entries of the archive.
+        file_numbers (Union[list[str], list[int]]): The numbers of the files to delete.
+
+    Returns:
+        bool: True if the files were deleted, False if a number is not in the listing.
+    """
+    records = directory.records_to_keep(file_numbers)
+    if records is None:
+        return False
+    rewrite_archive(archive_path, records, directory.get_hashed_password())
+    return True
+
+
 @runtime_length
 @compare_size
-def add_files_to_archive(new_files_paths: Union[list[Path], Path], save_path: Path, byte_len: int, compress: Compressor,
-                         password: Any = None, cap_size: int = 99) -> None:
+def add_files_to_archive(new_files_paths: Union[list[Path], Path], save_path: Path, byte_len: Union[int, str],
+                         compress: Compressor, password: Any = None, cap_size: Union[int, str] = 99,
+                         raw_text: bool = False, store_incompressible: bool = False) -> None:
     """
     Add files to an existing archive or create a new archive.
 
@@ -49,18 +87,21 @@ def add_files_to_archive(new_files_paths: Union[list[Path], Path], save_path: Pa
     Raises:
         ValueError: If the path is not a recognized archive file.
         IOError: If the archive file is corrupted.
-        :param byte_len: size of byte for RLE compress
-        :param cap_size: size of cap for RLE compress
+        :param byte_len: size of byte for RLE compress, or AUTO to tune it per file
+        :param cap_size: size of cap for RLE compress, or AUTO to tune it per file
         :param new_files_paths: parent folder of files / list of all files
         :param compress: comppressor type to use
         :param save_path: path to save file
         :param password: archive password
+        :param raw_text: encode text files as raw bytes, converting only their newlines on extraction
+        :param store_incompressible: store files that are already compressed as they are, instead of encoding them
     """
     if save_path.exists():
         # if the save path is a directory - add a default 'Archive.ido' suffix to the path
         if save_path.is_dir():
             save_path = save_path / 'Archive.ido'
-            encoded_files = files_to_encoded_files_list(new_files_paths, byte_len, compress, cap_size)
+            encoded_files = files_to_encoded_files_list(new_files_paths, byte_len, compress, cap_size, raw_text,
+                                                        store_incompressible)
             # add the files to a new archive instance
             archive = Archive(encoded_files, password)
             # save the archive in a .ido file.
@@ -75,36 +116,46 @@ def add_files_to_archive(new_files_paths: Union[list[Path], Path], save_path: Pa
                 if not is_valid_archive(save_path):
                     raise IOError("Corrupted Archive File, Unable to read")
                 else:  # if the file is valid
-                    # create archive instance
-                    archive = open_archive_from_file(save_path)
                     # encode files in the path given
-                    encoded_files = files_to_encoded_files_list(new_files_paths, byte_len, compress, cap_size)
-                    # add the files to the archive
-                    archive.add_to_archive(encoded_files)
-                    # save archive as .ido file
-                    save_archive_to_file(archive, save_path)
+                    encoded_files = files_to_encoded_files_list(new_files_paths, byte_len, compress, cap_size, raw_text,
+                                                                store_incompressible)
+                    # add the files in place, without rewriting the archive
+                    if not append_to_archive(save_path, encoded_files):
+                        # archives without a central directory are rewritten with one, replacing the files
+                        # with the same paths
+                        directory = read_archive_directory(save_path)
+                        new_paths = {encoded_file.get_path() for encoded_file in encoded_files}
+                        rewrite_archive(save_path, [record for record in directory.get_records()
+                                                    if record.path not in new_paths],
+                                        directory.get_hashed_password(), encoded_files)
     else:
         # if file doesn't exist - check suffix
         if save_path.suffix != ".ido":
             raise ValueError("Invalid Path - Not a recognized Archive file")
         # encode files given
-        encoded_files = files_to_encoded_files_list(new_files_paths, byte_len, compress, cap_size)
+        encoded_files = files_to_encoded_files_list(new_files_paths, byte_len, compress, cap_size, raw_text,
+                                                    store_incompressible)
         # add the files to a new archive instance
         archive = Archive(encoded_files, password)
         # save the archive in a .ido file.
         save_archive_to_file(archive, save_path)
 
 
-def files_to_encoded_files_list(files_paths: Union[list[Path], Path], byte_len: int, comp: Compressor, cap_size: int) \
-        -> list[Encoded_File]:
+def files_to_encoded_files_list(files_paths: Union[list[Path], Path], byte_len: Union[int, str], comp: Compressor,
+                                cap_size: Union[int, str], raw_text: bool = False,
+                                store_incompressible: bool = False) -> list[Encoded_File]:
     """
     Convert a list of file paths to a list of Encoded_File objects.
     This function Uses recursion.
 
     Args:
         files_paths (list[Path]): The paths to the files.
-        byte_len (int): The byte length for encoding the files.
+        byte_len (Union[int, str]): The byte length for encoding the files, or AUTO.
         comp (Compressor): The compressor object to use for encoding.
+        cap_size (Union[int, str]): The cap size for encoding the files, or AUTO.
+        raw_text (bool): Encode text files as raw bytes, with a text flag for their newlines.
+        store_incompressible (bool): Store files that are already compressed as they are, instead of encoding
+            them with the compressor.
 
     Returns:
         list[Encoded_File]: A list of Encoded_File objects.
@@ -122,7 +173,8 @@ def files_to_encoded_files_list(files_paths: Union[list[Path], Path], byte_len:
             # get files in folder
             files_in_dir = list(file_path.iterdir())
             # recursively call function
-            encoded_files_in_dir = files_to_encoded_files_list(files_in_dir, byte_len, comp, cap_size)
+            encoded_files_in_dir = files_to_encoded_files_list(files_in_dir, byte_len, comp, cap_size, raw_text,
+                                                               store_incompressible)
             # add the parent folder path as prefix
             for file in encoded_files_in_dir:
                 new_path = folder_name + '/' + str(file.get_path())
@@ -132,47 +184,96 @@ def files_to_encoded_files_list(files_paths: Union[list[Path], Path], byte_len:
         else:
             # select open type - r or rb
             file_name = file_path.name
-            if not is_text_file(file_path):
-                opened_file = open(file_path, 'rb')
-                file_content = opened_file.read()
+            if raw_text or not is_text_file(file_path):
+                with open(file_path, 'rb') as opened_file:
+                    file_content = opened_file.read()
+                # files that are already compressed are stored as they are
+                file_comp = comp
+                if store_incompressible and file_content and is_incompressible(file_content):
+                    file_comp = Store_Compressor()
+                file_byte_len, file_cap_size = resolve_encoding_parameters(file_comp, file_content, byte_len, cap_size)
                 # encode file and add to the encoded files list
-                encoded_files_list.append(comp.encode(file_content, file_name, byte_len, cap_size))
+                encoded_file = file_comp.encode(file_content, file_name, file_byte_len, file_cap_size)
+                encoded_file.set_original_size(len(file_content))
+                # a text file encoded as bytes keeps its newline semantics through the text flag
+                encoded_file.set_text(is_text_file(file_path))
+                encoded_files_list.append(encoded_file)
             else:
-                opened_file_var = open(file_path, 'r')
-                string_file_content = ''
-                for line in opened_file_var.readlines():
-                    string_file_content += line
+                with open(file_path, 'r') as opened_file_var:
+                    string_file_content = opened_file_var.read()
+                file_byte_len, file_cap_size = resolve_encoding_parameters(comp, string_file_content, byte_len,
+                                                                           cap_size)
                 # encode file and add to the encoded files list
-
-                encoded_files_list.append(comp.encode(string_file_content, file_name, byte_len, cap_size))
+                encoded_file = comp.encode(string_file_content, file_name, file_byte_len, file_cap_size)
+                encoded_file.set_original_size(file_path.stat().st_size)
+                encoded_files_list.append(encoded_file)
 
     return encoded_files_list
 
 
+def resolve_encoding_parameters(comp: Compressor, file_content: Union[str, bytes], byte_len: Union[int, str],
+                                cap_size: Union[int, str]) -> tuple[int, int]:
+    """
+    Replace AUTO byte length / cap size values with the parameters to encode a file with.
+
+    Args:
+        comp (Compressor): The compressor object used for encoding.
+        file_content (Union[str, bytes]): The content of the file.
+        byte_len (Union[int, str]): The byte length, or AUTO.
+        cap_size (Union[int, str]): The cap size, or AUTO.
+
+    Returns:
+        tuple[int, int]: The byte length and cap size for the file.
+
+    Raises:
+        ValueError: If the byte length or cap size is too large to store in the archive.
+    """
+    # out of range values are refused before the file is encoded
+    check_entry_parameters(0 if byte_len == AUTO else byte_len, 0 if cap_size == AUTO else cap_size)
+    if byte_len != AUTO and cap_size != AUTO:
+        return byte_len, cap_size
+    if isinstance(comp, RLE_Compressor):
+        return comp.tune(file_content, byte_len, cap_size)
+    # the parameters are used only by RLE, so other compressors keep the defaults
+    return 5 if byte_len == AUTO else byte_len, 99 if cap_size == AUTO else cap_size
+
+
 
 @runtime_length
 @compare_size
-def inflate_archive_to_files(archive_path: Path, save_path: Path, password: Any= None)  -> None:
+def inflate_archive_to_files(archive_path: Path, save_path: Path, password: Any = None,
+                             patterns: Optional[list[str]] = None) -> None:
     """
     Extract files from an archive and save them to disk.
+    the files are found in the archive directory, and only the data of the extracted files is read and decoded.
 
     Args:
         archive_path (Path): The path to the archive file.
         save_path (Path): The directory where files will be extracted.
-        :param save_path:
-        :param archive_path:
-        :param password:
-    """
-    rle_comp = RLE_Compressor()
-    lzw_comp = LZW_Compressor()
-    archive = open_archive_from_file(archive_path)
-    if archive.is_protected():
-        if archive.check_password(password):
+        password (Any): The archive password.
+        patterns (Optional[list[str]]): Extract only the files matching a path, folder or glob of the list.
+            all the files are extracted for None.
+    """
+    directory = open_archive_directory(archive_path)
+    if directory.is_protected():
+        if directory.check_password(password):
             print("Correct Password")
         else:
             raise DecryptError
-
-    for encoded_file in archive.get_encoded_files_list():
+    records = directory.get_records()
+    if patterns is not None:
+        records = select_records(records, patterns)
+        if not records:
+            print("No files in the archive match", ", ".join(patterns))
+            return
+
+    # find the decoder of every entry before writing any file, so an unknown encoder fails right away
+    decoders = {}
+    for record in records:
+        if record.encoder not in decoders:
+            decoders[record.encoder] = get_decoder(record.encoder)
+
+    for encoded_file in read_entries(archive_path, records):
         if os.name == 'nt':
             correct_file_path = str(encoded_file.get_path()).replace('/','\\')
 
@@ -180,13 +281,12 @@ def inflate_archive_to_files(archive_path: Path, save_path: Path, password: Any=
             correct_file_path = str(encoded_file.get_path()).replace('\\','/')
 
         new_file_path = save_path / correct_file_path
-        if encoded_file.get_encoder() == 'RLE':
-            file_content = rle_comp.decode(encoded_file)
-        else:
-            file_content = lzw_comp.decode(encoded_file)
+        file_content = decoders[encoded_file.get_encoder()].decode(encoded_file)
         # select write type
         if encoded_file.is_binary():
             open_type = 'wb'
+            if encoded_file.is_text():
+                file_content = to_native_newlines(file_content)
         else:
             open_type = 'w'
         new_file_path.parent.mkdir(parents=True, exist_ok=True)
@@ -194,6 +294,23 @@ def inflate_archive_to_files(archive_path: Path, save_path: Path, password: Any=
             file.write(file_content)
 
 
+def to_native_newlines(content: bytes) -> bytes:
+    """
+    Convert the newlines of a text file encoded as bytes to the newlines of this system,
+    the same way writing a text file does.
+
+    Args:
+        content (bytes): The content of the text file.
+
+    Returns:
+        bytes: The content with '\\r\\n', '\\r' and '\\n' newlines replaced by os.linesep.
+    """
+    content = content.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+    if os.linesep != '\n':
+        content = content.replace(b'\n', os.linesep.encode('utf-8'))
+    return content
+
+
 def is_text_file(path: Path) -> bool:
     """
     Check if a file is a text file based on its extension.
@@ -218,6 +335,14 @@ def is_valid_archive(path: Path) -> bool:
         bool: True if the archive file is valid, False otherwise.
     """
     try:
+        if archive_version(path) == ARCHIVE_VERSION:
+            # Read the entries without their data, checking their lengths fit the file
+            for record in read_archive_directory(path).get_records():
+                # Ensure a registered codec decodes the entry
+                if not is_known_encoder(record.encoder):
+                    print("Unknown encoder:", record.encoder)
+                    return False
+            return True
         with open(path, 'rb') as file:
             # Read hashed password if exists
             hashed_password = file.read(64)
@@ -227,7 +352,7 @@ def is_valid_archive(path: Path) -> bool:
 
             # Read encoded files data, binary flags, byte lengths, and paths
             combined_line = b''.join(file.readlines())
-            encoded_file_chunks = combined_line.split(b'x\\\\x')[:-1]  # Remove last empty element
+            encoded_file_chunks = combined_line.split(V1_DELIMITER)[:-1]  # Remove last empty element
 
             # Validate each encoded file data, binary flag, byte length, and path
             for i in range(0, len(encoded_file_chunks), 6):  # Each encoded file consists of 5 parts
@@ -245,6 +370,13 @@ def is_valid_archive(path: Path) -> bool:
                     print("byte_length_data:", byte_length_data)
                     print("cap_data:", cap_data)
                     return False
+                # Ensure a registered codec decodes the entry
+                if not is_known_encoder(encode_data.decode('utf-8', 'replace')):
+                    print("Unknown encoder:", encode_data)
+                    return False
     except FileNotFoundError:
         return False
+    except ValueError as error:
+        print("Corrupted archive:", error)
+        return False
     return True
@@ -1,14 +1,19 @@
 from argparse import Namespace, ArgumentParser
 import os
 import pathvalidate
-from compressor import Compressor, RLE_Compressor, LZW_Compressor, CODE_BASE_PATH
+from compressor import Compressor, CODE_BASE_PATH, AUTO, AUTO_COMPRESSOR
+from codec_registry import get_compressor, compressor_names
 from typing import Union
 from file_handler import *
 from pathlib import Path
 import sys
 
 
-# Help string for command-line interface
+# what the compressors whose names don't say it do, for the compressor list of the help
+COMPRESSOR_DESCRIPTIONS = {"HUF": "Huffman", "PIPE": "pipeline", "AUTO": "best codec for each file",
+                           "STORE": "no compression", "RC": "range coder"}
+
+# Help string for command-line interface, with the list of the registered compressors
 HELP_STRING = ("\n"
                "**************************************************************** \n"
                "Welcome to The File compressor App. Enter Some of the following arguments:\n -f: File Path- paths of "
@@ -16,9 +21,27 @@ HELP_STRING = ("\n"
                "or path of new files. \n  -a - Create archive from files. \n -o - "
                "Inflate files from archive. \n -v: Validate: make sure archive format is correct. \n -i: Inspect "
                "- show files in archive. \n -p: Password. enter password of existing file or enter new password "
-               "for new file. \n -c: Compressor - change compression type. 0-RLE, 1-LZW \n -q: Cap size: change encoder"
-               "cap size \n -d: Delete. delete files from Archive. Get index from inspect command. add ',' between "
-               "indices.  \n -r: Replace. Replace current archive file with a new one. \n -h: Help - this help "
+               "for new file. \n -c: Compressor - change compression type, by name or number. {compressors}, "
+               "RLE by default. already compressed files, such as zip or png files, are stored as they are when "
+               "neither a compressor nor a variant is given and with AUTO, and encoded like any other file by a "
+               "compressor that was chosen, RLE included. \n -e: Variant - format of the compressor. RLE: RLE "
+               "(decimal counts), RLE2 (varint counts) or RLEP (literal spans). LZW: LZW (decimal codes) or LZW2 "
+               "(bit packed codes), optionally followed by ':' and the max code width 9-32 "
+               "(0 for no limit, default 16) and by ':' and the policy of a full dictionary - reset it, or monitor "
+               "the ratio and reset it when it drops (default, LZW only keeps it), such as LZW2:12:reset. PIPE: "
+               "stages joined with '+', out of RLE, RLE2, RLEP, LZW, LZW2, HUF, LZSS, RC, DELTA, MTF and BWT, such "
+               "as BWT+MTF+RLE2+HUF (default RLE2+HUF). BWT can be followed by ':' and its block size in bits "
+               "10-24, such as BWT:18+MTF+RLE2+HUF (default 20). ZLIB, BZ2, LZMA: compression level, 0-9 (1-9 "
+               "for BZ2). AUTO: what to optimize, ratio, speed or balanced (default). LZSS: level 1-9, optionally "
+               "followed by ':' and the window bits 10-21, such as 9:20 (default 6:16). RC: the number of context "
+               "bytes, 0-2 (default 2). "
+               "\n -q: Cap size: change encoder cap size. \n -b / -q auto: "
+               "pick the RLE byte size / cap size for each file. \n -d: Delete. "
+               "delete files from Archive. Get index from inspect command. add ',' between "
+               "indices.  \n -x: Extract. with -o, inflate only the files matching a path, folder or glob such as "
+               "'folder/*.txt'. can be repeated. \n -r: Replace. Replace current archive file with a new one. "
+               "\n -t: Raw text. encode "
+               "text files as raw bytes, converting only their newlines on extraction. \n -h: Help - this help "
                "message.\n OR- just run the 'display.py' file directly to open the GUI.\n"
                "****************************************************************\n"
                )
@@ -31,7 +54,7 @@ def parse_args(argv: list[str]) -> Namespace:
         prog='main.py',
         description='Runs File Compressor',
         add_help=True,  # Enable default help message
-        epilog=HELP_STRING,
+        epilog=HELP_STRING.format(compressors=compressor_list(True)),
         exit_on_error=True  # Exit if errors occur during parsing
     )
     group = parser.add_mutually_exclusive_group()
@@ -62,13 +85,23 @@ def parse_args(argv: list[str]) -> Namespace:
     # Add optional arguments
     parser.add_argument('-p', '--password', type=str, default=None,
                         help='archive password')
-    parser.add_argument('-b', '--byte_size', type=int, default=5,
-                        help='change RLE encoder byte size')
-    parser.add_argument('-c', '--compressor', type=int, default=0,
-                        help='change compression algorithm 0-RLE, 1-LZW')
-    parser.add_argument('-q', '--cap_size', default=99, help="change RLE encoder cap size")
+    parser.add_argument('-b', '--byte_size', type=int_or_auto, default=5,
+                        help="change RLE encoder byte size, or 'auto' to pick it per file")
+    parser.add_argument('-c', '--compressor', type=name_or_number, default=None,
+                        help='change compression algorithm by name or number ' + compressor_list())
+    parser.add_argument('-e', '--variant', type=str, default=None,
+                        help="change compressor format RLE/RLE2/RLEP for RLE, LZW/LZW2[:max bits[:reset/monitor]] "
+                             "for LZW, stages such as 'DELTA+RLE2+HUF' for PIPE, the level of ZLIB/BZ2/LZMA, "
+                             "ratio/speed/balanced for AUTO, level[:window bits] for LZSS, "
+                             "or the context order 0-2 of RC")
+    parser.add_argument('-q', '--cap_size', type=int_or_auto, default=99,
+                        help="change RLE encoder cap size, or 'auto' to pick it per file")
+    parser.add_argument('-x', '--extract', type=str, action='append', default=None,
+                        help="with -o, inflate only files matching a path, folder or glob. can be repeated")
     parser.add_argument('-r', '--replace', action='store_true',
                         help='replace current archive with a new one.')
+    parser.add_argument('-t', '--raw_text', action='store_true',
+                        help='encode text files as raw bytes, converting only their newlines on extraction')
 
     # Parse arguments
     return parser.parse_args(argv)
@@ -90,15 +123,22 @@ def command_handler(args: Namespace) -> None:
                 except OSError:
                     print("Unable to delete archive. Adding to existing archive instead.")
 
+            compressor = match_relevant_compressor(args.compressor, args.variant)
+            # already compressed files are stored as they are, unless a compressor other than AUTO was chosen
+            store_incompressible = (args.compressor is None and args.variant is None) or \
+                compressor.get_name() == AUTO_COMPRESSOR
             # Create archive from files
             if isinstance(args.file_path, str):
-                add_files_to_archive(Path(args.file_path), Path(args.save_path), args.byte_size,
-                                     match_relevant_compressor(args.compressor), args.password)
+                add_files_to_archive(Path(args.file_path), Path(args.save_path), args.byte_size, compressor,
+                                     args.password, args.cap_size, args.raw_text, store_incompressible)
             else:
                 file_paths_list = [Path(x) for x in args.file_path]
-                add_files_to_archive(file_paths_list, Path(args.save_path), args.byte_size,
-                                     match_relevant_compressor(args.compressor), args.password, args.cap_size)
+                add_files_to_archive(file_paths_list, Path(args.save_path), args.byte_size, compressor,
+                                     args.password, args.cap_size, args.raw_text, store_incompressible)
 
+        except ValueError as error:
+            print("\n%s" % error)
+            return
         except TypeError:
             print("\nIncorrect Type inserted.")
             return
@@ -106,7 +146,7 @@ def command_handler(args: Namespace) -> None:
     elif args.open:
         try:
             # Inflate archive to files
-            inflate_archive_to_files(Path(args.file_path), Path(args.save_path), args.password)
+            inflate_archive_to_files(Path(args.file_path), Path(args.save_path), args.password, args.extract)
         except ValueError:
             print("\nOne of the values inserted is Incorrect")
             return
@@ -131,21 +171,22 @@ def command_handler(args: Namespace) -> None:
             print("\nInvalid Archive, Unable to Inspect")
             return
         else:
-            archive = open_archive_from_file(Path(args.file_path))
-            if archive.is_protected():
+            # only the central directory of the archive is read
+            directory = open_archive_directory(Path(args.file_path))
+            if directory.is_protected():
                 if args.password is None:
                     print("Protected Archive. Enter Password.")
-                if archive.check_password(args.password):
+                if directory.check_password(args.password):
                     print("Password Correct")
                 else:
                     print("INCORRECT Password. Unable to Inspect archive. Try again")
                     return
             if args.inspect:
-                print(archive.get_archive_contents())
+                print(directory.get_archive_contents())
             else:  # if delete file
                 delete_indices = args.delete.split(',')
-                archive.delete_files_from_archive(delete_indices)  # delete relevant files
-                save_archive_to_file(archive, Path(args.file_path))  # replace archive with new one.
+                # replace archive with one without the relevant files
+                delete_from_archive_file(Path(args.file_path), directory, delete_indices)
             return
 
     return
@@ -198,15 +239,27 @@ def validate_args(args: Namespace) -> bool:
             if save_path.suffix != ".ido" and save_path.suffix != '':
                 print("Invalid File name - File should end with .ido")
                 return False
-    if args.byte_size <= 0:
+    if args.byte_size != AUTO and args.byte_size <= 0:
         print("Invalid byte size - should be positive integer.")
         return False
-    if args.cap_size <= 0:
+    if args.byte_size != AUTO and args.byte_size > MAX_BYTE_LENGTH:
+        print("Invalid byte size - should be at most %d." % MAX_BYTE_LENGTH)
+        return False
+    if args.cap_size != AUTO and args.cap_size <= 0:
         print("Invalid cap size - should be positive integer")
         return False
+    if args.cap_size != AUTO and args.cap_size > MAX_CAP_SIZE:
+        print("Invalid cap size - should be at most %d" % MAX_CAP_SIZE)
+        return False
     if not match_relevant_compressor(args.compressor):
         print("Invalid Compressor Number. see -Help")
         return False
+    if not match_relevant_compressor(args.compressor, args.variant):
+        print("Invalid Compressor Variant. see -Help")
+        return False
+    if args.extract is not None and not args.open:
+        print("Extract patterns are used only when inflating an archive (-o).")
+        return False
     if args.delete is not None:
         delete_indices = args.delete.split(',')
         for index in delete_indices:
@@ -222,17 +275,54 @@ def validate_args(args: Namespace) -> bool:
     return True
 
 
-def match_relevant_compressor(comp_number: int) -> Union[Compressor, bool]:
+def int_or_auto(value: str) -> Union[int, str]:
+    """
+    Parse an RLE parameter from the command line - a number, or 'auto' to tune it per file.
+    :param value: command line value
+    :return: the integer, or AUTO
+    """
+    if value == AUTO:
+        return AUTO
+    return int(value)
+
+
+def compressor_list(descriptions: bool = False) -> str:
     """
-    Match compression algorithm number to corresponding compressor object
-    :param comp_number:
+    List the registered compressors by their command line numbers, such as '0-RLE, 1-LZW'
+    :param descriptions: add what the compressors whose names don't say it do, such as '2-HUF (Huffman)'
+    :return: the compressor list
+    """
+    compressors = []
+    for number, name in enumerate(compressor_names()):
+        if descriptions and name in COMPRESSOR_DESCRIPTIONS:
+            compressors.append("%d-%s (%s)" % (number, name, COMPRESSOR_DESCRIPTIONS[name]))
+        else:
+            compressors.append("%d-%s" % (number, name))
+    return ", ".join(compressors)
+
+
+def name_or_number(value: str) -> Union[int, str]:
+    """
+    Parse a compressor from the command line - its number, or its name.
+    :param value: command line value
+    :return: the number, or the name
+    """
+    if value.isdigit():
+        return int(value)
+    return value
+
+
+def match_relevant_compressor(comp_number: Union[int, str, None], variant: Union[str, None] = None) \
+        -> Union[Compressor, bool]:
+    """
+    Match compression algorithm number or name to corresponding compressor object
+    :param comp_number: compressor number or name, out of the registered compressors, None for the default RLE
+    :param variant: format of the compressor, None for its default format
     :return: Compressor name if exists, false otherwise
     """
-    if comp_number == 0:
-        return RLE_Compressor()
-    elif comp_number == 1:
-        return LZW_Compressor()
-    else:
+    try:
+        return get_compressor(0 if comp_number is None else comp_number, variant)
+    except ValueError:  # no such compressor, or the variant doesn't belong to it
         return False
 
 
@@ -271,12 +361,15 @@ def default_args() -> Namespace:
         inspect=False,
         password=None,
         byte_size=5,
-        compressor=0,
+        compressor=None,
         file_path=[],
         save_path=None,
         cap_size=99,
         delete=None,
-        replace=False
+        replace=False,
+        variant=None,
+        raw_text=False,
+        extract=None
     )
 
 
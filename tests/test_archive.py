@@ -2,9 +2,12 @@ import filecmp
 import pytest
 
 # Import necessary classes and functions from other modules
-from archive import Archive, write_archive, read_archive, hash_password
+import zlib
+from archive import Archive, write_archive, read_archive, hash_password, archive_version, read_archive_directory, \
+    select_records, append_to_archive, rewrite_archive, read_directory_entries, read_footer, ARCHIVE_MAGIC, \
+    ARCHIVE_VERSION, V1_DELIMITER, MAX_BYTE_LENGTH, MAX_CAP_SIZE
 from encoded_file import Encoded_File
-from file_handler import files_to_encoded_files_list
+from file_handler import files_to_encoded_files_list, is_valid_archive
 from compressor import RLE_Compressor, TEST_BASE_PATH
 from pathlib import Path
 
@@ -225,6 +228,179 @@ def test_non_list_files():
         archive1 = Archive("file")
 
 
+# Test the v2 container keeps entries whose data contains the v1 delimiter, and the password hash
+def test_v2_container(temp_file_path):
+    encoded_files = [Encoded_File(b"a" + V1_DELIMITER * 3 + b"b", True, 8, Path("folder") / "bin", "LZSS", 99),
+                     Encoded_File(V1_DELIMITER, True, 5, Path("text.txt"), "STORE", 99, True),
+                     Encoded_File(b"", False, 5, Path("empty.txt"), "RLE", 12)]
+    archive = Archive(encoded_files, "secret")
+    write_archive(temp_file_path, archive)
+    assert temp_file_path.read_bytes()[:5] == ARCHIVE_MAGIC + bytes([ARCHIVE_VERSION])
+    assert archive_version(temp_file_path) == ARCHIVE_VERSION
+    with read_archive(temp_file_path) as new_archive:
+        assert new_archive == archive
+        assert new_archive.is_protected() and new_archive.check_password("secret")
+        for encoded_file, new_file in zip(encoded_files, new_archive.get_encoded_files_list()):
+            assert new_file.get_encoder() == encoded_file.get_encoder()
+            assert new_file.get_cap_size() == encoded_file.get_cap_size()
+        # the entries are views of the mapped archive, which is closed with the archive
+        copy_path = temp_file_path.with_name("copy")
+        write_archive(copy_path, new_archive)
+    with pytest.raises(ValueError):
+        new_archive.get_encoded_files_list()[0].get_data()
+    # the archive file isn't mapped anymore, so it can be replaced
+    write_archive(temp_file_path, Archive([]))
+    with read_archive(copy_path) as copy_archive:
+        assert copy_archive == archive
+        assert new_file.is_text() == encoded_file.is_text()
+    # an archive cut inside an entry can't be read
+    temp_file_path.write_bytes(temp_file_path.read_bytes()[:-1])
+    with pytest.raises(ValueError):
+        read_archive(temp_file_path)
+
+
+# Test archives written in the v1 container are still read
+def test_read_v1_archive():
+    v1_path = TEST_BASE_PATH / "File_Handler_Tests" / "Existing_Archive.ido"
+    assert archive_version(v1_path) == 1
+    archive = read_archive(v1_path)
+    assert not archive.is_protected()
+    assert [str(file.get_path()).replace("\\", "/") for file in archive.get_encoded_files_list()] == \
+           ["folder_scheme/folder/inside folder/text file.txt", "folder_scheme/folder/text file.txt",
+            "folder_scheme/some_file.accdb", "folder_scheme/text file.txt"]
+    assert len(RLE_Compressor().decode(archive.get_encoded_files_list()[2])) == 495616
+
+
+# Test the central directory lists the entries with their sizes and checksums, without reading their data
+def test_archive_directory(temp_file_path):
+    encoded_files = [Encoded_File(bytes(range(256)) * 40, True, 8, Path("b.bin"), "STORE", 99, False, 10240),
+                     Encoded_File(b"\x05a", False, 5, Path("a.txt"), "RLE2", 99, False, 5)]
+    write_archive(temp_file_path, Archive(encoded_files))
+    directory = read_archive_directory(temp_file_path)
+    assert not directory.is_protected()
+    assert directory.get_archive_contents() == "\n1 - a.txt\n2 - b.bin\n"
+    records = directory.get_records()
+    assert [record.path for record in records] == [Path("b.bin"), Path("a.txt")]
+    assert [record.original_size for record in records] == [10240, 5]
+    assert [record.checksum for record in records] == [zlib.crc32(file.get_data()) for file in encoded_files]
+    content = temp_file_path.read_bytes()
+    for record, encoded_file in zip(records, encoded_files):
+        assert content[record.offset:record.offset + record.length] == encoded_file.get_data()
+    assert [record.path for record in directory.records_to_keep(["2"])] == [Path("a.txt")]
+    assert directory.records_to_keep([3]) is None
+    # the directory is read without the data, so a corrupted entry is found only when its data is read
+    temp_file_path.write_bytes(content[:records[0].offset] + b"\xff" + content[records[0].offset + 1:])
+    assert len(read_archive_directory(temp_file_path).get_records()) == 2
+    with pytest.raises(ValueError):
+        read_archive(temp_file_path)
+    # a directory that doesn't fit the archive is corrupted
+    temp_file_path.write_bytes(content[:-1])
+    with pytest.raises(ValueError):
+        read_archive_directory(temp_file_path)
+    # archives without a directory are walked record by record
+    no_directory = bytearray(content[:records[1].offset + records[1].length])
+    no_directory[len(ARCHIVE_MAGIC) + 1] = 0  # the flags
+    temp_file_path.write_bytes(no_directory)
+    assert [file.get_data() for file in read_archive(temp_file_path).get_encoded_files_list()] == \
+           [file.get_data() for file in encoded_files]
+
+
+# Test entries are selected by a file path, a folder path or a glob
+def test_select_records():
+    records = read_archive_directory(TEST_BASE_PATH / "File_Handler_Tests" / "Existing_Archive.ido").get_records()
+
+    def selected(*patterns):
+        return [str(record.path).replace("\\", "/") for record in select_records(records, list(patterns))]
+
+    assert selected("folder_scheme/some_file.accdb") == ["folder_scheme/some_file.accdb"]
+    assert selected("folder_scheme\\folder\\") == ["folder_scheme/folder/inside folder/text file.txt",
+                                                    "folder_scheme/folder/text file.txt"]
+    assert selected("*.accdb", "folder_scheme/text file.txt") == ["folder_scheme/some_file.accdb",
+                                                                  "folder_scheme/text file.txt"]
+    assert selected("folder_scheme/*/text file.txt") == ["folder_scheme/folder/inside folder/text file.txt",
+                                                         "folder_scheme/folder/text file.txt"]
+    assert selected("folder", "*.TXT", "some_file") == []
+
+
+# Test files are added in place, superseding the entries they replace
+def test_append_to_archive(temp_file_path):
+    write_archive(temp_file_path, Archive([Encoded_File(b"old a", True, 8, Path("a"), "STORE"),
+                                           Encoded_File(b"old b", True, 8, Path("b"), "STORE")], "secret"))
+    content = temp_file_path.read_bytes()
+    assert append_to_archive(temp_file_path, [Encoded_File(b"new b", True, 8, Path("b"), "STORE"),
+                                              Encoded_File(b"new c", True, 8, Path("c"), "STORE")])
+    # nothing that was in the archive was moved or overwritten
+    assert temp_file_path.read_bytes()[:len(content)] == content
+    with open(temp_file_path, 'rb') as file:
+        assert [(str(record.path), record.superseded) for record in read_directory_entries(file)] == \
+               [("a", False), ("b", True), ("b", False), ("c", False)]
+    with read_archive(temp_file_path) as archive:
+        assert archive.check_password("secret")
+        assert [file.get_data() for file in archive.get_encoded_files_list()] == [b"old a", b"new b", b"new c"]
+    directory = read_archive_directory(temp_file_path)
+    assert directory.get_archive_contents() == "\n1 - a\n2 - b\n3 - c\n"
+    # rewriting the archive drops the superseded entries
+    rewrite_archive(temp_file_path, directory.get_records(), directory.get_hashed_password(),
+                    [Encoded_File(b"new d", True, 8, Path("d"), "STORE")])
+    with open(temp_file_path, 'rb') as file:
+        assert len(read_directory_entries(file)) == 4
+    with read_archive(temp_file_path) as archive:
+        assert archive.check_password("secret")
+        assert [file.get_data() for file in archive.get_encoded_files_list()] == \
+               [b"old a", b"new b", b"new c", b"new d"]
+    # archives without a central directory are not appended to
+    assert not append_to_archive(TEST_BASE_PATH / "File_Handler_Tests" / "Existing_Archive.ido", [])
+
+
+# Test an append cut short at any point leaves the entries of the previous directory readable
+def test_interrupted_append(temp_file_path):
+    write_archive(temp_file_path, Archive([Encoded_File(b"old a", True, 8, Path("a"), "STORE"),
+                                           Encoded_File(b"old b", True, 8, Path("b"), "STORE")]))
+    content = temp_file_path.read_bytes()
+    append_to_archive(temp_file_path, [Encoded_File(b"new b IDOD", True, 8, Path("b"), "STORE"),
+                                       Encoded_File(b"new c", True, 8, Path("c"), "STORE")])
+    appended = temp_file_path.read_bytes()
+    for length in range(len(content), len(appended)):
+        temp_file_path.write_bytes(appended[:length])
+        assert [file.get_data() for file in read_archive(temp_file_path).get_encoded_files_list()] == \
+               [b"old a", b"old b"]
+    # a later append still works on the cut archive
+    assert append_to_archive(temp_file_path, [Encoded_File(b"new d", True, 8, Path("d"), "STORE")])
+    assert [file.get_data() for file in read_archive(temp_file_path).get_encoded_files_list()] == \
+           [b"old a", b"old b", b"new d"]
+    # with no directory at all, the archive is corrupted
+    with open(temp_file_path, 'rb') as file:
+        directory_offset, _ = read_footer(file, len(content))
+    temp_file_path.write_bytes(content[:directory_offset])
+    with pytest.raises(ValueError):
+        read_archive_directory(temp_file_path)
+
+
+# Test an archive with a corrupted footer and no footer before it is reported as corrupted
+def test_corrupted_footer(temp_file_path):
+    write_archive(temp_file_path, Archive([Encoded_File(b"old a", True, 8, Path("a"), "STORE")]))
+    content = bytearray(temp_file_path.read_bytes())
+    content[-1] ^= 0xFF
+    temp_file_path.write_bytes(content)
+    with pytest.raises(ValueError, match="footer"):
+        read_archive_directory(temp_file_path)
+    assert not is_valid_archive(temp_file_path)
+
+
+# Test sizes the entry fields can't hold are refused without touching the archive or leaving a temporary file
+def test_oversized_entry_parameters(temp_file_path):
+    write_archive(temp_file_path, Archive([Encoded_File(b"old a", True, 8, Path("a"), "STORE")]))
+    content = temp_file_path.read_bytes()
+    for byte_length, cap_size in ((MAX_BYTE_LENGTH + 1, 99), (8, MAX_CAP_SIZE + 1)):
+        oversized = Encoded_File(b"new b", True, byte_length, Path("b"), "STORE", cap_size)
+        with pytest.raises(ValueError):
+            write_archive(temp_file_path, Archive([oversized]))
+        with pytest.raises(ValueError):
+            append_to_archive(temp_file_path, [Encoded_File(b"new c", True, 8, Path("c"), "STORE"), oversized])
+        assert temp_file_path.read_bytes() == content
+        assert list(temp_file_path.parent.iterdir()) == [temp_file_path]
+
+
 # Entry point for running the tests
 if __name__ == "__main__":
     pytest.main()
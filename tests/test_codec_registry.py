@@ -0,0 +1,169 @@
+from pathlib import Path
+import random
+from types import SimpleNamespace
+
+import pytest
+
+import codec_registry
+from codec_registry import get_compressor, get_decoder, is_known_encoder, compressor_names, register_compressor, \
+    register_decoder
+import compressor
+from compressor import Compressor, Auto_Compressor, Store_Compressor, Stream_Compressor
+from encoded_file import Encoded_File
+
+
+# Fixture that restores the registry after a test registers codecs
+@pytest.fixture
+def clean_registry(monkeypatch):
+    monkeypatch.setattr(codec_registry, "_compressors", dict(codec_registry._compressors))
+    monkeypatch.setattr(codec_registry, "_costs", dict(codec_registry._costs))
+    monkeypatch.setattr(codec_registry, "_decoders", dict(codec_registry._decoders))
+    monkeypatch.setattr(codec_registry, "_decoder_families", dict(codec_registry._decoder_families))
+    monkeypatch.setattr(codec_registry, "_entry_points_loaded", False)
+
+
+# A compressor registered by a plugin - the RLE2 format under another encoder name
+class Fast_RLE_Compressor(Compressor):
+    def __init__(self) -> None:
+        super().__init__("FASTRLE")
+
+    def binary_encode(self, text: bytes, byte_size: int, file_name: str, cap_size: int = 99) -> Encoded_File:
+        return Encoded_File(compressor._rle2_encode(text, byte_size), True, byte_size, Path(file_name),
+                            self.get_name(), cap_size)
+
+    def binary_decode(self, encoded_file: Encoded_File) -> bytes:
+        return compressor._rle2_decode(encoded_file.get_data(), encoded_file.get_byte_len())
+
+
+# Test the compressors of the project keep their command line numbers
+def test_builtin_compressors():
+    assert compressor_names()[:11] == ["RLE", "LZW", "HUF", "PIPE", "ZLIB", "BZ2", "LZMA", "AUTO", "STORE", "LZSS",
+                                       "RC"]
+    assert get_compressor(0).get_name() == "RLE"
+    assert get_compressor("lzw", "LZW2").get_name() == "LZW2"
+    assert get_compressor("lzw", "LZW2:12:reset").get_name() == "LZW2"
+    assert get_compressor(3, "MTF+HUF").get_name() == "PIPE:MTF+HUF"
+    assert get_compressor(3, "BWT:18+MTF+HUF").get_bwt_block_size() == 1 << 18
+    assert get_compressor("zlib", "9").get_level() == 9
+    assert get_compressor(7, "speed").get_name() == "AUTO"
+    assert get_compressor("lzss", "9:20").get_window_bits() == 20
+    assert get_compressor("lzss", "3").get_level() == 3
+    assert get_compressor(10, "1").get_order() == 1
+    for name, variant in [(99, None), ("ZIP", None), ("HUF", "RLE2"), ("RLE", "LZW"), ("ZLIB", "best"), ("BZ2", "0"),
+                          ("AUTO", "fast"), ("LZSS", "fast"), ("LZSS", "6:30"),
+                          ("RC", "3"), ("LZW", "LZW:12:reset"), ("LZW", "LZW2:12:wipe")]:
+        with pytest.raises(ValueError):
+            get_compressor(name, variant)
+
+
+# Test every stored encoder name finds its decoder, and unknown names fail
+def test_get_decoder():
+    for encoder in ["RLE", "RLE2", "RLEP", "LZW", "LZW2", "HUF", "ZLIB", "BZ2", "LZMA", "STORE", "LZSS", "RC"]:
+        assert get_decoder(encoder).get_name() == encoder
+    assert get_decoder("PIPE:DELTA+HUF").get_name() == "PIPE:DELTA+HUF"
+    assert is_known_encoder("PIPE:RLE2")
+    for encoder in ["ZIP", "PIPE:ZIP", "rle", ""]:
+        assert not is_known_encoder(encoder)
+        with pytest.raises(ValueError):
+            get_decoder(encoder)
+
+
+# Test the auto compressor picks a codec that suits the file, and its entries decode with that codec
+def test_auto_compressor():
+    runs = b"a" * 50000 + b"b" * 50000
+    noise = bytes((i * 7919 + (i >> 3) * 104729) % 251 for i in range(50000))
+    logs = "".join("2024-01-%02d INFO request %d took %dms\n" % (i % 28 + 1, i * 37, i % 500) for i in range(3000))
+    for objective in ["ratio", "speed", "balanced"]:
+        auto_compressor = get_compressor("AUTO", objective)
+        assert isinstance(auto_compressor, Auto_Compressor)
+        for text in [runs, noise, logs]:
+            encoded_file = auto_compressor.encode(text, "path")
+            assert encoded_file.get_encoder() != "AUTO"
+            assert len(encoded_file.get_data()) < len(text)
+            assert get_decoder(encoded_file.get_encoder()).decode(encoded_file) == text
+            assert auto_compressor.decode(encoded_file) == text
+            # the built-in codecs declare their costs, so the choice is the same on every run
+            assert auto_compressor.choose(text).get_name() == auto_compressor.choose(text).get_name()
+    # a stream codec or Huffman coding beats run length encoding on text
+    assert not get_compressor("AUTO", "ratio").encode(logs, "path").get_encoder().startswith("RLE")
+    with pytest.raises(ValueError):
+        get_compressor("AUTO", "smallest")
+
+
+# Test the objectives of the auto compressor weigh the ratio of every codec against its declared cost
+def test_auto_compressor_objectives():
+    candidates = [(Store_Compressor(), 0.0), (Stream_Compressor("ZLIB", 1), 0.05), (Stream_Compressor("LZMA", 9), 1.0)]
+    logs = "".join("2024-01-%02d INFO request %d took %dms\n" % (i % 28 + 1, i * 37, i % 500) for i in range(3000))
+    choices = {objective: Auto_Compressor(lambda: candidates, get_decoder, objective).choose(logs).get_name()
+               for objective in compressor.AUTO_OBJECTIVES}
+    assert choices == {"ratio": "LZMA", "speed": "ZLIB", "balanced": "LZMA"}
+    # nothing shrinks random bytes, so the speed objective keeps the smallest output
+    rng = random.Random(5)
+    noise = bytes(rng.randrange(256) for _ in range(20000))
+    assert Auto_Compressor(lambda: candidates, get_decoder, "speed").choose(noise).get_name() == "STORE"
+    # a codec with a cost measured on the sample is weighed too
+    measured = [(Stream_Compressor("ZLIB", 1), None), (Stream_Compressor("LZMA", 9), 1.0)]
+    assert Auto_Compressor(lambda: measured, get_decoder, "speed").choose(logs).get_name() == "ZLIB"
+
+
+# Test codecs that fail are skipped, and a text no codec encodes is stored
+def test_auto_compressor_failing_codecs():
+    class Broken_Compressor(Compressor):
+        def __init__(self) -> None:
+            super().__init__("BROKEN")
+
+        def binary_encode(self, text: bytes, byte_size: int, file_name: str, cap_size: int = 99) -> Encoded_File:
+            raise RuntimeError("native library crashed")
+
+    text = b"abc" * 1000
+    assert Auto_Compressor(lambda: [(Broken_Compressor(), 0.0), (Stream_Compressor("ZLIB", 1), 0.05)],
+                           get_decoder).choose(text).get_name() == "ZLIB"
+    auto_compressor = Auto_Compressor(lambda: [(Broken_Compressor(), 0.0)], get_decoder)
+    assert auto_compressor.choose(text).get_name() == "STORE"
+    assert auto_compressor.decode(auto_compressor.encode(text, "path")) == text
+
+
+# Test the auto compressor weighs the cost a registered compressor declares for its variant
+def test_registered_cost(clean_registry):
+    assert codec_registry._costs["LZSS"]("1") < codec_registry._costs["LZSS"]("9:20")
+    assert codec_registry._costs["ZLIB"]("9") == compressor.AUTO_CODEC_COSTS["ZLIB"]
+    register_compressor("FASTRLE", lambda variant: Fast_RLE_Compressor(), lambda variant: 0.0)
+    register_compressor("SLOWRLE", lambda variant: Fast_RLE_Compressor())
+    register_decoder("FASTRLE", Fast_RLE_Compressor)
+    # the compressors registered last are the last candidates
+    assert [cost for _, cost in codec_registry._auto_candidates()[-2:]] == [0.0, None]
+
+
+# Test a registered codec compresses and decodes like the built in ones
+def test_register_codec(clean_registry):
+    register_compressor("FASTRLE", lambda variant: Fast_RLE_Compressor())
+    register_decoder("FASTRLE", Fast_RLE_Compressor)
+    assert "FASTRLE" in compressor_names()
+    encoded_file = get_compressor("FASTRLE").encode(b"aaaaaaaaaabbbbbbbbbb", "path", 1)
+    assert encoded_file.get_encoder() == "FASTRLE"
+    assert get_decoder(encoded_file.get_encoder()).decode(encoded_file) == b"aaaaaaaaaabbbbbbbbbb"
+
+
+# Test codecs of installed packages are registered through entry points, once
+def test_entry_points(clean_registry, monkeypatch):
+    calls = []
+
+    def register_plugin():
+        calls.append(True)
+        register_decoder("FASTRLE", Fast_RLE_Compressor)
+
+    def broken_plugin():
+        raise ImportError("missing native library")
+
+    plugins = [SimpleNamespace(name="fast", load=lambda: register_plugin),
+               SimpleNamespace(name="broken", load=lambda: broken_plugin)]
+    monkeypatch.setattr(codec_registry, "entry_points", lambda group: plugins)
+    with pytest.warns(UserWarning):
+        decoder = get_decoder("FASTRLE")
+    assert decoder.decode(Encoded_File(b"\x03a", True, 1, Path("path"), "FASTRLE")) == b"aaa"
+    get_decoder("FASTRLE")
+    assert len(calls) == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -1,10 +1,17 @@
 from pathlib import Path
 from typing import Union
 from filecmp import cmp
+import json
+import random
+import time
+import tracemalloc
 import pytest
+from flaky import flaky
 
 # Import necessary classes and constants from the compressor module
-from compressor import RLE_Compressor, LZW_Compressor, Compressor, TEST_BASE_PATH
+import compressor
+from compressor import RLE_Compressor, LZW_Compressor, Huffman_Compressor, Pipeline_Compressor, Stream_Compressor, \
+    Store_Compressor, LZSS_Compressor, Range_Compressor, Compressor, TEST_BASE_PATH, LZW_VARIANTS, STREAM_CODECS
 from encoded_file import Encoded_File
 
 # Define the base path for compressor tests
@@ -236,6 +243,503 @@ def test_general_use(rle_compressor, lzw_compressor):
     assert_encode_and_decode(rle_compressor, 100 * "a", 11)
     assert_encode_and_decode(lzw_compressor, 100 * "a", 11)
 
+# Reference implementation of the original RLE binary encoder, used to make sure the
+# linear-time engine keeps the archive format byte-identical
+def legacy_rle_binary_encode(text: bytes, byte_size: int, cap_size: int) -> bytes:
+    encoding = b''
+    i = 0
+    while i < len(text):
+        count = 1
+        while (i + count * byte_size < len(text) and (len(text) - (i + count * byte_size)) > byte_size and
+               text[i: i + byte_size] == text[i + count * byte_size: i + (count + 1) * byte_size]):
+            count += 1
+        total_count = count
+        while count > cap_size:
+            encoding += str(cap_size).encode('utf-8') + (text[i:i + byte_size])
+            count -= cap_size
+        padding = "0" * (len(str(cap_size)) - len(str(count)))
+        encoding += padding.encode('utf-8') + str(count).encode('utf-8') + (text[i:i + byte_size])
+        i += byte_size * total_count
+    return encoding
+
+
+# Reference implementation of the original RLE string encoder
+def legacy_rle_string_encode(text: str, byte_size: int, cap_size: int) -> bytes:
+    encoding = ''
+    i = 0
+    while i < len(text):
+        count = 1
+        while (i + count * byte_size < len(text) and (len(text) - (i + count * byte_size)) > byte_size and
+               text[i: i + byte_size] == text[i + count * byte_size: i + (count + 1) * byte_size]):
+            count += 1
+        total_count = count
+        while count >= cap_size:
+            encoding += str(cap_size) + text[i: i + byte_size]
+            count -= cap_size
+        run_length_size = len(str(cap_size))
+        encoding += "0" * (run_length_size - len(str(count))) + str(count) + text[i:i + byte_size]
+        i += byte_size * total_count
+    return encoding.encode('utf-8')
+
+
+# Test the RLE engine output is identical to the original format
+def test_rle_encode_matches_legacy_format(rle_compressor):
+    rng = random.Random(1234)
+    samples = [b"a", b"aa", b"aaaaa", b"ab" * 50, b"\x00" * 1000, b"111222333", b"abcabcabcab"]
+    # run-heavy random data over a small alphabet
+    for _ in range(30):
+        samples.append(bytes(rng.choice(b"ab") for _ in range(rng.randint(1, 400))))
+    for sample in samples:
+        for byte_size in (1, 2, 3, 5):
+            for cap_size in (1, 3, 9, 99, 255):
+                encoded = rle_compressor.encode(sample, "path", byte_size, cap_size)
+                assert encoded.get_data() == legacy_rle_binary_encode(sample, byte_size, cap_size)
+                string_sample = sample.decode('latin-1')
+                encoded = rle_compressor.encode(string_sample, "path", byte_size, cap_size)
+                assert encoded.get_data() == legacy_rle_string_encode(string_sample, byte_size, cap_size)
+
+
+# Test the numpy RLE engine gives the same output as the pure python engine, across chunk borders
+@pytest.mark.skipif(compressor.np is None, reason="numpy is not installed")
+def test_rle_numpy_encode_matches_python():
+    rng = random.Random(4321)
+    samples = [b"a", b"ab", b"\x00" * 1000, b"111222333", bytes(range(256)) * 3]
+    for _ in range(30):
+        samples.append(bytes(rng.choice(b"ab") for _ in range(rng.randint(1, 400))))
+    for sample in samples:
+        for byte_size in (1, 2, 3, 5):
+            for cap_size in (1, 9, 99):
+                expected = compressor._rle_encode(sample, byte_size, cap_size)
+                for chunk_blocks in (1, 7, 1 << 20):
+                    assert compressor._rle_encode_numpy(sample, byte_size, cap_size, chunk_blocks) == expected
+
+
+# Test both RLE decode engines restore the data, including a trailing partial block
+def test_rle_decode_engines(rle_compressor):
+    rng = random.Random(2468)
+    samples = [b"a", b"abcdefg", b"\x00" * 1000 + b"xy", bytes(range(256)) * 3]
+    for _ in range(20):
+        samples.append(bytes(rng.choice(b"ab") for _ in range(rng.randint(1, 400))))
+    for sample in samples:
+        for byte_size in (1, 3, 5):
+            for cap_size in (9, 99):
+                encoded = compressor._rle_encode(sample, byte_size, cap_size)
+                assert compressor._rle_decode(encoded, byte_size, cap_size) == sample
+                if compressor.np is not None:
+                    for chunk_records in (1, 5, 1 << 20):
+                        assert compressor._rle_decode_numpy(encoded, byte_size, cap_size, chunk_records) == sample
+    # non ascii text can't use the binary engines
+    assert_encode_and_decode(rle_compressor, "\u05e9\u05dc\u05d5\u05dd" * 20 + "ab", 3)
+    with pytest.raises(ValueError):
+        compressor._rle_decode(b"x1aaaa", 5, 9)
+
+
+# Test the RLE2 varint format round trips, and matches between the python and numpy engines
+def test_rle2_encode_decode():
+    rle2_compressor = RLE_Compressor("RLE2")
+    string_encode_and_decode(rle2_compressor)
+    binary_encode_and_decode(rle2_compressor)
+    assert_encode_and_decode(rle2_compressor, "\u05e9\u05dc\u05d5\u05dd" * 20 + "ab", 3)
+    rng = random.Random(1357)
+    for _ in range(20):
+        sample = bytes(rng.choice(b"ab") for _ in range(rng.randint(1, 2000)))
+        for byte_size in (1, 2, 5):
+            encoded = compressor._rle2_encode(sample, byte_size)
+            assert compressor._rle2_decode(encoded, byte_size) == sample
+            if compressor.np is not None:
+                assert compressor._rle2_encode_numpy(sample, byte_size, 7) == encoded
+    # long runs take a few varint bytes instead of many capped records
+    encoded_file = rle2_compressor.encode(b"\x00" * 100000 + b"\x01", "path", 1, 99)
+    assert encoded_file.get_encoder() == "RLE2"
+    assert encoded_file.get_data() == b"\xa0\x8d\x06\x00\x01\x01"
+    with pytest.raises(ValueError):
+        RLE_Compressor("RLE3")
+
+
+# Test the RLEP format round trips, and never grows incompressible data by more than a header
+def test_rlep_encode_decode():
+    rlep_compressor = RLE_Compressor("RLEP")
+    string_encode_and_decode(rlep_compressor)
+    binary_encode_and_decode(rlep_compressor)
+    rng = random.Random(8642)
+    for _ in range(20):
+        sample = bytes(rng.choice(b"abc") for _ in range(rng.randint(1, 2000)))
+        for byte_size in (1, 2, 5):
+            encoded = rlep_compressor.encode(sample, "path", byte_size, 99)
+            assert rlep_compressor.decode(encoded) == sample
+            if compressor.np is not None:
+                min_run = compressor._rlep_min_run(byte_size)
+                runs = compressor._rlep_numpy_runs(sample, byte_size, min_run, 7)
+                assert compressor._rlep_encode(sample, byte_size, runs) == encoded.get_data()
+    incompressible = bytes(rng.randrange(256) for _ in range(100000))
+    for byte_size in (1, 5):
+        assert len(rlep_compressor.encode(incompressible, "path", byte_size, 99).get_data()) <= len(incompressible) + 4
+    # a literal, a run of the 'bb' block, and a literal of a partial block
+    assert rlep_compressor.encode(b"xybbbbbbz", "path", 2, 99).get_data() == b"\x02xy\x07bb\x02z"
+
+
+# Test the RLE parameter tuning picks the block size of the data, and keeps fixed parameters
+def test_rle_tune(rle_compressor):
+    text = (b"abcd" * 50 + b"wxyz" * 50) * 200
+    assert rle_compressor.tune(text) == (4, 99)
+    assert rle_compressor.tune(text, 4, compressor.AUTO) == (4, 99)
+    assert rle_compressor.tune(text, compressor.AUTO, 999) == (4, 999)
+    assert rle_compressor.tune(text.decode('utf-8')) == (4, 99)
+    # the newer formats don't cap runs, so only the byte size is tuned
+    assert RLE_Compressor("RLE2").tune(text) == (4, 99)
+    # a short text is sampled as a whole
+    assert rle_compressor.tune(b"aaaaaaaaaaaaaaaa")[0] in compressor.TUNE_BYTE_SIZES
+
+
+# Reference implementation of the original bytes keyed LZW encoder, used to make sure the
+# integer keyed trie emits the same codes
+def legacy_lzw_binary_encode(text: bytes) -> bytes:
+    dictionary = {bytes([i]): i for i in range(256)}
+    current_bytes = b""
+    result = []
+    for byte in text:
+        concat_bytes = current_bytes + bytes([byte])
+        if concat_bytes in dictionary:
+            current_bytes = concat_bytes
+        else:
+            result.append(dictionary[current_bytes])
+            dictionary[concat_bytes] = len(dictionary)
+            current_bytes = bytes([byte])
+    if current_bytes:
+        result.append(dictionary[current_bytes])
+    return b"".join(str(item).encode('utf-8') + b"~" for item in result)
+
+
+# Test the trie LZW encoder output is identical to the original format
+def test_lzw_encode_matches_legacy_format(lzw_compressor):
+    rng = random.Random(9)
+    samples = [b"a", b"abababababababab", bytes(range(256)) * 3, bytes(rng.randrange(256) for _ in range(5000)),
+               b"".join(rng.choice([b"GET /index ", b"POST /api ", b"200 OK\n", b"\x00\xff"]) for _ in range(2000))]
+    for sample in samples:
+        assert lzw_compressor.encode(sample, "path").get_data() == legacy_lzw_binary_encode(sample)
+
+
+# Test the LZW decoders on long repeated phrases, and on codes that are not in the dictionary yet
+def test_lzw_decode_dictionary():
+    sample = bytes(100000) + b"ab" * 50000 + bytes(range(256)) * 40
+    for variant in LZW_VARIANTS:
+        lzw_compressor = LZW_Compressor(variant)
+        assert lzw_compressor.decode(lzw_compressor.encode(sample, "path")) == sample
+    with pytest.raises(ValueError):
+        LZW_Compressor().decode(Encoded_File(b"97~258~", True, 5, Path("path"), "LZW", 99))
+    with pytest.raises(ValueError):
+        compressor._lzw2_decode(b"\x00\x61\x04\x02")
+
+
+# Test the bit packed LZW2 format round trips, and is smaller than the decimal LZW codes
+def test_lzw2_encode_decode():
+    lzw2_compressor = LZW_Compressor("LZW2")
+    string_encode_and_decode(lzw2_compressor)
+    binary_encode_and_decode(lzw2_compressor)
+    assert_encode_and_decode(lzw2_compressor, "\u05e9\u05dc\u05d5\u05dd" * 20 + "ab", 3)
+    rng = random.Random(97531)
+    for _ in range(20):
+        sample = bytes(rng.choice(b"abc") for _ in range(rng.randint(1, 3000)))
+        assert compressor._lzw2_decode(compressor._lzw2_encode(sample)) == sample
+    # the first code after the header is 9 bits wide, low bits first
+    assert compressor._lzw2_encode(b"a", 0) == b"\x00\x61\x00"
+    with open(COMPRESSOR_BASE_PATH / "bin_file.xlsx", 'rb') as file:
+        file_content = file.read()
+    encoded_file = lzw2_compressor.encode(file_content, "bin_file.xlsx")
+    assert encoded_file.get_encoder() == "LZW2"
+    assert len(encoded_file.get_data()) < len(LZW_Compressor().encode(file_content, "bin_file.xlsx").get_data())
+    with pytest.raises(ValueError):
+        LZW_Compressor("LZW3")
+    with pytest.raises(ValueError):
+        compressor._lzw2_decode(b"\x00\xff\x01")
+
+
+# Test the LZW2 dictionary limit, with both policies for a full dictionary
+def test_lzw2_bounded_dictionary():
+    rng = random.Random(11)
+    # a long mix of repetitive and random data fills small dictionaries many times
+    sample = (b"".join(bytes(rng.choice(b"abcdefgh") for _ in range(3000)) + bytes(rng.randrange(256)
+                                                                                   for _ in range(3000))
+                       for _ in range(10)))
+    for max_bits in (0, 9, 12):
+        for policy in compressor.LZW_POLICIES:
+            lzw2_compressor = LZW_Compressor("LZW2", max_bits, policy)
+            encoded_file = lzw2_compressor.encode(sample, "path")
+            assert encoded_file.get_data()[0] == max_bits
+            assert lzw2_compressor.decode(encoded_file) == sample
+    # the reset policy clears a full dictionary right away
+    encoded = compressor._lzw2_encode(sample, 9, "reset")
+    assert compressor._lzw2_decode(encoded) == sample
+    with pytest.raises(ValueError):
+        LZW_Compressor("LZW2", 8)
+    with pytest.raises(ValueError):
+        LZW_Compressor("LZW2", 12, "sometimes")
+    # the LZW format has no clear code, so a full dictionary is only kept
+    for max_bits in (9, 12):
+        lzw_compressor = LZW_Compressor("LZW", max_bits)
+        encoded_file = lzw_compressor.encode(sample, "path")
+        codes = [int(code) for code in encoded_file.get_data().split(b"~") if code]
+        assert max(codes) < 1 << max_bits
+        assert lzw_compressor.decode(encoded_file) == sample
+        assert LZW_Compressor().decode(encoded_file) == sample
+    with pytest.raises(ValueError):
+        LZW_Compressor("LZW", 12, "reset")
+
+
+# Test the Huffman compressor round trips, and limits the code lengths of skewed data
+def test_huffman_encode_decode():
+    huffman_compressor = Huffman_Compressor()
+    assert_encode_and_decode(huffman_compressor, "\u05e9\u05dc\u05d5\u05dd world " * 20, 3)
+    rng = random.Random(4)
+    # fibonacci frequencies give a Huffman tree as deep as the number of byte values
+    fibonacci = [1, 1]
+    while len(fibonacci) < 25:
+        fibonacci.append(fibonacci[-1] + fibonacci[-2])
+    skewed = b"".join(bytes([byte]) * count for byte, count in enumerate(fibonacci))
+    lengths = compressor._huffman_code_lengths(compressor._huffman_histogram(skewed))
+    assert max(lengths) == compressor.HUF_MAX_CODE_LENGTH
+    assert sum(2 ** -length for length in lengths if length) == 1
+    for sample in [b"a", b"aaaab", bytes(range(256)), bytes(rng.randrange(256) for _ in range(5000)), skewed]:
+        encoded_file = huffman_compressor.encode(sample, "path")
+        assert huffman_compressor.decode(encoded_file) == sample
+    # text takes about 4 bits a byte
+    text = " ".join(rng.choice(["error", "warning", "info", "debug", "request", "took"]) for _ in range(5000))
+    assert len(huffman_compressor.encode(text, "path").get_data()) < len(text) * 0.6
+    with pytest.raises(ValueError):
+        compressor._huffman_decode(b"\x05\xff")
+
+
+# Test LZSS at every level, on long distance repeats, overlapping matches and the window limit
+def test_lzss_encode_decode():
+    assert_encode_and_decode(LZSS_Compressor(), "\u05e9\u05dc\u05d5\u05dd world " * 20, 3)
+    rng = random.Random(10)
+    block = bytes(rng.randrange(256) for _ in range(3000))
+    words = " ".join(rng.choice(["error", "warning", "info", "debug", "request", "took"]) for _ in range(5000))
+    samples = [b"a", b"abcabc", b"a" * 100000, block + b"x" * 5000 + block, words.encode(), bytes(range(256)) * 3]
+    for level in compressor.LZSS_LEVELS:
+        lzss_compressor = LZSS_Compressor(level, 10)
+        for sample in samples:
+            encoded_file = lzss_compressor.encode(sample, "path")
+            assert lzss_compressor.decode(encoded_file) == sample
+    # the repeat of the random block is found across the run, unless it is out of the window
+    assert len(LZSS_Compressor().encode(block + b"x" * 5000 + block, "path").get_data()) < 3500
+    assert len(LZSS_Compressor(6, 12).encode(block + b"x" * 5000 + block, "path").get_data()) > 6000
+    # on text, LZSS beats LZW
+    assert len(LZSS_Compressor().encode(words, "path").get_data()) < \
+           len(LZW_Compressor("LZW2").encode(words, "path").get_data())
+    encoding = compressor._lzss_encode(samples[3])
+    for corrupted in [encoding[:len(encoding) // 2], b"\x05\x00", encoding[:1] + b"\x00" * 8]:
+        with pytest.raises(ValueError):
+            compressor._lzss_decode(corrupted)
+    for level, window_bits in [(0, None), (10, None), (6, 9), (6, 22)]:
+        with pytest.raises(ValueError):
+            LZSS_Compressor(level, window_bits)
+
+
+# Test the default LZSS level against LZW2 on JSON and source code, the corpora its default was picked on
+def test_lzss_default_level_ratio():
+    rng = random.Random(2)
+    records = [{"id": i, "name": rng.choice(["alice", "bob", "carol", "dave"]) + str(rng.randrange(1000)),
+                "email": "user%d@example.com" % rng.randrange(100000), "active": rng.random() < 0.5,
+                "score": round(rng.random() * 100, 2), "tags": rng.sample(["red", "green", "blue", "admin"], 2)}
+               for i in range(1500)]
+    source = (compressor.CODE_BASE_PATH / "archive.py").read_text()
+    for text, lzss_ratio in [(json.dumps(records, indent=2), 0.115), (source, 0.3)]:
+        lzss_size = len(LZSS_Compressor().encode(text, "path").get_data())
+        assert lzss_size < len(text) * lzss_ratio
+        # at least 10% smaller than LZW2
+        assert lzss_size < len(LZW_Compressor("LZW2").encode(text, "path").get_data()) * 0.9
+
+
+# Test the Fenwick tree of the range coder against plain sums, through updates and halving
+def test_frequency_table():
+    rng = random.Random(12)
+    table = compressor._Frequency_Table()
+    for _ in range(5000):
+        table.update(rng.choice(b"etaoin "))
+        byte = rng.randrange(256)
+        assert table.cumulative(byte) == sum(table.frequencies[:byte])
+        assert table.find(table.cumulative(byte)) == (byte, table.cumulative(byte))
+        assert table.find(table.cumulative(byte) + table.frequencies[byte] - 1)[0] == byte
+    assert table.total == sum(table.frequencies) <= compressor.RC_MAX_TOTAL
+
+
+# Test the range coder at every order, with carries and skewed data, and that context helps on text
+def test_range_encode_decode():
+    assert_encode_and_decode(Range_Compressor(), "\u05e9\u05dc\u05d5\u05dd world " * 20, 3)
+    rng = random.Random(13)
+    text = " ".join(rng.choice(["error", "warning", "info", "debug", "request", "took"]) for _ in range(5000))
+    samples = [b"a", b"\xff" * 10000, b"\x00" * 5000 + b"\xff" * 5000, bytes(rng.randrange(256) for _ in range(5000)),
+               text.encode()]
+    sizes = []
+    for order in compressor.RC_ORDERS:
+        range_compressor = Range_Compressor(order)
+        assert range_compressor.get_order() == order
+        for sample in samples:
+            encoded_file = range_compressor.encode(sample, "path")
+            assert range_compressor.decode(encoded_file) == sample
+        sizes.append(len(range_compressor.encode(text, "path").get_data()))
+    assert sizes[2] < sizes[1] < sizes[0] < len(Huffman_Compressor().encode(text, "path").get_data())
+    encoding = compressor._rc_encode(text.encode())
+    for corrupted in [encoding[:len(encoding) // 2], encoding[:4], b"\x05\x07" + encoding[2:]]:
+        with pytest.raises(ValueError):
+            compressor._rc_decode(corrupted)
+    with pytest.raises(ValueError):
+        Range_Compressor(3)
+
+
+# Test the range coder keeps a bounded number of context tables, and still decodes encodings without the cap
+def test_range_coder_memory(monkeypatch):
+    rng = random.Random(14)
+    noise = bytes(rng.randrange(256) for _ in range(100000))
+    tracemalloc.start()
+    try:
+        encoding = compressor._rc_encode(noise, 2)
+        # a table for each of the tens of thousands of contexts of random data would take over 100MB
+        assert tracemalloc.get_traced_memory()[1] < 20 << 20
+    finally:
+        tracemalloc.stop()
+    assert compressor._rc_decode(encoding) == noise
+    with monkeypatch.context() as patch:
+        patch.setattr(compressor, "RC_CAPPED_FLAG", 0)
+        patch.setattr(compressor, "RC_MAX_CONTEXTS", 1 << 16)
+        uncapped = compressor._rc_encode(noise[:20000], 2)
+    assert uncapped[3] == 2
+    assert compressor._rc_decode(uncapped) == noise[:20000]
+
+
+# Test the delta and move to front transforms, with and without numpy
+def test_delta_mtf_transforms():
+    rng = random.Random(6)
+    sample = bytes(rng.randrange(256) for _ in range(compressor.NUMPY_MIN_SIZE + 10))
+    assert compressor._delta_encode(b"\x01\x03\x02\x02") == b"\x01\x02\xff\x00"
+    assert compressor._delta_encode(sample)[:100] == compressor._delta_encode(sample[:100])
+    assert compressor._delta_decode(compressor._delta_encode(sample)) == sample
+    assert compressor._delta_decode(compressor._delta_encode(sample[:100])) == sample[:100]
+    assert compressor._mtf_encode(b"bbaab") == b"\x62\x00\x62\x00\x01"
+    assert compressor._mtf_decode(compressor._mtf_encode(sample)) == sample
+
+
+# Test pipelines round trip, and record their stages in the encoder name
+def test_pipeline_encode_decode():
+    text = "".join("line %s - \u05e9\u05dc\u05d5\u05dd\n" % (i // 10) for i in range(300))
+    for stages in ["RLE2+HUF", "DELTA+RLEP", "MTF+RLE2+HUF", "LZW2+HUF", "RLE+LZW+HUF", "BWT+MTF+RLE2+HUF", "LZSS+BWT",
+                   "BWT+MTF+RC"]:
+        pipeline_compressor = Pipeline_Compressor(stages)
+        assert pipeline_compressor.get_name() == "PIPE:" + stages
+        assert_encode_and_decode(pipeline_compressor, text, 3)
+        encoded_file = pipeline_compressor.encode(text.encode('utf-8'), "path", 1, 9)
+        assert encoded_file.get_encoder() == "PIPE:" + stages
+        assert pipeline_compressor.decode(encoded_file) == text.encode('utf-8')
+    with pytest.raises(ValueError):
+        Pipeline_Compressor("RLE2+ZIP")
+    with pytest.raises(ValueError):
+        Pipeline_Compressor("BWT+MTF", 0)
+    # the BWT block bits set its block size, and aren't stored in the encoder name
+    pipeline_compressor = Pipeline_Compressor("BWT:10+MTF+RLE2+HUF")
+    assert pipeline_compressor.get_bwt_block_size() == 1 << 10
+    encoded_file = pipeline_compressor.encode(text, "path")
+    assert encoded_file.get_encoder() == "PIPE:BWT+MTF+RLE2+HUF"
+    assert encoded_file.get_data() != Pipeline_Compressor("BWT+MTF+RLE2+HUF").encode(text, "path").get_data()
+    assert Pipeline_Compressor(encoded_file.get_encoder()[len("PIPE:"):]).decode(encoded_file) == text
+    for stages in ["MTF:10+HUF", "BWT:9+MTF", "BWT:25", "BWT:big"]:
+        with pytest.raises(ValueError):
+            Pipeline_Compressor(stages)
+
+
+# Test the Burrows-Wheeler transform sorts rotations like a naive sort, in independent blocks, with and without numpy
+def test_bwt_transform(monkeypatch):
+    rng = random.Random(11)
+    samples = [b"a", b"banana", b"abab" * 50, bytes(rng.choice(b"ab") for _ in range(500)), bytes(range(256)) * 4]
+    for use_numpy in [True, False]:
+        if not use_numpy:
+            monkeypatch.setattr(compressor, "np", None)
+        for sample in samples:
+            rotations = sorted(sample[i:] + sample[:i] for i in range(len(sample)))
+            assert [sample[i:] + sample[:i] for i in compressor._bwt_rotations(sample)] == rotations
+            for block_size in [1, 7, 100, compressor.BWT_BLOCK_SIZE]:
+                assert compressor._bwt_decode(compressor._bwt_encode(sample, block_size)) == sample
+    assert compressor._bwt_encode(b"banana") == b"\x06\x03nnbaaa"
+    # blocks are transformed independently
+    assert compressor._bwt_encode(b"bananabanana", 6) == b"\x06\x03nnbaaa" * 2
+    # sorting groups equal bytes, so move to front turns them into runs of zeros
+    text = " ".join(rng.choice(["error", "warning", "info", "debug"]) for _ in range(2000)).encode()
+    assert compressor._mtf_encode(compressor._bwt_encode(text)).count(0) > len(text) * 0.6
+    for corrupted in [b"\x06\x06nnbaaa", b"\x06\x03nnba"]:
+        with pytest.raises(ValueError):
+            compressor._bwt_decode(corrupted)
+
+
+# Test the standard library codecs round trip across chunk borders, and reject bad levels and data
+def test_stream_encode_decode(monkeypatch):
+    monkeypatch.setattr(compressor, "STREAM_CHUNK_SIZE", 1000)
+    rng = random.Random(8)
+    sample = bytes(rng.randrange(256) for _ in range(3000)) + b"log line\n" * 1000
+    for codec in STREAM_CODECS:
+        for level in (None, 1, 9):
+            stream_compressor = Stream_Compressor(codec, level)
+            assert stream_compressor.get_name() == codec
+            assert_encode_and_decode(stream_compressor, "\u05e9\u05dc\u05d5\u05dd " * 300, 3)
+            encoded_file = stream_compressor.encode(sample, "path")
+            assert len(encoded_file.get_data()) < len(sample)
+            assert stream_compressor.decode(encoded_file) == sample
+        with pytest.raises(ValueError):
+            stream_compressor.decode_bytes(encoded_file.get_data()[:-20])
+        with pytest.raises(ValueError):
+            stream_compressor.decode_bytes(b"not compressed data")
+        with pytest.raises(ValueError):
+            Stream_Compressor(codec, 10)
+    with pytest.raises(ValueError):
+        Stream_Compressor("ZSTD")
+    # the output is written to a single buffer, so it is never held twice
+    large_sample = b"".join(b"log line %d\n" % rng.randrange(1000) for _ in range(200000))
+    stream_compressor = Stream_Compressor("ZLIB")
+    encoding = stream_compressor.encode_bytes(large_sample)
+    tracemalloc.start()
+    try:
+        assert stream_compressor.decode_bytes(encoding) == large_sample
+        assert tracemalloc.get_traced_memory()[1] < len(large_sample) * 1.5
+    finally:
+        tracemalloc.stop()
+
+
+# Test already compressed files are recognized by magic number or entropy, and stored as they are
+def test_store_incompressible(monkeypatch):
+    rng = random.Random(9)
+    random_content = bytes(rng.randrange(256) for _ in range(200000))
+    with open(COMPRESSOR_BASE_PATH / "bin_file.xlsx", 'rb') as file:
+        assert compressor.is_incompressible(file.read())
+    assert compressor.is_incompressible(b"%PDF-1.7 short")
+    assert compressor.is_incompressible(random_content)
+    assert not compressor.is_incompressible(random_content[:1000])
+    assert not compressor.is_incompressible(b"log line\n" * 10000)
+    assert compressor.byte_entropy(bytes(range(256)) * 4) == pytest.approx(8)
+    assert compressor.byte_entropy(b"aaaa") == 0
+    # the entropy is the same without numpy
+    monkeypatch.setattr(compressor, "np", None)
+    assert compressor.byte_entropy(random_content) == pytest.approx(7.999, abs=1e-3)
+    assert compressor.is_incompressible(random_content)
+
+    store_compressor = Store_Compressor()
+    assert_encode_and_decode(store_compressor, "\u05e9\u05dc\u05d5\u05dd " * 300, 3)
+    encoded_file = store_compressor.encode(random_content, "path")
+    assert encoded_file.get_data() == random_content
+    assert store_compressor.decode(encoded_file) == random_content
+
+
+# Test the RLE encoder runs in linear time - 4 times the input should take about 4 times as long
+@flaky(max_runs=3)
+def test_rle_encode_scales_linearly(rle_compressor):
+    rng = random.Random(99)
+    pattern = b"".join(bytes([rng.randrange(256)]) * rng.randint(1, 40) for _ in range(20000))
+    timings = []
+    for size in (1 << 20, 1 << 22):
+        text = (pattern * (size // len(pattern) + 1))[:size]
+        start = time.perf_counter()
+        rle_compressor.encode(text, "path", 1, 99)
+        timings.append(time.perf_counter() - start)
+    assert timings[1] < timings[0] * 4 * 2
+
 # Entry point for running tests if the script is executed directly
 if __name__ == "__main__":
     pytest.main([__file__])
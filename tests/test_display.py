@@ -4,6 +4,7 @@ from unittest.mock import patch
 from display import FileCompressorGUI, PrintRedirector, run_program_gui
 from flaky import flaky
 from main import default_args
+from compressor import TEST_BASE_PATH
 
 
 @pytest.fixture
@@ -179,6 +180,21 @@ def test_inflate_command(gui):
 
 
 
+def test_inflate_selected_files_command(gui):
+    gui.inflate_archive_path = str(TEST_BASE_PATH / "File_Handler_Tests" / "Existing_Archive.ido")
+    gui.inflate_save_path = "/path/to/save/location"
+    gui.list_archive_files()
+    assert gui.inflate_files_list.size() == 4
+    gui.inflate_files_list.selection_set(2)
+
+    with patch("display.run_file_compressor") as mock_run_file_compressor:
+        gui.inflate()
+
+    args = mock_run_file_compressor.call_args[0][0]
+    assert args.open
+    assert args.extract == [gui.inflate_files_list.get(2)]
+
+
 def test_inspect_command(gui):
     # Fill basic params for inspect command
     gui.examine_archive_path = "/path/to/archive.ido"
@@ -1,3 +1,4 @@
+import mmap
 import pytest
 
 from encoded_file import Encoded_File
@@ -43,6 +44,34 @@ def test_is_binary_false():
     assert encoded_file.is_binary() == False
 
 
+def test_text_flag():
+    # check the text flag defaults to false, and can be set
+    encoded_file = Encoded_File(b'test data', binary_flag=True, byte_length=10)
+    assert encoded_file.is_text() == False
+    encoded_file.set_text(True)
+    assert encoded_file.is_text() == True
+    # files that differ only in their text flag are extracted differently, so they are not equal
+    assert encoded_file != Encoded_File(b'test data', binary_flag=True, byte_length=10)
+    with pytest.raises(TypeError):
+        Encoded_File(b'test data', binary_flag=True, byte_length=10, text_flag=1)
+
+
+def test_mapped_data(tmp_path):
+    # check the data of a view is read from the mapping, and views out of it are refused
+    path = tmp_path / "payload"
+    path.write_bytes(b'headertest datafooter')
+    with open(path, 'rb') as file:
+        mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    encoded_file = Encoded_File((mapping, 6, 9), binary_flag=True, byte_length=10)
+    assert encoded_file.get_data() == b'test data'
+    assert encoded_file == Encoded_File(b'test data', binary_flag=True, byte_length=10)
+    assert not hasattr(encoded_file, "__dict__")
+    with pytest.raises(ValueError):
+        Encoded_File((mapping, 15, 9), binary_flag=True, byte_length=10)
+    with pytest.raises(TypeError):
+        Encoded_File((b'headertest data', 6, 9), binary_flag=True, byte_length=10)
+
+
 #
 # def test_get_data_string():
 #     data_string = 'test string data'
@@ -2,7 +2,9 @@ import filecmp
 import pytest
 import compressor
 from file_handler import *
+from codec_registry import get_compressor
 import tempfile
+import random
 
 # Base paths for testing
 FILE_HANDLER_TEST_PATH = compressor.TEST_BASE_PATH / "File_Handler_Tests"
@@ -52,6 +54,12 @@ def test_validity_check(temp_folder):
     assert not is_valid_archive(temp_folder / "incorrect_format.ido")
     assert not is_valid_archive(temp_folder / "binary_content.ido")
 
+    # a v2 archive cut inside an entry, and a v1 archive, which is still valid
+    with open(temp_folder / "truncated.ido", 'wb') as file:
+        file.write((temp_folder / "correct_format.ido").read_bytes()[:-3])
+    assert not is_valid_archive(temp_folder / "truncated.ido")
+    assert is_valid_archive(FILE_HANDLER_TEST_PATH / "Existing_Archive.ido")
+
 
 # Test function for adding a single file to an archive
 def test_single_file_to_archive(temp_folder):
@@ -60,12 +68,14 @@ def test_single_file_to_archive(temp_folder):
     save_path = temp_folder / "text_compress.ido"
     if save_path.exists():
         save_path.unlink()
-    add_files_to_archive([file_path], save_path, 5, comp)
+    add_files_to_archive([file_path], save_path, 5, comp, store_incompressible=True)
     assert is_valid_archive(save_path)
 
     new_archive = open_archive_from_file(save_path)
     archive_files = new_archive.get_encoded_files_list()
-    decoded_file = comp.decode(archive_files[0])
+    # the xlsx file is already compressed, so it is stored
+    assert archive_files[0].get_encoder() == "STORE"
+    decoded_file = get_decoder(archive_files[0].get_encoder()).decode(archive_files[0])
 
     new_file = temp_folder / "new_test.xlsx"
     if new_file.exists():
@@ -180,5 +190,240 @@ def test_multi_files_store_and_inflate(temp_folder):
     assert len(error) == 0
 
 
+# Test function for storing files with the RLE2 format, and inflating them
+def test_rle2_store_and_inflate(temp_folder):
+    comp = compressor.RLE_Compressor("RLE2")
+    files_path = FILE_HANDLER_TEST_PATH / "folder_scheme"
+    save_path = temp_folder / "folder_compress_rle2.ido"
+    add_files_to_archive([files_path], save_path, 5, comp)
+    assert all(file.get_encoder() in ("RLE2", "STORE")
+               for file in open_archive_from_file(save_path).get_encoded_files_list())
+
+    new_path = temp_folder / "results"
+    inflate_archive_to_files(save_path, new_path)
+    _, mismatch, error = filecmp.cmpfiles(files_path, new_path / 'folder_scheme', ['text file.txt', 'some_file.accdb'])
+    assert len(mismatch) == 0
+    assert len(error) == 0
+
+
+# Test function for storing and inflating files with the Huffman compressor
+def test_huffman_store_and_inflate(temp_folder):
+    comp = compressor.Huffman_Compressor()
+    files_path = FILE_HANDLER_TEST_PATH / "folder_scheme"
+    save_path = temp_folder / "folder_compress_huffman.ido"
+    add_files_to_archive([files_path], save_path, 5, comp)
+    assert all(file.get_encoder() in ("HUF", "STORE")
+               for file in open_archive_from_file(save_path).get_encoded_files_list())
+
+    new_path = temp_folder / "results"
+    inflate_archive_to_files(save_path, new_path)
+    _, mismatch, error = filecmp.cmpfiles(files_path, new_path / 'folder_scheme', ['text file.txt', 'some_file.accdb'])
+    assert len(mismatch) == 0
+    assert len(error) == 0
+
+
+# Test function for storing and inflating files with LZSS
+def test_lzss_store_and_inflate(temp_folder):
+    files_path = FILE_HANDLER_TEST_PATH / "folder_scheme"
+    save_path = temp_folder / "folder_compress_lzss.ido"
+    add_files_to_archive([files_path], save_path, 5, compressor.LZSS_Compressor(1))
+    assert all(file.get_encoder() in ("LZSS", "STORE")
+               for file in open_archive_from_file(save_path).get_encoded_files_list())
+
+    new_path = temp_folder / "results"
+    inflate_archive_to_files(save_path, new_path)
+    _, mismatch, error = filecmp.cmpfiles(files_path, new_path / 'folder_scheme', ['text file.txt', 'some_file.accdb'])
+    assert len(mismatch) == 0
+    assert len(error) == 0
+
+
+# Test function for storing and inflating files with a pipeline of stages
+def test_pipeline_store_and_inflate(temp_folder):
+    comp = compressor.Pipeline_Compressor("MTF+RLE2+HUF")
+    files_path = FILE_HANDLER_TEST_PATH / "folder_scheme"
+    save_path = temp_folder / "folder_compress_pipeline.ido"
+    add_files_to_archive([files_path], save_path, 1, comp, None, 9)
+    for encoded_file in open_archive_from_file(save_path).get_encoded_files_list():
+        assert encoded_file.get_encoder() in ("PIPE:MTF+RLE2+HUF", "STORE")
+
+    new_path = temp_folder / "results"
+    inflate_archive_to_files(save_path, new_path)
+    _, mismatch, error = filecmp.cmpfiles(files_path, new_path / 'folder_scheme', ['text file.txt', 'some_file.accdb'])
+    assert len(mismatch) == 0
+    assert len(error) == 0
+
+
+# Test function for storing and inflating files with the standard library codecs
+def test_stream_store_and_inflate(temp_folder):
+    files_path = FILE_HANDLER_TEST_PATH / "folder_scheme"
+    for codec in compressor.STREAM_CODECS:
+        save_path = temp_folder / ("folder_compress_%s.ido" % codec)
+        add_files_to_archive([files_path], save_path, 5, compressor.Stream_Compressor(codec, 1))
+        assert all(file.get_encoder() in (codec, "STORE")
+                   for file in open_archive_from_file(save_path).get_encoded_files_list())
+
+        new_path = temp_folder / ("results_%s" % codec)
+        inflate_archive_to_files(save_path, new_path)
+        _, mismatch, error = filecmp.cmpfiles(files_path, new_path / 'folder_scheme',
+                                              ['text file.txt', 'some_file.accdb'])
+        assert len(mismatch) == 0
+        assert len(error) == 0
+
+
+# Test function for the auto compressor - entries record the codec picked for them, and inflate with it
+def test_auto_store_and_inflate(temp_folder):
+    files_path = FILE_HANDLER_TEST_PATH / "folder_scheme"
+    save_path = temp_folder / "folder_compress_auto.ido"
+    add_files_to_archive([files_path], save_path, 5, get_compressor("AUTO", "ratio"))
+    assert all(is_known_encoder(file.get_encoder()) and file.get_encoder() != "AUTO"
+               for file in open_archive_from_file(save_path).get_encoded_files_list())
+
+    new_path = temp_folder / "results_auto"
+    inflate_archive_to_files(save_path, new_path)
+    _, mismatch, error = filecmp.cmpfiles(files_path, new_path / 'folder_scheme', ['text file.txt', 'some_file.accdb'])
+    assert len(mismatch) == 0
+    assert len(error) == 0
+
+
+# Test function for already compressed files - they are stored, and the other files are still compressed
+def test_store_incompressible_files(temp_folder):
+    files_path = temp_folder / "mixed"
+    files_path.mkdir()
+    rng = random.Random(5)
+    (files_path / "image.png").write_bytes(b"\x89PNG\r\n\x1a\n" + b"\x00" * 1000)
+    (files_path / "random.bin").write_bytes(bytes(rng.getrandbits(8) for _ in range(50000)))
+    (files_path / "runs.bin").write_bytes(b"".join(bytes([rng.getrandbits(8)]) * 100 for _ in range(500)))
+    save_path = temp_folder / "mixed.ido"
+    add_files_to_archive([files_path], save_path, AUTO, compressor.RLE_Compressor(), store_incompressible=True)
+    with open_archive_from_file(save_path) as archive:
+        encoders = {file.get_path().name: file.get_encoder() for file in archive.get_encoded_files_list()}
+    assert encoders == {"image.png": "STORE", "random.bin": "STORE", "runs.bin": "RLE"}
+    # a compressor that was chosen encodes every file
+    for chosen_compressor in [compressor.Stream_Compressor("ZLIB"), compressor.RLE_Compressor()]:
+        chosen_path = temp_folder / ("mixed_%s.ido" % chosen_compressor.get_name())
+        add_files_to_archive([files_path], chosen_path, 5, chosen_compressor)
+        with open_archive_from_file(chosen_path) as archive:
+            assert {file.get_encoder() for file in archive.get_encoded_files_list()} == {chosen_compressor.get_name()}
+
+    inflate_archive_to_files(save_path, temp_folder / "results")
+    _, mismatch, error = filecmp.cmpfiles(files_path, temp_folder / "results" / "mixed",
+                                          ["image.png", "random.bin", "runs.bin"])
+    assert len(mismatch) == 0
+    assert len(error) == 0
+
+
+# Test function for deleting files from an archive file through its central directory
+def test_delete_from_archive_file(temp_folder):
+    files_path = FILE_HANDLER_TEST_PATH / "folder_scheme"
+    save_path = temp_folder / "delete.ido"
+    add_files_to_archive(files_path, save_path, 5, compressor.Huffman_Compressor(), "secret")
+    directory = open_archive_directory(save_path)
+    assert directory.is_protected() and directory.check_password("secret")
+    records = {str(record.path): record for record in directory.get_records()}
+    assert records["folder_scheme/text file.txt"].original_size == \
+           (files_path / "text file.txt").stat().st_size
+    assert not delete_from_archive_file(save_path, directory, [7])
+    assert delete_from_archive_file(save_path, directory, [1, 2])
+    directory = open_archive_directory(save_path)
+    assert directory.check_password("secret")
+    assert sorted(str(record.path) for record in directory.get_records()) == sorted(records)[2:]
+    inflate_archive_to_files(save_path, temp_folder / "results", "secret")
+    assert filecmp.cmp(files_path / "some_file.accdb", temp_folder / "results" / "folder_scheme" / "some_file.accdb",
+                       shallow=False)
+
+
+# Test function for extracting selected files - the data of the other files isn't read
+def test_inflate_selected_files(temp_folder):
+    files_path = FILE_HANDLER_TEST_PATH / "folder_scheme"
+    save_path = temp_folder / "selected.ido"
+    add_files_to_archive(files_path, save_path, 5, compressor.LZSS_Compressor())
+    # corrupt the data of the accdb file
+    record = [record for record in read_archive_directory(save_path).get_records()
+              if record.path.suffix == ".accdb"][0]
+    content = bytearray(save_path.read_bytes())
+    content[record.offset] ^= 0xff
+    save_path.write_bytes(content)
+    inflate_archive_to_files(save_path, temp_folder / "results", None, ["folder_scheme/folder/*.txt"])
+    extracted = sorted(path.relative_to(temp_folder / "results") for path in (temp_folder / "results").rglob("*.*"))
+    assert extracted == [Path("folder_scheme/folder/inside folder/text file.txt"),
+                         Path("folder_scheme/folder/text file.txt")]
+    assert filecmp.cmp(files_path / "folder" / "text file.txt",
+                       temp_folder / "results" / "folder_scheme" / "folder" / "text file.txt", shallow=False)
+    with pytest.raises(ValueError):
+        inflate_archive_to_files(save_path, temp_folder / "results", None, ["*.accdb"])
+
+
+# Test function for updating an archive in place - the data already in it isn't rewritten
+def test_update_archive_in_place(temp_folder):
+    files_path = temp_folder / "files"
+    files_path.mkdir()
+    (files_path / "config.txt").write_text("version = 1\n")
+    (files_path / "data.bin").write_bytes(bytes(range(256)) * 64)
+    save_path = temp_folder / "update.ido"
+    add_files_to_archive(files_path, save_path, 5, compressor.LZSS_Compressor())
+    content = save_path.read_bytes()
+    (files_path / "config.txt").write_text("version = 2\n")
+    add_files_to_archive(files_path, save_path, 5, compressor.LZSS_Compressor())
+    assert save_path.read_bytes()[:len(content) // 2] == content[:len(content) // 2]
+    assert is_valid_archive(save_path)
+    assert len(open_archive_directory(save_path).get_records()) == 2
+    inflate_archive_to_files(save_path, temp_folder / "results")
+    assert (temp_folder / "results" / "files" / "config.txt").read_text() == "version = 2\n"
+    assert filecmp.cmp(files_path / "data.bin", temp_folder / "results" / "files" / "data.bin", shallow=False)
+
+
+# Test function for archives with an encoder no codec decodes - they are invalid, and fail before inflating
+def test_unknown_encoder_archive(temp_folder):
+    save_path = temp_folder / "unknown_encoder.ido"
+    write_archive(save_path, Archive([Encoded_File(b"data", True, 5, Path("file.bin"), "ZIPX", 99)]))
+    assert not is_valid_archive(save_path)
+    with pytest.raises(IOError):
+        inflate_archive_to_files(save_path, temp_folder / "results")
+    assert not (temp_folder / "results").exists()
+
+
+# Test function for tuning the RLE parameters of every file in an archive
+def test_auto_parameters_store_and_inflate(temp_folder):
+    comp = compressor.RLE_Compressor()
+    files_path = FILE_HANDLER_TEST_PATH / "folder_scheme"
+    save_path = temp_folder / "folder_compress_auto.ido"
+    add_files_to_archive([files_path], save_path, compressor.AUTO, comp, None, compressor.AUTO)
+    for encoded_file in open_archive_from_file(save_path).get_encoded_files_list():
+        assert encoded_file.get_byte_len() in compressor.TUNE_BYTE_SIZES
+        assert encoded_file.get_cap_size() in compressor.TUNE_CAP_SIZES
+
+    new_path = temp_folder / "results"
+    inflate_archive_to_files(save_path, new_path)
+    _, mismatch, error = filecmp.cmpfiles(files_path, new_path / 'folder_scheme', ['text file.txt', 'some_file.accdb'])
+    assert len(mismatch) == 0
+    assert len(error) == 0
+
+    # other compressors ignore the parameters, and get the defaults
+    assert resolve_encoding_parameters(compressor.LZW_Compressor(), b"data", compressor.AUTO, 7) == (5, 7)
+
+
+# Test function for storing text files as raw bytes - legacy text entries still inflate,
+# and only the newlines of the raw text entries are converted
+def test_raw_text_store_and_inflate(temp_folder):
+    files_path = temp_folder / "texts"
+    files_path.mkdir()
+    (files_path / "crlf.txt").write_bytes(b"first line\r\nsecond \xd7\xa9 line\rthird line\n")
+    (files_path / "data.bin").write_bytes(b"keep\r\nas is\r")
+    save_path = temp_folder / "raw_text.ido"
+    add_files_to_archive([files_path / "crlf.txt"], save_path, 5, compressor.RLE_Compressor(), None, 99)
+    add_files_to_archive([files_path], save_path, 5, compressor.LZW_Compressor("LZW2"), None, 99, True)
+    encoded_files = {str(file.get_path()): file for file in open_archive_from_file(save_path).get_encoded_files_list()}
+    assert encoded_files["texts/crlf.txt"].is_binary() and encoded_files["texts/crlf.txt"].is_text()
+    assert encoded_files["texts/data.bin"].is_binary() and not encoded_files["texts/data.bin"].is_text()
+    assert not encoded_files["crlf.txt"].is_binary()
+
+    new_path = temp_folder / "results"
+    inflate_archive_to_files(save_path, new_path)
+    native_text = os.linesep.join(["first line", "second \u05e9 line", "third line", ""]).encode('utf-8')
+    assert (new_path / "texts" / "crlf.txt").read_bytes() == native_text
+    assert (new_path / "texts" / "data.bin").read_bytes() == b"keep\r\nas is\r"
+    assert (new_path / "crlf.txt").read_bytes() == native_text
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -22,12 +22,15 @@ def mock_args():
         inspect=False,
         password=None,
         byte_size=5,
-        compressor=0,
+        compressor=None,
         file_path="something",
         save_path=os.path.expanduser("~"),
         cap_size=99,
         delete=None,
-        replace=False
+        replace=False,
+        variant=None,
+        raw_text=False,
+        extract=None
     )
 
 
@@ -78,6 +81,19 @@ def test_parse_args():
         parse_args(['-f', '/path/to/files', '-a', '-s', '/path/to/save', '-p', 'password', '-b'])
 
 
+# Test the help numbers the compressors that are registered, so they follow the codecs that are installed
+def test_help_compressor_list(capsys):
+    assert compressor_list(True).startswith("0-RLE, 1-LZW, 2-HUF (Huffman), 3-PIPE (pipeline), ")
+    # without bz2 and lzma, the compressors after zlib move up
+    with patch('main.compressor_names', return_value=["RLE", "LZW", "HUF", "PIPE", "ZLIB", "AUTO", "STORE"]):
+        assert compressor_list() == "0-RLE, 1-LZW, 2-HUF, 3-PIPE, 4-ZLIB, 5-AUTO, 6-STORE"
+        with pytest.raises(SystemExit):
+            parse_args(['-h'])
+    help_text = " ".join(capsys.readouterr().out.split())
+    assert "4-ZLIB, 5-AUTO (best codec for each file), 6-STORE (no compression), RLE by default." in help_text
+    assert "4-ZLIB, 5-AUTO, 6-STORE" in help_text
+
+
 # Test for handling archive command
 def test_command_handler_archive(mock_args, temp_dirs):
     with patch('main.add_files_to_archive') as mock_add_files_to_archive:
@@ -86,6 +102,14 @@ def test_command_handler_archive(mock_args, temp_dirs):
         command_handler(mock_args)
         assert validate_args(mock_args)
         assert mock_add_files_to_archive.called
+        # already compressed files are stored only by the default compressor and by AUTO
+        choices = [(None, None, True), ("AUTO", None, True), (0, None, False), (None, "RLE", False), (1, None, False),
+                   ("ZLIB", None, False)]
+        for compressor, variant, store_incompressible in choices:
+            mock_args.compressor = compressor
+            mock_args.variant = variant
+            command_handler(mock_args)
+            assert mock_add_files_to_archive.call_args[0][7] == store_incompressible
 
 
 # Test for handling open command
@@ -111,12 +135,12 @@ def test_command_handler_validate(mock_args, temp_dirs):
 def test_command_handler_inspect(mock_args, temp_dirs):
     mock_args.inspect = True
     with patch('main.is_valid_archive') as mock_is_valid_archive, \
-            patch('main.open_archive_from_file') as mock_open_archive_from_file:
+            patch('main.open_archive_directory') as mock_open_archive_directory:
         mock_is_valid_archive.return_value = True
-        mock_open_archive_from_file.return_value.is_protected.return_value = False
+        mock_open_archive_directory.return_value.is_protected.return_value = False
         mock_args.file_path = str(temp_dirs)
         command_handler(mock_args)
-        assert mock_open_archive_from_file.called
+        assert mock_open_archive_directory.called
 
 
 # Test for validating command line arguments
@@ -144,6 +168,18 @@ def test_validate_args(mock_args, temp_dirs):
     mock_args.byte_size = -2
     assert not validate_args(mock_args)
 
+    # byte and cap sizes too large to store in the archive
+    mock_args.open = False
+    mock_args.file_path = MAIN_TEST_BASE_PATH / "File.txt"
+    mock_args.byte_size = 8
+    assert validate_args(mock_args)
+    mock_args.byte_size = 5000000000
+    assert not validate_args(mock_args)
+    mock_args.byte_size = 8
+    mock_args.cap_size = 3000000000
+    assert not validate_args(mock_args)
+    mock_args.cap_size = 99
+
     mock_args.file_path = "_random_place"
     assert not validate_args(mock_args)
 
@@ -256,6 +292,25 @@ def test_create_password_protection(mock_args, temp_dirs):
 
 
 # Test for refusing to open an encrypted file without a password
+# Test for inflating only the files matching a glob or a folder
+def test_extract_selected_files(temp_dirs, capsys):
+    archive_path = str(MAIN_TEST_BASE_PATH / "compressed_folder_scheme.ido")
+    sys.argv = ['main.py', '-o', '-f', archive_path, '-s', str(temp_dirs), '-x', '*.txt', '-x',
+                'folder_scheme/folder/inside folder']
+    run_file_compressor()
+    extracted = sorted(str(path.relative_to(temp_dirs)).replace('\\', '/') for path in temp_dirs.rglob("*")
+                       if path.is_file())
+    assert extracted == ["folder_scheme/folder/inside folder/bin_file.pptx",
+                         "folder_scheme/folder/inside folder/text file.txt", "folder_scheme/folder/text file.txt",
+                         "folder_scheme/text file.txt"]
+    sys.argv = ['main.py', '-o', '-f', archive_path, '-s', str(temp_dirs), '-x', '*.docx']
+    run_file_compressor()
+    assert "No files in the archive match *.docx" in capsys.readouterr().out
+    sys.argv = ['main.py', '-i', '-f', archive_path, '-x', '*.txt']
+    run_file_compressor()
+    assert "Extract patterns are used only when inflating" in capsys.readouterr().out
+
+
 def test_refuse_to_open_encrypted_file(mock_args, temp_dirs, capsys):
     file_path = str(MAIN_TEST_BASE_PATH / "Protected.ido")
     mock_args.file_path = file_path
@@ -327,6 +382,37 @@ def test_parse_args_invalid_cap_size():
     assert not validate_args(args)  # Should return False because cap size is invalid
 
 
+# Test for parsing 'auto' RLE parameters
+def test_parse_args_auto_parameters():
+    args = parse_args(['-a', '-f', '/path/to/files', '-b', 'auto', '-q', 'auto'])
+    assert args.byte_size == "auto"
+    assert args.cap_size == "auto"
+    args = parse_args(['-a', '-f', '/path/to/files', '-q', '9'])
+    assert args.cap_size == 9
+    with pytest.raises(SystemExit):
+        parse_args(['-a', '-f', '/path/to/files', '-q', 'sometimes'])
+    assert not args.raw_text
+    assert parse_args(['-a', '-f', '/path/to/files', '-t']).raw_text
+
+
+# Test for matching compressors and their variants
+def test_match_relevant_compressor_variants():
+    assert match_relevant_compressor(0).get_name() == "RLE"
+    assert match_relevant_compressor(0, "RLE2").get_name() == "RLE2"
+    assert match_relevant_compressor(1).get_name() == "LZW"
+    assert match_relevant_compressor(1, "LZW2").get_name() == "LZW2"
+    assert not match_relevant_compressor(1, "RLE2")
+    assert match_relevant_compressor(2).get_name() == "HUF"
+    assert not match_relevant_compressor(2, "LZW2")
+    assert match_relevant_compressor(3).get_name() == "PIPE:RLE2+HUF"
+    assert match_relevant_compressor(3, "DELTA+LZW2").get_name() == "PIPE:DELTA+LZW2"
+    assert not match_relevant_compressor(3, "DELTA+ZIP")
+    assert match_relevant_compressor(parse_args(['-c', 'huf']).compressor).get_name() == "HUF"
+    assert not match_relevant_compressor(0, "LZW2")
+    args = parse_args(['-a', '-f', str(MAIN_TEST_BASE_PATH / "File.txt"), '-c', '0', '-e', 'LZW2'])
+    assert not validate_args(args)
+
+
 # Test for handling missing arguments
 def test_missing_arguments(capsys):
     # Simulate running the script without any arguments
@@ -409,7 +495,7 @@ def test_incorrect_password_for_protected_archive(capsys, temp_dirs):
 def test_invalid_compression_algorithm_number(capsys, temp_dirs):
     # Simulate providing an invalid compression algorithm number
     file_path = str(MAIN_TEST_BASE_PATH / "File.txt")
-    sys.argv = ['main.py', '-c', '2', '-f', file_path]
+    sys.argv = ['main.py', '-c', '99', '-f', file_path]
     run_file_compressor()
     captured = capsys.readouterr()
     assert "Invalid Compressor Number. see -Help" in captured.out